@@ -0,0 +1,116 @@
+"""
+Gemini 동시 호출 수 적응형 제한 (AIMD + 지연 기울기)
+
+고정 상한은 한가한 시간엔 너무 낮고 장애 시엔 너무 높습니다.
+관측한 지연 시간과 429/5xx 비율로 워커별 허용 동시 호출 수를 조정합니다.
+
+- 성공 + 지연 정상: 포화 상태일 때만 가산 증가 (limit 개 성공마다 +1)
+- 429 / 5xx / 타임아웃: 곱셈 감소 (쿨다운 동안은 한 번만)
+- 최근 지연(단기 EWMA)이 평소(장기 EWMA)보다 크게 늘면: 완만한 감소
+
+현재 limit 값은 /metrics 의 gemini_concurrency_limit 으로 노출됩니다.
+"""
+import time
+from typing import Optional
+
+from app.metrics import registry
+
+# 호출 결과 분류
+OUTCOME_SUCCESS = "success"
+OUTCOME_THROTTLED = "throttled"      # 429
+OUTCOME_UPSTREAM_ERROR = "upstream_error"  # 5xx / 타임아웃
+OUTCOME_CLIENT_ERROR = "client_error"      # 그 외 4xx 등 (limit 조정 안 함)
+
+_limit_gauge = registry.gauge("gemini_concurrency_limit", "현재 허용된 Gemini 동시 호출 수 (워커별)")
+_outcomes = registry.counter("gemini_upstream_results_total", "Gemini 호출 결과별 횟수")
+_latency = registry.histogram(
+    "gemini_upstream_latency_seconds",
+    "Gemini 호출 지연 시간 (초)",
+    buckets=(1, 2.5, 5, 10, 15, 20, 30, 45, 60, 90, 120),
+)
+
+
+def classify_exception(exc: BaseException) -> str:
+    """Gemini SDK 예외를 결과 분류로 변환"""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if isinstance(code, int):
+        if code == 429:
+            return OUTCOME_THROTTLED
+        if code >= 500:
+            return OUTCOME_UPSTREAM_ERROR
+        return OUTCOME_CLIENT_ERROR
+    if isinstance(exc, TimeoutError) or "timeout" in type(exc).__name__.lower():
+        return OUTCOME_UPSTREAM_ERROR
+    if "RESOURCE_EXHAUSTED" in str(exc):
+        return OUTCOME_THROTTLED
+    return OUTCOME_CLIENT_ERROR
+
+
+class AdaptiveLimit:
+    """AIMD 방식 동시성 상한"""
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        throttle_backoff: float = 0.5,
+        error_backoff: float = 0.75,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 5.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self._limit = float(min(max(initial, min_limit), self.max_limit))
+        self.throttle_backoff = throttle_backoff
+        self.error_backoff = error_backoff
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+
+        self._short_latency: Optional[float] = None
+        self._long_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        _limit_gauge.set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _decrease(self, factor: float):
+        now = time.monotonic()
+        # 같은 장애 구간의 연속 실패로 limit이 바닥까지 떨어지지 않도록 쿨다운
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * factor)
+
+    def record(self, outcome: str, latency: float, in_flight: int):
+        """호출 1건의 결과 반영
+
+        Args:
+            outcome: OUTCOME_* 값
+            latency: 호출 시간 (초)
+            in_flight: 호출 시작 시점의 동시 실행 수 (포화 여부 판단용)
+        """
+        _outcomes.inc(outcome=outcome)
+
+        if outcome == OUTCOME_THROTTLED:
+            self._decrease(self.throttle_backoff)
+        elif outcome == OUTCOME_UPSTREAM_ERROR:
+            self._decrease(self.error_backoff)
+        elif outcome == OUTCOME_SUCCESS:
+            _latency.observe(latency)
+            if self._short_latency is None:
+                self._short_latency = self._long_latency = latency
+            else:
+                self._short_latency = 0.7 * self._short_latency + 0.3 * latency
+                self._long_latency = 0.98 * self._long_latency + 0.02 * latency
+
+            if self._short_latency > self._long_latency * self.latency_tolerance:
+                # 지연이 급증: 업스트림이 밀리고 있다는 신호
+                self._decrease(0.9)
+            elif in_flight >= self.limit and self._limit < self.max_limit:
+                # 포화 상태에서 지연이 정상이면 가산 증가 (limit 개 성공마다 +1)
+                self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+        _limit_gauge.set(self.limit)
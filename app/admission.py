@@ -0,0 +1,229 @@
+"""
+Gemini 호출 입장(admission) 스케줄러
+
+Gemini 동시 호출 슬롯은 몇 개뿐이므로, 요청을 우선순위 등급별 큐에 넣고
+가중치 기반 공정 스케줄링(smooth weighted round-robin)으로 슬롯을 배정합니다.
+
+- 등급별 큐 길이 제한: 가득 차면 즉시 503
+- 등급별 대기 시간 제한: 초과하면 503 + Retry-After (요청이 타임아웃까지 늙지 않도록)
+- 큐 길이 / 대기 시간 / 동시 실행 수는 /metrics 로 노출 (오토스케일링용)
+- 동시 실행 상한은 AdaptiveLimit 이 호출 결과에 따라 조정 (app/adaptive_limit.py)
+"""
+import os
+import math
+import time
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from app.metrics import registry
+from app.adaptive_limit import AdaptiveLimit, OUTCOME_SUCCESS, classify_exception
+
+# 우선순위 등급
+PRIORITY_PAID = "paid"
+PRIORITY_MEMBER = "member"
+PRIORITY_ANONYMOUS = "anonymous"
+
+
+@dataclass
+class PriorityClass:
+    """우선순위 등급 설정"""
+    name: str
+    weight: int            # 공정 스케줄링 가중치 (클수록 슬롯을 자주 받음)
+    max_queue: int         # 큐 최대 길이
+    max_wait: float        # 큐 최대 대기 시간 (초)
+    current: int = 0       # smooth WRR 내부 상태
+    waiters: Deque["_Waiter"] = field(default_factory=deque)
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    enqueued_at: float
+
+
+DEFAULT_CLASSES = (
+    PriorityClass(PRIORITY_PAID, weight=6, max_queue=64, max_wait=60.0),
+    PriorityClass(PRIORITY_MEMBER, weight=3, max_queue=32, max_wait=45.0),
+    PriorityClass(PRIORITY_ANONYMOUS, weight=1, max_queue=16, max_wait=20.0),
+)
+
+_queue_depth = registry.gauge("gemini_admission_queue_depth", "우선순위 등급별 대기 중인 Gemini 요청 수")
+_in_flight = registry.gauge("gemini_admission_in_flight", "실행 중인 Gemini 호출 수")
+_wait_seconds = registry.histogram("gemini_admission_wait_seconds", "Gemini 슬롯 대기 시간 (초)")
+_rejected = registry.counter("gemini_admission_rejected_total", "큐 포화/대기 시간 초과로 거절된 요청 수")
+
+
+def resolve_priority(request: Optional[Request]) -> str:
+    """요청의 우선순위 등급 결정
+
+    - paid: Firebase 커스텀 클레임 plan == "paid"
+    - member: 로그인 사용자
+    - anonymous: 그 외
+    """
+    if request is None:
+        return PRIORITY_ANONYMOUS
+    claims = getattr(request.state, "firebase_claims", None) or {}
+    if claims.get("plan") == "paid":
+        return PRIORITY_PAID
+    if getattr(request.state, "user_id", None):
+        return PRIORITY_MEMBER
+    return PRIORITY_ANONYMOUS
+
+
+class AdmissionScheduler:
+    """우선순위 등급별 큐 + 가중치 공정 배정"""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        classes=DEFAULT_CLASSES,
+        controller: Optional[AdaptiveLimit] = None
+    ):
+        self.max_concurrency = max_concurrency
+        # 설정되어 있으면 고정 상한 대신 적응형 상한 사용
+        self.controller = controller
+        self.classes: Dict[str, PriorityClass] = {
+            c.name: PriorityClass(c.name, c.weight, c.max_queue, c.max_wait) for c in classes
+        }
+        self.in_flight = 0
+        # 슬롯 점유 시간 EWMA (Retry-After 추정용)
+        self._avg_hold = 10.0
+
+    @property
+    def limit(self) -> int:
+        if self.controller is not None:
+            return self.controller.limit
+        return self.max_concurrency
+
+    def queue_depth(self, priority: Optional[str] = None) -> int:
+        if priority is not None:
+            return len(self.classes[priority].waiters)
+        return sum(len(c.waiters) for c in self.classes.values())
+
+    def _retry_after(self, depth: int) -> int:
+        """현재 큐가 빠지는 데 걸릴 예상 시간 (초)"""
+        return max(1, math.ceil(self._avg_hold * (depth + 1) / max(1, self.limit)))
+
+    def _reject(self, pclass: PriorityClass, reason: str):
+        _rejected.inc(priority=pclass.name, reason=reason)
+        raise HTTPException(
+            status_code=503,
+            detail="서버가 혼잡합니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(self._retry_after(self.queue_depth()))},
+        )
+
+    def _update_gauges(self):
+        _in_flight.set(self.in_flight)
+        for pclass in self.classes.values():
+            _queue_depth.set(len(pclass.waiters), priority=pclass.name)
+
+    async def acquire(self, priority: str):
+        """슬롯 획득 (필요하면 큐에서 대기)"""
+        pclass = self.classes.get(priority) or self.classes[PRIORITY_ANONYMOUS]
+
+        if self.in_flight < self.limit and self.queue_depth() == 0:
+            self.in_flight += 1
+            _wait_seconds.observe(0.0, priority=pclass.name)
+            self._update_gauges()
+            return
+
+        if len(pclass.waiters) >= pclass.max_queue:
+            self._reject(pclass, "queue_full")
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop.create_future(), time.monotonic())
+        pclass.waiters.append(waiter)
+        self._update_gauges()
+
+        try:
+            await asyncio.wait({waiter.future}, timeout=pclass.max_wait)
+        except asyncio.CancelledError:
+            # 클라이언트 연결 종료 등으로 취소된 경우
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release()
+            else:
+                self._discard(pclass, waiter)
+            raise
+
+        if not waiter.future.done():
+            self._discard(pclass, waiter)
+            self._reject(pclass, "deadline")
+
+        _wait_seconds.observe(time.monotonic() - waiter.enqueued_at, priority=pclass.name)
+
+    def _discard(self, pclass: PriorityClass, waiter: _Waiter):
+        waiter.future.cancel()
+        try:
+            pclass.waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._update_gauges()
+
+    def release(self, held_for: Optional[float] = None):
+        """슬롯 반환 후 대기 중인 요청에 배정"""
+        self.in_flight -= 1
+        if held_for is not None:
+            self._avg_hold = 0.8 * self._avg_hold + 0.2 * held_for
+        self._dispatch()
+
+    def _dispatch(self):
+        """smooth weighted round-robin 으로 다음 대기 요청 선택"""
+        while self.in_flight < self.limit:
+            active = [c for c in self.classes.values() if c.waiters]
+            if not active:
+                break
+            total = sum(c.weight for c in active)
+            for c in active:
+                c.current += c.weight
+            chosen = max(active, key=lambda c: c.current)
+            chosen.current -= total
+
+            waiter = chosen.waiters.popleft()
+            if waiter.future.done():
+                continue
+            waiter.future.set_result(True)
+            self.in_flight += 1
+        self._update_gauges()
+
+    async def run_in_thread(self, priority: str, fn: Callable, *args, **kwargs):
+        """슬롯을 받아 fn 을 스레드에서 실행 (Gemini SDK 호출은 동기)
+
+        요청이 취소되어도(클라이언트 연결 종료 등) 실행 중인 스레드는 멈출 수 없으므로,
+        슬롯은 스레드가 끝날 때 반환합니다. (취소 즉시 반환하면 실제 동시 호출 수가 상한을 넘음)
+        """
+        await self.acquire(priority)
+        started = time.monotonic()
+        in_flight = self.in_flight
+        task = asyncio.ensure_future(asyncio.to_thread(fn, *args, **kwargs))
+
+        def finished(task: asyncio.Future):
+            error = None if task.cancelled() else task.exception()
+            held_for = time.monotonic() - started
+            if self.controller is not None:
+                outcome = OUTCOME_SUCCESS if error is None else classify_exception(error)
+                self.controller.record(outcome, held_for, in_flight)
+            self.release(held_for)
+
+        task.add_done_callback(finished)
+        return await asyncio.shield(task)
+
+
+def _build_controller() -> Optional[AdaptiveLimit]:
+    if os.getenv("GEMINI_ADAPTIVE_CONCURRENCY", "true").lower() != "true":
+        return None
+    return AdaptiveLimit(
+        initial=int(os.getenv("GEMINI_CONCURRENCY", "4")),
+        min_limit=int(os.getenv("GEMINI_CONCURRENCY_MIN", "1")),
+        max_limit=int(os.getenv("GEMINI_CONCURRENCY_MAX", "16")),
+    )
+
+
+# Gemini 호출용 전역 스케줄러 (워커별)
+gemini_admission = AdmissionScheduler(
+    max_concurrency=int(os.getenv("GEMINI_CONCURRENCY", "4")),
+    controller=_build_controller()
+)
@@ -0,0 +1,255 @@
+"""
+Firebase 인증
+
+Firebase ID Token 검증 의존성 (인증서 API, 이미지 API 공용)
+
+- 검증된 토큰은 토큰 해시 기준으로 exp 까지 캐시 (LRU, 크기 제한)
+- 캐시 미스 시 RSA 검증은 스레드에서 실행 (이벤트 루프 블로킹 방지)
+- 같은 토큰의 동시 검증은 한 번만 실행
+- 서명 공개키는 만료 전에 백그라운드에서 미리 갱신 (검증 중 HTTP 조회 방지)
+
+환경변수:
+    FIREBASE_TOKEN_CACHE_SIZE: 캐시할 최대 토큰 수 (기본 10000)
+    FIREBASE_KEY_REFRESH_INTERVAL: 공개키 갱신 주기 (초, 기본 3600)
+"""
+import os
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Header, Request
+
+from app.metrics import registry
+from app.resources import resources
+
+_token_cache_results = registry.counter("firebase_token_cache_total", "ID 토큰 캐시 조회 결과 (hit/miss)")
+
+
+class TokenCache:
+    """검증된 ID 토큰 클레임 캐시 (이벤트 루프에서만 접근)
+
+    토큰 원문 대신 SHA-256 digest 를 키로 저장하고, 토큰의 exp 가 지나면 버립니다.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        claims = self._entries.get(key)
+        if claims is None:
+            return None
+        if claims.get("exp", 0) <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: dict):
+        if claims.get("exp", 0) <= time.time():
+            return
+        key = self._key(token)
+        self._entries[key] = claims
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(max_size=int(os.getenv("FIREBASE_TOKEN_CACHE_SIZE", "10000")))
+
+# 검증 중인 토큰 digest -> 검증 태스크 (동시 요청 합치기)
+_pending: Dict[bytes, asyncio.Task] = {}
+
+
+def _verify_id_token(token: str) -> dict:
+    """Firebase ID 토큰 검증 (동기, 스레드에서 실행)"""
+    from firebase_admin import auth
+    return auth.verify_id_token(token, app=resources.firebase_app())
+
+
+async def _verify_and_store(token: str, key: bytes) -> dict:
+    try:
+        claims = await asyncio.to_thread(_verify_id_token, token)
+        token_cache.put(token, claims)
+        return claims
+    finally:
+        _pending.pop(key, None)
+
+
+async def _verify_cached(token: str) -> dict:
+    claims = token_cache.get(token)
+    if claims is not None:
+        _token_cache_results.inc(result="hit")
+        return claims
+    _token_cache_results.inc(result="miss")
+
+    key = TokenCache._key(token)
+    task = _pending.get(key)
+    if task is None:
+        task = asyncio.get_running_loop().create_task(_verify_and_store(token, key))
+        _pending[key] = task
+    # 요청 하나가 취소되어도 같은 토큰을 기다리는 다른 요청의 검증은 계속됨
+    return await asyncio.shield(task)
+
+
+# ============ 서명 공개키 갱신 ============
+
+def _max_age(headers) -> Optional[float]:
+    """Cache-Control 헤더의 max-age (초)"""
+    for directive in (headers.get("cache-control") or "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age" and value.isdigit():
+            return float(value)
+    return None
+
+
+def prefetch_signing_keys(force: bool = False) -> Optional[float]:
+    """ID 토큰 서명 공개키 조회 (동기)
+
+    firebase_admin 의 토큰 검증기가 쓰는 HTTP 세션(cache-control 캐시)으로 조회하므로
+    이후 검증은 캐시된 공개키를 사용합니다. force=True 면 캐시를 무시하고 새로 받아
+    만료 전에 캐시를 갱신합니다.
+
+    Returns:
+        공개키 캐시 유효 시간 (초, 알 수 없으면 None)
+    """
+    from firebase_admin import auth
+    from firebase_admin._token_gen import ID_TOKEN_CERT_URI
+
+    app = resources.firebase_app()
+    verifier = getattr(auth._get_client(app), "_token_verifier", None)
+    fetch = getattr(verifier, "request", None)
+    if fetch is None:
+        # SDK 내부 구조가 바뀐 경우: 공개키 엔드포인트 접근 가능 여부만 확인
+        import httpx
+        httpx.get(ID_TOKEN_CERT_URI, timeout=5.0).raise_for_status()
+        return None
+    headers = {"Cache-Control": "no-cache"} if force else None
+    response = fetch(ID_TOKEN_CERT_URI, method="GET", headers=headers)
+    if response.status != 200:
+        raise RuntimeError(f"public key fetch returned HTTP {response.status}")
+    return _max_age(response.headers)
+
+
+class SigningKeyRefresher:
+    """공개키 캐시가 만료되기 전에 주기적으로 갱신 (워커별 백그라운드 태스크)
+
+    갱신 주기는 interval 과 응답 max-age 의 80% 중 짧은 쪽입니다.
+    """
+
+    def __init__(self, interval: float = 3600.0):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        delay = self.interval
+        while True:
+            await asyncio.sleep(delay)
+            delay = self.interval
+            # Firebase 를 아직 쓰지 않은 프로세스는 건너뜀 (PRELOAD_SUBSYSTEMS)
+            if not resources.is_initialized("firebase_app"):
+                continue
+            try:
+                max_age = await asyncio.to_thread(prefetch_signing_keys, True)
+            except Exception as e:
+                print(f"[Auth] 공개키 갱신 실패 (다음 주기에 재시도): {e}")
+                continue
+            if max_age:
+                delay = min(self.interval, max(max_age * 0.8, 60.0))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+
+
+signing_key_refresher = SigningKeyRefresher(
+    interval=float(os.getenv("FIREBASE_KEY_REFRESH_INTERVAL", "3600"))
+)
+
+
+# ============ FastAPI 의존성 ============
+
+async def verify_firebase_token(
+    request: Request,
+    authorization: Optional[str] = Header(None)
+) -> Optional[str]:
+    """
+    Firebase ID Token 검증
+
+    검증된 UID와 클레임은 request.state.user_id / firebase_claims 에도 저장됩니다.
+    (레이트 리밋 키, Gemini 우선순위 등급 등)
+
+    Returns:
+        검증된 user_id (Firebase UID) 또는 None (개발 환경에서 인증 비활성화 시)
+    """
+    # 개발 환경에서는 인증 건너뛰기 (선택)
+    if os.getenv("ENV") == "development" and os.getenv("SKIP_AUTH") == "true":
+        return None
+
+    if not authorization:
+        raise HTTPException(
+            status_code=401,
+            detail="Authorization header required"
+        )
+
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid authorization format. Use: Bearer <token>"
+        )
+
+    token = authorization.split(" ")[1]
+
+    try:
+        # Firebase ID 토큰 검증 (캐시 미스 시 스레드에서 검증)
+        decoded_token = await _verify_cached(token)
+    except Exception as e:
+        # Firebase Admin SDK 는 검증이 실패했을 때만 예외 타입 확인용으로 로드
+        from firebase_admin import auth
+        if isinstance(e, auth.ExpiredIdTokenError):
+            raise HTTPException(status_code=401, detail="Token expired")
+        if isinstance(e, auth.InvalidIdTokenError):
+            raise HTTPException(status_code=401, detail="Invalid token")
+        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
+
+    request.state.user_id = decoded_token["uid"]
+    request.state.firebase_claims = decoded_token
+    return decoded_token["uid"]
+
+
+async def optional_firebase_user(
+    request: Request,
+    authorization: Optional[str] = Header(None)
+) -> Optional[str]:
+    """
+    선택적 Firebase 인증 (이미지 API용)
+
+    토큰이 없거나 유효하지 않으면 익명 요청으로 처리합니다. (None 반환)
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+
+    try:
+        return await verify_firebase_token(request, authorization)
+    except HTTPException:
+        return None
@@ -0,0 +1,109 @@
+"""
+Merkle 배치 앵커링
+
+CERTIFICATE_ANCHOR_MODE=merkle 일 때 인증서마다 트랜잭션을 보내지 않고,
+일정 시간(또는 일정 개수) 동안 모인 인증서 ID 를 Merkle 트리로 묶어 루트만 온체인에 기록합니다.
+(기존 컨트랙트의 issue(bytes32) 에 루트를 기록하므로 재배포 불필요)
+
+각 발급 요청은 자신이 포함된 배치의 루트가 채굴될 때까지 기다린 뒤
+루트 / 포함 증명 / 트랜잭션 정보를 받습니다. 배치는 워커별로 모읍니다.
+
+환경변수:
+    CERTIFICATE_BATCH_MAX_SIZE: 배치 최대 인증서 수 (기본 256)
+    CERTIFICATE_BATCH_MAX_WAIT: 배치 최대 대기 시간 (초, 기본 10)
+"""
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from .merkle import MerkleTree, to_hex
+from .rpc import detach_request_budget
+
+
+class MerkleAnchorBatcher:
+    """인증서 ID 를 모아 Merkle 루트 하나로 앵커링"""
+
+    def __init__(
+        self,
+        anchor: Callable[[bytes], Awaitable[dict]],
+        max_size: int = 256,
+        max_wait: float = 10.0,
+    ):
+        """
+        Args:
+            anchor: 루트(bytes32)를 온체인에 기록하고 영수증을 반환하는 코루틴 함수
+            max_size: 이 개수가 모이면 바로 앵커링
+            max_wait: 첫 인증서가 들어온 뒤 이 시간이 지나면 앵커링
+        """
+        self.anchor = anchor
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[bytes, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, cert_id: bytes) -> dict:
+        """인증서 ID 를 배치에 추가하고 앵커링 결과를 기다림
+
+        Returns:
+            {"merkle_root", "merkle_proof", "tx_hash", "block_number", "gas_used", "batch_size"}
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((cert_id, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        # 요청이 취소되어도 배치 앵커링은 계속됨
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._anchor_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _anchor_batch(self, batch: List[Tuple[bytes, asyncio.Future]]):
+        # 배치를 마감시킨 요청의 RPC 호출 수에 포함하지 않음
+        detach_request_budget()
+        # 같은 인증서가 여러 번 들어와도 리프는 하나
+        cert_ids = list(dict.fromkeys(cert_id for cert_id, _ in batch))
+        tree = MerkleTree(cert_ids)
+        index = {cert_id: i for i, cert_id in enumerate(cert_ids)}
+
+        try:
+            receipt = await self.anchor(tree.root)
+        except Exception as e:
+            print(f"[Anchor] 배치 앵커링 실패 ({len(cert_ids)}건): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+                    # 기다리는 요청이 모두 취소된 경우 경고 방지
+                    future.exception()
+            return
+
+        root = to_hex(tree.root)
+        tx_hash = receipt['transactionHash'].hex()
+        print(f"[Anchor] Merkle 루트 앵커링 완료: {root[:18]}... ({len(cert_ids)}건, tx {tx_hash[:18]}...)")
+        for cert_id, future in batch:
+            if future.done():
+                continue
+            future.set_result({
+                "merkle_root": root,
+                "merkle_proof": [to_hex(node) for node in tree.proof(index[cert_id])],
+                "tx_hash": tx_hash,
+                "block_number": receipt['blockNumber'],
+                "gas_used": receipt['gasUsed'],
+                "batch_size": len(cert_ids),
+            })
+
+    async def close(self):
+        """대기 중인 배치를 바로 앵커링하고 완료까지 대기 (종료 시)"""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
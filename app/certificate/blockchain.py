@@ -2,18 +2,95 @@
 Polygon 블록체인 연동 모듈
 
 스마트 컨트랙트와 통신하여 인증서를 발급/검증합니다.
+모든 RPC 호출은 AsyncWeb3 로 실행되어 이벤트 루프를 블로킹하지 않습니다.
+
+트랜잭션 nonce 는 NonceManager 가 로컬에서 할당하므로 여러 발급을 동시에 보낼 수 있고,
+일정 시간 채굴되지 않은 트랜잭션은 같은 nonce 로 가스비를 올려 교체합니다.
+
+환경변수:
+    POLYGON_RPC_URL: RPC URL (기본 https://rpc-amoy.polygon.technology)
+    POLYGON_RPC_URLS: 여러 RPC URL (쉼표 구분, 설정 시 POLYGON_RPC_URL 대신 사용)
+        조회는 가장 빠른 정상 엔드포인트로, 전송은 한 엔드포인트에 고정하여 보내고
+        장애 시 다음 엔드포인트로 넘어갑니다. (app.certificate.failover)
+    POLYGON_RPC_POOL_SIZE: RPC HTTP 커넥션 풀 크기 (기본 20)
+    POLYGON_RPC_TIMEOUT: RPC 요청 제한 시간 (초, 기본 10, 넘으면 다음 엔드포인트로)
+    POLYGON_RPC_COOLDOWN: 장애 엔드포인트 제외 시간 (초, 기본 5, 연속 장애 시 2배씩 최대 60)
+    TX_STUCK_TIMEOUT: 이 시간(초) 동안 채굴되지 않으면 가스비를 올려 교체 (기본 20)
+    TX_MAX_GAS_BUMPS: 최대 교체 횟수 (기본 2)
+    TX_GAS_BUMP_RATIO: 교체 시 가스비 배수 (기본 1.125, 노드 최소 인상폭 10% 이상)
+    CERTIFICATE_ANCHOR_MODE: single (인증서마다 트랜잭션, 기본) | merkle (Merkle 루트 배치 앵커링)
+    CERTIFICATE_REVOCATION_MODE: db (DB 상태만 변경, 기본) | onchain (revokeMany 로 배치 기록 후
+        검증 시 온체인 취소 여부도 확인, OceanSealCertV2 필요, app.certificate.revocation)
+    GAS_PRICE_TTL: 가스비 캐시 유효 시간 (초, 기본 5, 지나면 캐시 값을 쓰면서 백그라운드 갱신,
+        TTL 의 2배가 지났거나 백그라운드 갱신이 실패했으면 직접 조회)
+
+RPC 호출 수 절감 (web3 미들웨어):
+    - eth_chainId 는 처음 한 번만 조회 (eth_call / 트랜잭션 검증 시 web3 가 매번 조회하던 값)
+    - eth_gasPrice 는 GAS_PRICE_TTL 동안 캐시
+    - 연결 상태는 별도 확인 호출 없이 실제 RPC 호출 결과로 추적 (/readyz 확인 생략에 사용)
+    - 검증(verify) 결과는 VerificationCache 에 캐시 (app.certificate.verify_cache)
+    - 캐시에 없으면 Issued 이벤트 로컬 인덱스에서 먼저 찾음 (app.certificate.indexer)
+    - 온체인 취소 여부(revokedAt)도 같은 캐시 / Revoked 이벤트 인덱스를 거쳐 조회
 """
 import os
+import time
+import asyncio
 import hashlib
 import base64
-from typing import Optional, Tuple
-from web3 import Web3
-from eth_account import Account
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
-load_dotenv()
+import aiohttp
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3.exceptions import TransactionNotFound
+from eth_account import Account
 
-# 배포된 컨트랙트 ABI (OceanSealCert)
+from .nonce import NonceManager, is_nonce_conflict
+from .anchor import MerkleAnchorBatcher
+from .merkle import verify_proof, from_hex
+from .rpc import RPCError, record_rpc_call, detach_request_budget
+from .failover import FailoverHTTPProvider
+from .verify_cache import VerificationCache
+from .indexer import IssuedEventIndexer
+
+# nonce 충돌 시 재할당 횟수
+_NONCE_RETRIES = 3
+# 영수증 폴링 간격 (초)
+_RECEIPT_POLL_INTERVAL = 1.0
+# 캐시된 가스비를 백그라운드 갱신 중에도 쓸 수 있는 최대 기간 (GAS_PRICE_TTL 배수, 넘으면 직접 조회)
+_GAS_PRICE_MAX_STALE = 2
+# revokeMany 가스 한도 (기본 + 인증서당, 발급 기록이 없는 인증서는 새 슬롯)
+_REVOKE_BASE_GAS = 40000
+_REVOKE_GAS_PER_CERT = 30000
+# 검증 캐시에서 취소 조회 키를 발급 조회 키와 구분
+_REVOCATION_KEY_PREFIX = b"revoked:"
+
+
+def _cache_key(fn_name: str, key: bytes) -> bytes:
+    """온체인 조회 (verify / revokedAt) -> 검증 캐시 키"""
+    return _REVOCATION_KEY_PREFIX + key if fn_name == "revokedAt" else key
+
+
+def raw_transaction(signed_tx) -> bytes:
+    """서명된 트랜잭션 바이트 (eth-account 0.11: rawTransaction, 0.13+: raw_transaction)"""
+    raw = getattr(signed_tx, "raw_transaction", None)
+    return raw if raw is not None else signed_tx.rawTransaction
+
+
+@dataclass
+class PendingTransaction:
+    """전송 후 채굴 대기 중인 트랜잭션 (가스비 교체 시 후보 해시가 늘어남)"""
+    contract_call: object
+    nonce: int
+    gas: int
+    gas_price: int
+    chain_id: int
+    tx_hashes: List[bytes] = field(default_factory=list)
+    sent_at: float = 0.0
+    bumps: int = 0
+
+# 배포된 컨트랙트 ABI (OceanSealCert, revokeMany / revokedAt / Revoked 는 OceanSealCertV2 만)
 CONTRACT_ABI = [
     {"inputs":[],"stateMutability":"nonpayable","type":"constructor"},
     {
@@ -25,6 +102,15 @@ CONTRACT_ABI = [
         "name":"Issued",
         "type":"event"
     },
+    {
+        "anonymous": False,
+        "inputs":[
+            {"indexed":True,"name":"certId","type":"bytes32"},
+            {"indexed":False,"name":"timestamp","type":"uint256"}
+        ],
+        "name":"Revoked",
+        "type":"event"
+    },
     {
         "inputs":[],
         "name":"admin",
@@ -52,36 +138,88 @@ CONTRACT_ABI = [
         "outputs":[{"name":"","type":"uint256"}],
         "stateMutability":"view",
         "type":"function"
+    },
+    {
+        "inputs":[{"name":"certIds","type":"bytes32[]"}],
+        "name":"revokeMany",
+        "outputs":[],
+        "stateMutability":"nonpayable",
+        "type":"function"
+    },
+    {
+        "inputs":[{"name":"certId","type":"bytes32"}],
+        "name":"revokedAt",
+        "outputs":[{"name":"","type":"uint256"}],
+        "stateMutability":"view",
+        "type":"function"
     }
 ]
 
 
 class BlockchainService:
-    """Polygon 블록체인 서비스"""
+    """Polygon 블록체인 서비스
 
-    def __init__(self):
-        # 환경 변수에서 설정 로드
-        self.rpc_url = os.getenv(
-            "POLYGON_RPC_URL",
-            "https://rpc-amoy.polygon.technology"
-        )
+    app.resources 에서 처음 필요할 때 생성됩니다. (환경변수는 app.config 에서 로드)
+    """
+
+    def __init__(self, w3: Optional[AsyncWeb3] = None):
+        """
+        Args:
+            w3: 사용할 AsyncWeb3 (기본: POLYGON_RPC_URL 로 생성, 로컬 EVM 검증 스크립트용)
+        """
+        # 환경 변수에서 설정 로드 (POLYGON_RPC_URLS 가 있으면 여러 엔드포인트로 장애 조치)
+        self.rpc_urls = [
+            url.strip() for url in os.getenv("POLYGON_RPC_URLS", "").split(",") if url.strip()
+        ] or [os.getenv("POLYGON_RPC_URL", "https://rpc-amoy.polygon.technology")]
+        self.rpc_url = self.rpc_urls[0]
         self.private_key = os.getenv("POLYGON_PRIVATE_KEY")
         self.contract_address = os.getenv("CERTIFICATE_CONTRACT_ADDRESS")
 
-        # Web3 초기화
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        # AsyncWeb3 초기화 (HTTP 세션은 첫 호출 시 이벤트 루프 안에서 생성)
+        self.rpc_timeout = float(os.getenv("POLYGON_RPC_TIMEOUT", "10"))
+        self.rpc_pool_size = int(os.getenv("POLYGON_RPC_POOL_SIZE", "20"))
+        self.provider = FailoverHTTPProvider(
+            self.rpc_urls,
+            request_timeout=self.rpc_timeout,
+            cooldown=float(os.getenv("POLYGON_RPC_COOLDOWN", "5")),
+        )
+        self.w3 = w3 or AsyncWeb3(self.provider)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+
+        # 체인 메타데이터 캐시 / 연결 상태 (RPC 미들웨어에서 갱신)
+        self.gas_price_ttl = float(os.getenv("GAS_PRICE_TTL", "5"))
+        self._chain_id_response: Optional[dict] = None
+        self._gas_price_response: Optional[dict] = None
+        self._gas_price_at = 0.0
+        self._gas_price_refresh: Optional[asyncio.Task] = None
+        # 마지막 백그라운드 갱신이 실패하면 캐시 값을 더 쓰지 않고 직접 조회
+        self._gas_price_refresh_failed = False
+        self.last_rpc_success_at: Optional[float] = None
+        self.last_rpc_error_at: Optional[float] = None
+        if "oceanseal_rpc" in self.w3.middleware_onion:
+            # 같은 AsyncWeb3 를 주입받아 다시 생성된 경우
+            self.w3.middleware_onion.remove("oceanseal_rpc")
+        self.w3.middleware_onion.inject(self._rpc_middleware, "oceanseal_rpc", layer=0)
 
         # 관리자 계정 (서버 지갑)
         if self.private_key:
             self.admin_account = Account.from_key(self.private_key)
+            self.nonce_manager = NonceManager(self.w3, self.admin_account.address)
         else:
             self.admin_account = None
+            self.nonce_manager = None
+
+        # 멈춘 트랜잭션 교체 설정
+        self.stuck_timeout = float(os.getenv("TX_STUCK_TIMEOUT", "20"))
+        self.max_gas_bumps = int(os.getenv("TX_MAX_GAS_BUMPS", "2"))
+        self.gas_bump_ratio = float(os.getenv("TX_GAS_BUMP_RATIO", "1.125"))
 
         # 컨트랙트 인스턴스
         if self.contract_address and self.contract_address != "배포_필요":
             try:
                 self.contract = self.w3.eth.contract(
-                    address=Web3.to_checksum_address(self.contract_address),
+                    address=AsyncWeb3.to_checksum_address(self.contract_address),
                     abi=CONTRACT_ABI
                 )
             except Exception as e:
@@ -90,14 +228,275 @@ class BlockchainService:
         else:
             self.contract = None
 
+        # 온체인 검증 결과 캐시 (조회 키 -> 발급 타임스탬프), 같은 키 동시 조회는 한 번만
+        self.verify_cache = VerificationCache.from_env(self.contract.address) if self.contract else None
+        self._verify_pending: Dict[bytes, asyncio.Task] = {}
+        # Issued 이벤트 로컬 인덱스 (lifespan warm-up 후 시작)
+        self.indexer = IssuedEventIndexer.from_env(self.w3, self.contract.address) if self.contract else None
+
+        # Merkle 배치 앵커링 (CERTIFICATE_ANCHOR_MODE=merkle)
+        self.anchor_mode = os.getenv("CERTIFICATE_ANCHOR_MODE", "single").lower()
+        if self.anchor_mode == "merkle":
+            self.anchor_batcher = MerkleAnchorBatcher(
+                self.anchor_root,
+                max_size=int(os.getenv("CERTIFICATE_BATCH_MAX_SIZE", "256")),
+                max_wait=float(os.getenv("CERTIFICATE_BATCH_MAX_WAIT", "10")),
+            )
+        else:
+            self.anchor_batcher = None
+        # 온체인 취소 (CERTIFICATE_REVOCATION_MODE=onchain, 배치 전송은 RevocationQueue)
+        self.revocation_mode = os.getenv("CERTIFICATE_REVOCATION_MODE", "db").lower()
+
     def is_configured(self) -> bool:
-        """블록체인 설정이 완료되었는지 확인"""
+        """블록체인 설정이 완료되었는지 확인
+
+        RPC 연결 여부는 매 호출마다 확인하지 않고 실제 호출 실패로 드러납니다.
+        (연결 상태는 /readyz 의 blockchain 항목에서 주기적으로 확인)
+        """
         return (
-            self.w3.is_connected() and
             self.admin_account is not None and
             self.contract is not None
         )
 
+    async def ensure_session(self):
+        """RPC 호출용 aiohttp 세션 생성 (워커당 하나, 커넥션 풀/keep-alive 재사용)"""
+        if self._session is not None and not self._session.closed:
+            return
+        if self.w3.provider is not self.provider:
+            # 외부에서 주입한 provider (로컬 EVM 등)
+            return
+        async with self._session_lock:
+            if self._session is not None and not self._session.closed:
+                return
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.rpc_pool_size, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.rpc_timeout),
+            )
+            await self.provider.cache_async_session(session)
+            self._session = session
+
+    async def close(self):
+        """대기 중인 배치 앵커링 후 HTTP 세션 정리 (lifespan 종료 시)"""
+        if self.anchor_batcher is not None:
+            await self.anchor_batcher.close()
+        if self._gas_price_refresh is not None and not self._gas_price_refresh.done():
+            self._gas_price_refresh.cancel()
+        if self.indexer is not None:
+            await self.indexer.close()
+        if self.verify_cache is not None:
+            self.verify_cache.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def get_block_number(self) -> int:
+        """최신 블록 번호 (연결 확인용)"""
+        await self.ensure_session()
+        return await self.w3.eth.block_number
+
+    # ============ RPC 미들웨어 (캐시 / 호출 수 / 연결 상태) ============
+
+    def is_connected_recently(self, within: float) -> bool:
+        """within 초 안에 RPC 호출이 성공했고 그 뒤로 전송 실패가 없는지 (별도 호출 없음)"""
+        if self.last_rpc_success_at is None:
+            return False
+        if self.last_rpc_error_at is not None and self.last_rpc_error_at >= self.last_rpc_success_at:
+            return False
+        return time.monotonic() - self.last_rpc_success_at < within
+
+    async def _send_rpc(self, make_request, method, params):
+        """노드로 실제 전송 (호출 수 / 연결 상태 기록)"""
+        record_rpc_call(method)
+        try:
+            response = await make_request(method, params)
+        except Exception:
+            # 전송 / 타임아웃 에러 (revert 등 RPC 에러 응답은 연결 성공으로 봄)
+            self.last_rpc_error_at = time.monotonic()
+            raise
+        self.last_rpc_success_at = time.monotonic()
+        return response
+
+    async def _fetch_gas_price(self, make_request) -> dict:
+        response = await self._send_rpc(make_request, "eth_gasPrice", [])
+        if "error" not in response:
+            self._gas_price_response = response
+            self._gas_price_at = time.monotonic()
+            self._gas_price_refresh_failed = False
+        return response
+
+    async def _refresh_gas_price(self, make_request):
+        # 요청 처리 중에 시작돼도 해당 요청의 호출 수로 세지 않음
+        detach_request_budget()
+        try:
+            response = await self._fetch_gas_price(make_request)
+            if "error" in response:
+                raise RuntimeError(response["error"])
+        except Exception as e:
+            self._gas_price_refresh_failed = True
+            print(f"[Blockchain] 가스비 갱신 실패 (다음 요청은 직접 조회): {e}")
+
+    async def _rpc_middleware(self, make_request, w3):
+        """가장 안쪽 web3 미들웨어: 체인 ID / 가스비 캐시, 호출 수 / 연결 상태 기록"""
+        async def middleware(method, params):
+            if method == "eth_chainId":
+                # 체인 ID 는 바뀌지 않으므로 영구 캐시
+                if self._chain_id_response is None:
+                    response = await self._send_rpc(make_request, method, params)
+                    if "error" in response:
+                        return response
+                    self._chain_id_response = response
+                return self._chain_id_response
+
+            if method == "eth_gasPrice":
+                age = time.monotonic() - self._gas_price_at
+                if (
+                    self._gas_price_response is None
+                    or self._gas_price_refresh_failed
+                    or age >= self.gas_price_ttl * _GAS_PRICE_MAX_STALE
+                ):
+                    return await self._fetch_gas_price(make_request)
+                if age >= self.gas_price_ttl and (
+                    self._gas_price_refresh is None or self._gas_price_refresh.done()
+                ):
+                    # 캐시 값을 바로 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+                    self._gas_price_refresh = asyncio.get_running_loop().create_task(
+                        self._refresh_gas_price(make_request)
+                    )
+                return self._gas_price_response
+
+            return await self._send_rpc(make_request, method, params)
+
+        return middleware
+
+    # ============ 트랜잭션 전송 ============
+
+    async def _sign_and_send(self, contract_call, nonce: int, gas: int, gas_price: int, chain_id: int):
+        tx = await contract_call.build_transaction({
+            'from': self.admin_account.address,
+            'nonce': nonce,
+            'gas': gas,
+            'gasPrice': gas_price,
+            'chainId': chain_id
+        })
+        signed_tx = self.w3.eth.account.sign_transaction(tx, self.admin_account.key)
+        return await self.w3.eth.send_raw_transaction(raw_transaction(signed_tx))
+
+    async def broadcast(self, contract_call, gas: int) -> PendingTransaction:
+        """컨트랙트 트랜잭션 전송 (영수증은 기다리지 않음)
+
+        로컬 nonce 를 할당하고 (nonce 충돌 시 체인과 재동기화 후 재할당)
+        서명 / 전송합니다. 전송 실패 시 nonce 는 반납됩니다.
+        """
+        chain_id = await self.w3.eth.chain_id
+
+        for _ in range(_NONCE_RETRIES):
+            # 가스비를 먼저 조회 (nonce 할당 후 실패하면 반납되지 않은 nonce 가 gap 으로 남음, 보통 캐시 값)
+            gas_price = await self.w3.eth.gas_price
+            nonce = await self.nonce_manager.allocate()
+            try:
+                tx_hash = await self._sign_and_send(contract_call, nonce, gas, gas_price, chain_id)
+                break
+            except Exception as e:
+                if is_nonce_conflict(e):
+                    print(f"[Blockchain] nonce {nonce} 충돌, 재동기화 후 재시도: {e}")
+                    await self.nonce_manager.resync()
+                    continue
+                await self.nonce_manager.release(nonce)
+                raise
+        else:
+            raise RuntimeError("nonce 충돌 재시도 횟수 초과")
+
+        return PendingTransaction(
+            contract_call=contract_call,
+            nonce=nonce,
+            gas=gas,
+            gas_price=gas_price,
+            chain_id=chain_id,
+            tx_hashes=[tx_hash],
+            sent_at=time.monotonic(),
+        )
+
+    async def bump_gas(self, pending: PendingTransaction):
+        """멈춘 트랜잭션을 같은 nonce / 인상된 가스비로 교체 전송"""
+        pending.gas_price = int(pending.gas_price * self.gas_bump_ratio) + 1
+        pending.bumps += 1
+        pending.sent_at = time.monotonic()
+        print(f"[Blockchain] nonce {pending.nonce} 트랜잭션 지연, 가스비 인상 후 교체: {pending.gas_price}")
+        try:
+            pending.tx_hashes.append(await self._sign_and_send(
+                pending.contract_call, pending.nonce, pending.gas, pending.gas_price, pending.chain_id
+            ))
+        except Exception as e:
+            # 교체 직전에 기존 트랜잭션이 채굴됐거나 인상폭이 부족한 경우: 계속 대기
+            if not is_nonce_conflict(e):
+                raise
+
+    async def get_receipts(self, tx_hashes: List[bytes]) -> Dict[bytes, Optional[dict]]:
+        """여러 트랜잭션 영수증 조회 (아직 채굴되지 않았거나 해당 항목 조회가 실패하면 None)
+
+        HTTP RPC 는 JSON-RPC 배치 요청 한 번으로 조회합니다. 배치 전체(전송) 실패만 예외로 전달합니다.
+        반환 영수증 필드: transactionHash, blockNumber, status, gasUsed
+        """
+        if not tx_hashes:
+            return {}
+        if self.w3.provider is self.provider:
+            await self.ensure_session()
+            try:
+                results = await self.provider.make_batch_request(
+                    [("eth_getTransactionReceipt", ["0x" + bytes(h).hex()]) for h in tx_hashes]
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError, RPCError):
+                self.last_rpc_error_at = time.monotonic()
+                raise
+            self.last_rpc_success_at = time.monotonic()
+            receipts = {}
+            for tx_hash, result in zip(tx_hashes, results):
+                if isinstance(result, Exception):
+                    # 개별 항목 에러는 그 트랜잭션만 "아직" 으로 보고 다음 폴링에서 재조회
+                    print(f"[Blockchain] 영수증 조회 실패 {bytes(tx_hash).hex()[:18]}...: {result}")
+                    receipts[tx_hash] = None
+                    continue
+                receipts[tx_hash] = {
+                    'transactionHash': HexBytes(result['transactionHash']),
+                    'blockNumber': int(result['blockNumber'], 16),
+                    'status': int(result['status'], 16),
+                    'gasUsed': int(result['gasUsed'], 16),
+                } if result else None
+            return receipts
+
+        # 외부에서 주입한 provider (로컬 EVM 등): 개별 조회
+        async def one(tx_hash):
+            try:
+                return await self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                return None
+        return dict(zip(tx_hashes, await asyncio.gather(*(one(h) for h in tx_hashes))))
+
+    async def wait_for_receipt(self, pending: PendingTransaction) -> dict:
+        """채굴될 때까지 폴링, stuck_timeout 마다 가스비를 올려 교체 (최대 max_gas_bumps 회)"""
+        while True:
+            receipts = await self.get_receipts(pending.tx_hashes)
+            receipt = next((r for r in receipts.values() if r is not None), None)
+            if receipt is not None:
+                return receipt
+            if time.monotonic() - pending.sent_at >= self.stuck_timeout:
+                if pending.bumps >= self.max_gas_bumps:
+                    raise TimeoutError(
+                        f"트랜잭션이 {len(pending.tx_hashes)}회 전송 후에도 채굴되지 않음 (nonce {pending.nonce})"
+                    )
+                await self.bump_gas(pending)
+            await asyncio.sleep(_RECEIPT_POLL_INTERVAL)
+
+    async def send_transaction(self, contract_call, gas: int) -> dict:
+        """컨트랙트 트랜잭션 전송 후 영수증 반환 (broadcast + wait_for_receipt)"""
+        pending = await self.broadcast(contract_call, gas)
+        return await self.wait_for_receipt(pending)
+
+    def compute_cert_id(self, image_hash: str, cert_type: str, user_id: str) -> bytes:
+        """certId 생성 (image_hash + cert_type + user_id의 해시, bytes32)"""
+        cert_data = f"{image_hash}{cert_type}{user_id}"
+        return hashlib.sha256(cert_data.encode()).digest()
+
     def compute_image_hash(self, image_data: bytes) -> str:
         """
         이미지의 SHA-256 해시 계산
@@ -149,38 +548,30 @@ class BlockchainService:
             return False, None, "Blockchain not configured"
 
         try:
-            # certId 생성 (image_hash + cert_type + user_id의 해시)
-            cert_data = f"{image_hash}{cert_type}{user_id}"
-            cert_id_hash = hashlib.sha256(cert_data.encode()).digest()
+            await self.ensure_session()
 
-            # 트랜잭션 구성
-            nonce = self.w3.eth.get_transaction_count(self.admin_account.address)
-            gas_price = self.w3.eth.gas_price
+            cert_id_hash = self.compute_cert_id(image_hash, cert_type, user_id)
 
-            tx = self.contract.functions.issue(cert_id_hash).build_transaction({
-                'from': self.admin_account.address,
-                'nonce': nonce,
-                'gas': 100000,
-                'gasPrice': gas_price,
-                'chainId': self.w3.eth.chain_id
-            })
+            cert_id = "0x" + cert_id_hash.hex()
 
-            # 서명 및 전송
-            signed_tx = self.w3.eth.account.sign_transaction(tx, self.admin_account.key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            if self.anchor_batcher is not None:
+                # 배치의 Merkle 루트가 채굴될 때까지 대기
+                result = await self.anchor_batcher.submit(cert_id_hash)
+                result['cert_id'] = cert_id
+                print(f"[Blockchain] 인증서 발급 성공 (Merkle 배치 {result['batch_size']}건): {cert_id[:18]}...")
+                return True, result, None
 
-            # 영수증 대기
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
+            # 전송 및 영수증 대기 (비동기 폴링 - 대기 중에도 다른 요청 처리)
+            receipt = await self.send_transaction(
+                self.contract.functions.issue(cert_id_hash), gas=100000
+            )
 
             if receipt['status'] != 1:
                 return False, None, "Transaction failed"
 
-            # 이벤트에서 정보 추출
-            cert_id = "0x" + cert_id_hash.hex()
-
             result = {
                 'cert_id': cert_id,
-                'tx_hash': tx_hash.hex(),
+                'tx_hash': receipt['transactionHash'].hex(),
                 'block_number': receipt['blockNumber'],
                 'gas_used': receipt['gasUsed']
             }
@@ -192,12 +583,42 @@ class BlockchainService:
             print(f"[Blockchain] 인증서 발급 실패: {e}")
             return False, None, str(e)
 
-    async def verify_certificate(self, cert_id: str) -> Tuple[bool, Optional[dict], Optional[str]]:
+    async def anchor_root(self, root: bytes) -> dict:
+        """Merkle 루트를 온체인에 기록 (issue(bytes32) 재사용)"""
+        await self.ensure_session()
+        receipt = await self.send_transaction(self.contract.functions.issue(root), gas=100000)
+        if receipt['status'] != 1:
+            raise RuntimeError("Merkle root transaction failed")
+        return receipt
+
+    async def revoke_many(self, cert_ids: List[bytes]) -> dict:
+        """여러 인증서 취소를 트랜잭션 하나로 기록 (revokeMany, 이미 취소된 ID 는 컨트랙트가 무시)"""
+        await self.ensure_session()
+        receipt = await self.send_transaction(
+            self.contract.functions.revokeMany(cert_ids),
+            gas=_REVOKE_BASE_GAS + _REVOKE_GAS_PER_CERT * len(cert_ids),
+        )
+        if receipt['status'] != 1:
+            raise RuntimeError("Revocation transaction failed")
+        return receipt
+
+    async def verify_certificate(
+        self,
+        cert_id: str,
+        merkle_root: Optional[str] = None,
+        merkle_proof: Optional[List[str]] = None
+    ) -> Tuple[bool, Optional[dict], Optional[str]]:
         """
         블록체인에서 인증서 검증
 
+        Merkle 배치로 발급된 인증서는 포함 증명으로 루트를 재계산하여 확인한 뒤,
+        그 루트가 온체인에 기록되어 있는지 조회합니다.
+        CERTIFICATE_REVOCATION_MODE=onchain 이면 인증서 ID 의 온체인 취소 여부도 확인합니다.
+
         Args:
             cert_id: 인증서 ID (0x 접두사 포함)
+            merkle_root: 배치 Merkle 루트 (배치 발급 인증서만)
+            merkle_proof: 포함 증명 (배치 발급 인증서만)
 
         Returns:
             (유효 여부, 인증서 정보, 에러 메시지)
@@ -206,26 +627,211 @@ class BlockchainService:
             return False, None, "Blockchain not configured"
 
         try:
-            # cert_id를 bytes32로 변환
-            cert_id_bytes = bytes.fromhex(cert_id[2:] if cert_id.startswith("0x") else cert_id)
+            await self.ensure_session()
 
-            # 컨트랙트에서 타임스탬프 조회
-            timestamp = self.contract.functions.verify(cert_id_bytes).call()
+            anchored_id = self._anchored_id(cert_id, merkle_root, merkle_proof)
+            if anchored_id is None:
+                return False, None, "Merkle proof does not match root"
 
-            if timestamp == 0:
-                return False, None, "Certificate not found on blockchain"
+            # 발급 타임스탬프 조회: 캐시 -> Issued 이벤트 인덱스 -> 컨트랙트 (RPC)
+            timestamp, source = await self._local_timestamp(anchored_id)
+            if timestamp is None:
+                source = "rpc"
+                timestamp = await self._lookup_onchain("verify", anchored_id)
 
-            result = {
-                'timestamp': timestamp,
-                'is_valid': True
-            }
+            # 취소 여부도 같은 경로로 조회 (CERTIFICATE_REVOCATION_MODE=onchain)
+            revoked_at = None
+            if timestamp and self.revocation_mode == "onchain":
+                cert_id_bytes = from_hex(cert_id)
+                revoked_at = await self._local_revocation(cert_id_bytes)
+                if revoked_at is None:
+                    revoked_at = await self._lookup_onchain("revokedAt", cert_id_bytes)
 
-            return True, result, None
+            return self._verify_result(timestamp, source, revoked_at)
 
         except Exception as e:
             print(f"[Blockchain] 인증서 검증 실패: {e}")
             return False, None, str(e)
 
+    async def verify_certificates(
+        self,
+        items: List[Tuple[str, Optional[str], Optional[List[str]]]]
+    ) -> List[Tuple[bool, Optional[dict], Optional[str]]]:
+        """
+        여러 인증서 일괄 검증 (캐시 / 인덱스에 없는 것만 JSON-RPC 배치 요청 한 번으로 조회)
+
+        Args:
+            items: [(cert_id, merkle_root, merkle_proof), ...]
+
+        Returns:
+            items 순서대로 (유효 여부, 인증서 정보, 에러 메시지)
+        """
+        if not self.is_configured():
+            return [(False, None, "Blockchain not configured")] * len(items)
+
+        anchored_ids: List[Optional[bytes]] = []
+        for cert_id, merkle_root, merkle_proof in items:
+            try:
+                anchored_ids.append(self._anchored_id(cert_id, merkle_root, merkle_proof))
+            except ValueError:
+                anchored_ids.append(None)
+        valid_ids = [a for a in anchored_ids if a is not None]
+
+        local = await asyncio.gather(*(self._local_timestamp(anchored_id) for anchored_id in valid_ids))
+        found = dict(zip(valid_ids, local))
+        lookups = [("verify", a) for a, (timestamp, _) in found.items() if timestamp is None]
+
+        revocations: Dict[bytes, Optional[int]] = {}
+        if self.revocation_mode == "onchain":
+            cert_ids = list(dict.fromkeys(
+                from_hex(item[0]) for item, anchored_id in zip(items, anchored_ids) if anchored_id is not None
+            ))
+            local = await asyncio.gather(*(self._local_revocation(cert_id) for cert_id in cert_ids))
+            revocations = dict(zip(cert_ids, local))
+            lookups += [("revokedAt", c) for c, revoked_at in revocations.items() if revoked_at is None]
+
+        fetched: Dict[Tuple[str, bytes], int] = {}
+        error = None
+        if lookups:
+            try:
+                await self.ensure_session()
+                fetched = await self._fetch_onchain(list(dict.fromkeys(lookups)))
+            except Exception as e:
+                print(f"[Blockchain] 일괄 검증 조회 실패: {e}")
+                error = str(e)
+
+        results = []
+        for (cert_id, _, _), anchored_id in zip(items, anchored_ids):
+            if anchored_id is None:
+                results.append((False, None, "Merkle proof does not match root"))
+                continue
+            timestamp, source = found[anchored_id]
+            if timestamp is None:
+                if ("verify", anchored_id) not in fetched:
+                    results.append((False, None, error or "Lookup failed"))
+                    continue
+                timestamp, source = fetched[("verify", anchored_id)], "rpc"
+            revoked_at = None
+            if self.revocation_mode == "onchain" and timestamp:
+                cert_id_bytes = from_hex(cert_id)
+                revoked_at = revocations[cert_id_bytes]
+                if revoked_at is None:
+                    if ("revokedAt", cert_id_bytes) not in fetched:
+                        results.append((False, None, error or "Lookup failed"))
+                        continue
+                    revoked_at = fetched[("revokedAt", cert_id_bytes)]
+            results.append(self._verify_result(timestamp, source, revoked_at))
+        return results
+
+    def _anchored_id(
+        self,
+        cert_id: str,
+        merkle_root: Optional[str],
+        merkle_proof: Optional[List[str]]
+    ) -> Optional[bytes]:
+        """온체인 조회 키 (인증서 ID 또는 Merkle 루트, 포함 증명이 맞지 않으면 None)"""
+        # cert_id를 bytes32로 변환
+        cert_id_bytes = from_hex(cert_id)
+        if not merkle_root:
+            return cert_id_bytes
+        anchored_id = from_hex(merkle_root)
+        if not verify_proof(cert_id_bytes, [from_hex(node) for node in merkle_proof or []], anchored_id):
+            return None
+        return anchored_id
+
+    async def _local_timestamp(self, anchored_id: bytes) -> Tuple[Optional[int], str]:
+        """캐시 -> Issued 이벤트 인덱스 순으로 조회 (둘 다 없으면 None)"""
+        timestamp = await self.verify_cache.get(anchored_id)
+        if timestamp is not None:
+            return timestamp, "cache"
+        if self.indexer is not None:
+            timestamp = await self.indexer.lookup(anchored_id)
+            if timestamp is not None:
+                await self.verify_cache.put(anchored_id, timestamp)
+                return timestamp, "index"
+        return None, "rpc"
+
+    async def _local_revocation(self, cert_id: bytes) -> Optional[int]:
+        """취소 타임스탬프: 캐시 -> Revoked 이벤트 인덱스 순으로 조회 (0 = 취소 안 됨, 둘 다 모르면 None)"""
+        key = _cache_key("revokedAt", cert_id)
+        revoked_at = await self.verify_cache.get(key)
+        if revoked_at is not None:
+            return revoked_at
+        if self.indexer is not None:
+            revoked_at = await self.indexer.lookup_revocation(cert_id)
+            if revoked_at is not None:
+                await self.verify_cache.put(key, revoked_at)
+                return revoked_at
+        return None
+
+    def _verify_result(
+        self,
+        timestamp: int,
+        source: str,
+        revoked_at: Optional[int] = None
+    ) -> Tuple[bool, Optional[dict], Optional[str]]:
+        if timestamp == 0:
+            return False, None, "Certificate not found on blockchain"
+        info = {
+            'timestamp': timestamp,
+            'is_valid': True,
+            'source': source,
+            'index_lag_blocks': self.indexer.lag_blocks if self.indexer is not None else None
+        }
+        if revoked_at:
+            info.update(is_valid=False, revoked_at=revoked_at)
+            return False, info, "Certificate revoked on blockchain"
+        return True, info, None
+
+    async def _fetch_onchain(self, lookups: List[Tuple[str, bytes]]) -> Dict[Tuple[str, bytes], int]:
+        """verify / revokedAt(bytes32) 여러 건 조회 후 캐시 (HTTP RPC 는 JSON-RPC 배치 요청 한 번)"""
+        if self.w3.provider is self.provider:
+            calls = [
+                ("eth_call", [{
+                    "to": self.contract.address,
+                    "data": self.contract.encodeABI(fn_name=fn_name, args=[key]),
+                }, "latest"])
+                for fn_name, key in lookups
+            ]
+            try:
+                results = await self.provider.make_batch_request(calls)
+            except (aiohttp.ClientError, asyncio.TimeoutError, RPCError):
+                self.last_rpc_error_at = time.monotonic()
+                raise
+            self.last_rpc_success_at = time.monotonic()
+            values = {}
+            for lookup, result in zip(lookups, results):
+                if isinstance(result, Exception):
+                    continue
+                # 코드가 없는 주소 등은 "0x" 반환
+                values[lookup] = int(result, 16) if result not in (None, "0x") else 0
+        else:
+            # 외부에서 주입한 provider (로컬 EVM 등): 개별 조회
+            results = await asyncio.gather(*(
+                self.contract.get_function_by_name(fn_name)(key).call() for fn_name, key in lookups
+            ))
+            values = dict(zip(lookups, results))
+
+        for (fn_name, key), value in values.items():
+            await self.verify_cache.put(_cache_key(fn_name, key), value)
+        return values
+
+    async def _lookup_onchain(self, fn_name: str, key: bytes) -> int:
+        """verify / revokedAt(bytes32) 조회 후 캐시 (같은 조회 동시 요청 합치기)"""
+        cache_key = _cache_key(fn_name, key)
+        task = self._verify_pending.get(cache_key)
+        if task is None:
+            async def lookup():
+                try:
+                    value = await self.contract.get_function_by_name(fn_name)(key).call()
+                    await self.verify_cache.put(cache_key, value)
+                    return value
+                finally:
+                    self._verify_pending.pop(cache_key, None)
+            task = self._verify_pending[cache_key] = asyncio.get_running_loop().create_task(lookup())
+        # 한 요청이 취소되어도 같은 조회를 기다리는 다른 요청은 계속
+        return await asyncio.shield(task)
+
     def get_polygonscan_url(self, tx_hash: str) -> str:
         """PolygonScan 트랜잭션 URL 반환"""
         if "amoy" in self.rpc_url.lower():
@@ -233,6 +839,3 @@ class BlockchainService:
         else:
             return f"https://polygonscan.com/tx/{tx_hash}"
 
-
-# 싱글톤 인스턴스
-blockchain_service = BlockchainService()
@@ -0,0 +1,290 @@
+"""
+인증서 블록체인 기록 확인 워커
+
+발급 API 는 PENDING 상태의 인증서를 바로 반환하고, 실제 온체인 기록은 이 워커가 처리합니다.
+
+- single 모드: 트랜잭션을 전송한 뒤 모든 대기 트랜잭션의 영수증을 JSON-RPC 배치 한 번으로 폴링
+  (stuck_timeout 동안 채굴되지 않으면 가스비를 올려 교체)
+- merkle 모드: 배치 Merkle 루트가 채굴될 때까지 대기
+- 확인되면 tx_hash / block_number / (merkle_root, merkle_proof) 를 기록하고 ACTIVE 로 변경
+- 실패하면 오프체인 인증서로 전환 (tx_hash = "offchain", ACTIVE)
+
+워커가 죽거나 재시작되어 처리되지 못한 PENDING 인증서는 한 워커(파일 락)가 주기적으로 찾아 다시 처리합니다.
+(리더 워커가 종료되면 다른 워커가 다음 주기에 락을 넘겨받음)
+
+환경변수:
+    CONFIRM_POLL_INTERVAL: 영수증 폴링 간격 (초, 기본 2)
+    CONFIRM_RECOVER_AFTER: 이 시간(초)보다 오래된 PENDING 인증서를 재처리 (기본 600)
+    CONFIRM_RECOVER_INTERVAL: 재처리 대상 조회 주기 (초, 기본 60)
+"""
+import os
+import time
+import asyncio
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Set, TYPE_CHECKING
+
+try:
+    import fcntl
+except ImportError:  # Windows: 재처리 비활성화
+    fcntl = None
+
+from . import db
+from .models import CertificateStatus
+from .merkle import from_hex
+from .rpc import detach_request_budget
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+    from .blockchain import BlockchainService, PendingTransaction
+
+
+@dataclass
+class _Tracked:
+    pending: "PendingTransaction"
+    future: asyncio.Future
+
+
+class CertificateConfirmer:
+    """PENDING 인증서를 온체인에 기록하고 DB 상태를 갱신하는 백그라운드 워커 (워커 프로세스별)"""
+
+    def __init__(
+        self,
+        blockchain: "BlockchainService",
+        supabase: Optional["AsyncClient"],
+        poll_interval: float = 2.0,
+        recover_after: float = 600.0,
+        recover_interval: float = 60.0,
+    ):
+        self.blockchain = blockchain
+        self.supabase = supabase
+        self.poll_interval = poll_interval
+        self.recover_after = recover_after
+        self.recover_interval = recover_interval
+        # cert_id -> 채굴 대기 중인 트랜잭션
+        self._tracked: Dict[str, _Tracked] = {}
+        # 이 워커에서 처리 중인 cert_id (재처리 주기에 중복 시작 방지)
+        self._active: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._poll_task: Optional[asyncio.Task] = None
+        self._recover_task: Optional[asyncio.Task] = None
+        self._leader_fd: Optional[int] = None
+
+    # ============ 작업 등록 ============
+
+    def submit(self, cert_id: str, tx_hash: Optional[str] = None):
+        """PENDING 인증서의 온체인 기록 시작 (즉시 반환, 이미 처리 중이면 무시)"""
+        if cert_id in self._active:
+            return
+        self._active.add(cert_id)
+        self._spawn(self._confirm(cert_id, tx_hash))
+
+    def _spawn(self, coro):
+        self._ensure_polling()
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _ensure_polling(self):
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.get_running_loop().create_task(self._poll_loop())
+
+    async def _confirm(self, cert_id: str, tx_hash: Optional[str] = None):
+        # 발급 요청의 RPC 호출 / 쿼리 수에 포함하지 않음
+        detach_request_budget()
+        db.detach_request_queries()
+        try:
+            await self._record(cert_id, tx_hash)
+        finally:
+            self._active.discard(cert_id)
+
+    async def _record(self, cert_id: str, tx_hash: Optional[str]):
+        cert_id_bytes = from_hex(cert_id)
+        try:
+            if self.blockchain.anchor_batcher is not None:
+                result = await self.blockchain.anchor_batcher.submit(cert_id_bytes)
+                fields = {
+                    "tx_hash": result["tx_hash"],
+                    "block_number": result["block_number"],
+                    "merkle_root": result["merkle_root"],
+                    "merkle_proof": result["merkle_proof"],
+                }
+            else:
+                if tx_hash is None:
+                    pending = await self.blockchain.broadcast(
+                        self.blockchain.contract.functions.issue(cert_id_bytes), gas=100000
+                    )
+                    # 재시작 시 이어서 확인할 수 있도록 전송한 해시를 먼저 기록
+                    await self._update(cert_id, {"tx_hash": pending.tx_hashes[0].hex()})
+                    receipt = await self._track(cert_id, pending)
+                else:
+                    # 재처리: 이미 전송된 트랜잭션 (교체 전송 불가, 확인만)
+                    receipt = await self._track_existing(cert_id, tx_hash)
+                if receipt["status"] != 1:
+                    raise RuntimeError("Transaction failed")
+                fields = {
+                    "tx_hash": receipt["transactionHash"].hex(),
+                    "block_number": receipt["blockNumber"],
+                }
+            print(f"[Confirmer] 온체인 기록 완료: {cert_id[:18]}... (블록 {fields['block_number']})")
+        except Exception as e:
+            print(f"[Confirmer] 온체인 기록 실패, 오프체인으로 전환: {cert_id[:18]}... ({e})")
+            fields = {"tx_hash": "offchain", "block_number": 0}
+
+        fields["status"] = CertificateStatus.ACTIVE.value
+        await self._update(cert_id, fields)
+
+    async def _update(self, cert_id: str, fields: dict):
+        """PENDING 상태인 행만 갱신 (대기 중에 취소된 인증서는 덮어쓰지 않음)"""
+        if not self.supabase:
+            return
+        try:
+            await db.execute(
+                self.supabase.table("certificates").update(fields)
+                .eq("cert_id", cert_id)
+                .eq("status", CertificateStatus.PENDING.value)
+            )
+        except Exception as e:
+            print(f"[Confirmer] DB 갱신 실패 {cert_id[:18]}...: {e}")
+
+    # ============ 영수증 폴링 ============
+
+    async def _track(self, cert_id: str, pending: "PendingTransaction") -> dict:
+        future = asyncio.get_running_loop().create_future()
+        self._tracked[cert_id] = _Tracked(pending=pending, future=future)
+        self._ensure_polling()
+        return await future
+
+    async def _track_existing(self, cert_id: str, tx_hash: str) -> dict:
+        # web3 는 무거우므로 실제 사용 시점에 import (app.main import 시간 예산)
+        from .blockchain import PendingTransaction
+
+        pending = PendingTransaction(
+            contract_call=None, nonce=-1, gas=0, gas_price=0, chain_id=0,
+            tx_hashes=[from_hex(tx_hash)], sent_at=time.monotonic(),
+            bumps=self.blockchain.max_gas_bumps,
+        )
+        return await self._track(cert_id, pending)
+
+    async def _poll_loop(self):
+        detach_request_budget()
+        db.detach_request_queries()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._tracked:
+                continue
+            await self._poll_once()
+
+    async def _poll_once(self):
+        tracked = list(self._tracked.items())
+        hashes = [h for _, t in tracked for h in t.pending.tx_hashes]
+        try:
+            # 모든 대기 트랜잭션 영수증을 배치 요청 한 번으로 조회
+            receipts = await self.blockchain.get_receipts(hashes)
+        except Exception as e:
+            print(f"[Confirmer] 영수증 조회 실패 (다음 주기에 재시도): {e}")
+            return
+
+        now = time.monotonic()
+        for cert_id, t in tracked:
+            receipt = next((receipts.get(h) for h in t.pending.tx_hashes if receipts.get(h)), None)
+            if receipt is not None:
+                self._finish(cert_id, t, result=receipt)
+            elif now - t.pending.sent_at >= self.blockchain.stuck_timeout:
+                if t.pending.bumps >= self.blockchain.max_gas_bumps:
+                    self._finish(cert_id, t, error=TimeoutError(
+                        f"{len(t.pending.tx_hashes)}회 전송 후에도 채굴되지 않음"
+                    ))
+                    continue
+                try:
+                    await self.blockchain.bump_gas(t.pending)
+                except Exception as e:
+                    self._finish(cert_id, t, error=e)
+
+    def _finish(self, cert_id: str, tracked: _Tracked, result=None, error=None):
+        self._tracked.pop(cert_id, None)
+        if tracked.future.done():
+            return
+        if error is not None:
+            tracked.future.set_exception(error)
+        else:
+            tracked.future.set_result(result)
+
+    # ============ 시작 / 재처리 / 종료 ============
+
+    def _acquire_leader(self) -> bool:
+        """재처리는 한 워커만 (프로세스가 살아있는 동안 파일 락 유지)"""
+        if fcntl is None:
+            return False
+        if self._leader_fd is not None:
+            return True
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        fd = os.open(os.path.join(base, "oceanseal-confirmer.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._leader_fd = fd
+        return True
+
+    async def recover_pending(self):
+        """처리되지 못한 PENDING 인증서 주기적 재처리 시작 (lifespan warm-up 후)
+
+        모든 워커가 recover_interval 마다 리더 락을 시도하고, 리더만 재처리 대상을 조회합니다.
+        """
+        if not self.supabase or not self.blockchain.is_configured() or fcntl is None:
+            return
+        if self._recover_task is None or self._recover_task.done():
+            self._recover_task = asyncio.get_running_loop().create_task(self._recover_loop())
+
+    async def _recover_loop(self):
+        detach_request_budget()
+        db.detach_request_queries()
+        while True:
+            if self._acquire_leader():
+                await self._recover_once()
+            await asyncio.sleep(self.recover_interval)
+
+    async def _recover_once(self):
+        """recover_after 보다 오래된 PENDING 인증서를 찾아 처리 시작 (이 워커에서 처리 중인 것 제외)"""
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=self.recover_after)).isoformat()
+        try:
+            result = await db.execute(
+                self.supabase.table("certificates").select("cert_id, tx_hash")
+                .eq("status", CertificateStatus.PENDING.value)
+                .lt("created_at", cutoff)
+                .limit(500)
+            )
+        except Exception as e:
+            print(f"[Confirmer] PENDING 인증서 조회 실패: {e}")
+            return
+        rows = [row for row in result.data or [] if row["cert_id"] not in self._active]
+        if rows:
+            print(f"[Confirmer] 처리되지 않은 PENDING 인증서 {len(rows)}건 재처리")
+        for row in rows:
+            tx_hash = row.get("tx_hash")
+            already_sent = bool(tx_hash) and tx_hash.startswith("0x") and self.blockchain.anchor_batcher is None
+            self.submit(row["cert_id"], tx_hash if already_sent else None)
+
+    async def close(self, drain_timeout: float = 5.0):
+        """진행 중인 확인 작업 정리 (종료 시)
+
+        모으던 Merkle 배치는 바로 앵커링하고 drain_timeout 동안 결과 기록을 기다립니다.
+        끝나지 않은 인증서는 PENDING 으로 남아 리더 워커가 재처리합니다.
+        """
+        if self._recover_task is not None and not self._recover_task.done():
+            self._recover_task.cancel()
+        if self.blockchain.anchor_batcher is not None:
+            await self.blockchain.anchor_batcher.close()
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=drain_timeout)
+        if self._poll_task is not None and not self._poll_task.done():
+            self._poll_task.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._leader_fd is not None:
+            os.close(self._leader_fd)
+            self._leader_fd = None
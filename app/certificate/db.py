@@ -0,0 +1,91 @@
+"""
+Supabase 비동기 클라이언트
+
+인증서 데이터 계층은 supabase AsyncClient 를 사용하므로 DB 요청이 이벤트 루프를 막지 않습니다.
+(동기 클라이언트의 .execute() 는 같은 워커의 이미지 요청까지 멈추게 함)
+
+- 워커당 httpx.AsyncClient 하나를 PostgREST 요청에 공유 (keep-alive 커넥션 풀)
+- 풀이 가득 차면 pool 타임아웃까지 기다린 뒤 실패 (동시 DB 요청 수 상한)
+- 쿼리마다 제한 시간 적용 (execute)
+- 쿼리 수 집계: 전체 메트릭과 HTTP 요청별 카운터(contextvar, 응답 헤더 X-DB-Queries)
+
+환경변수:
+    SUPABASE_TIMEOUT: 쿼리 제한 시간 (초, 기본 5)
+    SUPABASE_POOL_SIZE: HTTP 커넥션 풀 크기 (기본 20)
+"""
+import os
+import asyncio
+from contextvars import ContextVar
+from typing import List, Optional, TYPE_CHECKING
+
+from app.metrics import registry
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+_queries = registry.counter("supabase_queries_total", "Supabase(PostgREST) 로 보낸 쿼리 수")
+request_queries = registry.histogram(
+    "supabase_queries_per_request", "인증서 API 요청당 Supabase 쿼리 수", buckets=(0, 1, 2, 3, 5, 10)
+)
+
+# 현재 HTTP 요청의 쿼리 수 ([count], 요청 처리 중 만든 하위 태스크와 공유)
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar("db_request_queries", default=None)
+
+
+def begin_request_queries():
+    """HTTP 요청 시작 시 쿼리 카운터 설정 (미들웨어에서 호출, reset 용 토큰 반환)"""
+    return _request_queries.set([0])
+
+
+def end_request_queries(token) -> int:
+    """HTTP 요청 종료 시 카운터 해제 후 쿼리 수 반환"""
+    counter = _request_queries.get()
+    _request_queries.reset(token)
+    return counter[0] if counter else 0
+
+
+def detach_request_queries():
+    """요청 중에 시작된 백그라운드 태스크에서 호출 (원래 요청의 쿼리 수에서 제외)"""
+    _request_queries.set(None)
+
+
+def query_timeout() -> float:
+    return float(os.getenv("SUPABASE_TIMEOUT", "5"))
+
+
+def create_client(supabase_url: str, supabase_key: str) -> "AsyncClient":
+    """커넥션 풀을 공유하는 AsyncClient 생성 (이벤트 루프 밖에서 호출 가능, 연결은 첫 요청 시)"""
+    import httpx
+    from supabase import AsyncClient, AsyncClientOptions
+
+    timeout = query_timeout()
+    pool_size = int(os.getenv("SUPABASE_POOL_SIZE", "20"))
+    http_client = httpx.AsyncClient(
+        # 제한 시간은 execute 의 wait_for 가 담당 (httpx 타임아웃은 그보다 늦게, 안전장치)
+        timeout=httpx.Timeout(timeout + 1),
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=60,
+        ),
+        follow_redirects=True,
+    )
+    # 서비스 키는 생성 시 헤더에 들어가므로 세션 조회(AsyncClient.create)는 불필요
+    return AsyncClient(supabase_url, supabase_key, AsyncClientOptions(httpx_client=http_client))
+
+
+async def execute(query):
+    """쿼리 실행 (SUPABASE_TIMEOUT 초과 시 asyncio.TimeoutError)"""
+    _queries.inc()
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+    return await asyncio.wait_for(query.execute(), query_timeout())
+
+
+async def close_client(client: "AsyncClient"):
+    """커넥션 풀 정리 (lifespan 종료 시)"""
+    http_client = client.options.httpx_client
+    if http_client is not None:
+        await http_client.aclose()
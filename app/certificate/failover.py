@@ -0,0 +1,243 @@
+"""
+Polygon RPC 다중 엔드포인트 provider
+
+공개 Amoy RPC 는 자주 느려지거나 rate limit 에 걸립니다. 여러 RPC URL 을 받아
+엔드포인트별 지연 시간(EWMA)과 에러를 추적하고 다음과 같이 요청을 보냅니다.
+
+- 조회: 정상 엔드포인트 중 지연 시간이 가장 짧은 곳 (아직 측정 전인 엔드포인트도 한 번씩 시도)
+- 전송 / nonce 조회 (eth_sendRawTransaction, eth_getTransactionCount):
+  한 엔드포인트에 고정 (mempool / pending nonce 를 일관되게 보기 위해), 실패할 때만 교체
+- 장애 조치: 요청 제한 시간 초과 / 연결 에러 / HTTP 에러 / rate limit 에러는 해당 엔드포인트를
+  잠시(지수 백오프) 제외하고 다음 엔드포인트로 재시도
+  revert 등 일반 JSON-RPC 에러 응답은 정상 응답으로 봄
+  eth_getLogs 조회 범위 / 결과 수 제한 에러도 rate limit 과 같은 코드(-32005)를 쓰지만 요청 쪽 문제이므로
+  장애로 보지 않고 그대로 반환 (호출하는 쪽에서 범위를 줄여 재시도, app.certificate.indexer)
+- 지연 시간 / 연속 실패 초기화는 응답을 해석해 장애가 아닌 것을 확인한 뒤에 기록
+
+엔드포인트 라벨(메트릭, 로그)은 호스트만 사용합니다. (URL 경로의 API 키 노출 방지)
+"""
+import math
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Any, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from eth_utils import keccak
+from web3.providers.async_base import AsyncJSONBaseProvider
+
+from app.metrics import registry
+from .rpc import MAX_BATCH_SIZE, RPCError, rpc_batch
+
+# 엔드포인트를 고정해서 보내는 메서드
+STICKY_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction", "eth_getTransactionCount"})
+
+# 엔드포인트 장애로 보는 JSON-RPC 에러 (rate limit)
+_RATE_LIMIT_CODES = frozenset({-32005, -32090, 429})
+_RATE_LIMIT_MESSAGES = ("rate limit", "too many requests", "limit exceeded", "capacity")
+# rate limit 코드 / 메시지와 겹치지만 요청 범위가 원인인 에러 (eth_getLogs 블록 범위, 결과 수, 응답 크기)
+_RANGE_ERROR_MESSAGES = (
+    "query returned more than", "block range", "range is too large", "range too large",
+    "too many results", "response size", "result window",
+)
+
+# 다른 엔드포인트로 재전송했을 때 이미 전파된 트랜잭션
+_ALREADY_KNOWN = ("already known", "known transaction")
+
+_EWMA_ALPHA = 0.3
+
+_latency_gauge = registry.gauge("polygon_rpc_endpoint_latency_seconds", "RPC 엔드포인트별 응답 시간 (EWMA, 초)")
+_error_counter = registry.counter("polygon_rpc_endpoint_errors_total", "RPC 엔드포인트별 장애(타임아웃/연결/rate limit) 횟수")
+_failover_counter = registry.counter("polygon_rpc_failovers_total", "다른 RPC 엔드포인트로 재시도한 횟수")
+
+
+def _describe(error: Exception) -> str:
+    """로그용 에러 요약 (aiohttp 에러 repr 에는 전체 URL 이 포함됨)"""
+    if isinstance(error, EndpointUnavailable):
+        error = error.__cause__ or error.args[0]
+    if isinstance(error, aiohttp.ClientResponseError):
+        return f"HTTP {error.status}"
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(error, aiohttp.ClientConnectorError):
+        return f"connection error ({error.os_error})"
+    return f"{type(error).__name__}: {error}"
+
+
+def _is_rate_limited(error) -> bool:
+    if not isinstance(error, dict):
+        return False
+    message = str(error.get("message", "")).lower()
+    if any(m in message for m in _RANGE_ERROR_MESSAGES):
+        return False
+    return error.get("code") in _RATE_LIMIT_CODES or any(m in message for m in _RATE_LIMIT_MESSAGES)
+
+
+@dataclass
+class Endpoint:
+    """RPC 엔드포인트 상태"""
+    url: str
+    label: str
+    latency: Optional[float] = None   # 성공 응답 시간 EWMA (초)
+    failures: int = 0                 # 연속 실패 횟수
+    cooldown_until: float = 0.0       # 이 시각까지 제외 (monotonic)
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    def record_success(self, elapsed: float):
+        self.latency = elapsed if self.latency is None else (
+            _EWMA_ALPHA * elapsed + (1 - _EWMA_ALPHA) * self.latency
+        )
+        self.failures = 0
+        self.cooldown_until = 0.0
+        _latency_gauge.set(round(self.latency, 4), endpoint=self.label)
+
+    def record_failure(self, cooldown: float, max_cooldown: float):
+        self.failures += 1
+        self.cooldown_until = time.monotonic() + min(cooldown * 2 ** (self.failures - 1), max_cooldown)
+        _error_counter.inc(endpoint=self.label)
+
+
+class EndpointUnavailable(Exception):
+    """엔드포인트 장애 (다음 엔드포인트로 재시도)"""
+
+
+class FailoverHTTPProvider(AsyncJSONBaseProvider):
+    """여러 RPC URL 중 빠르고 정상인 엔드포인트로 보내는 AsyncWeb3 provider"""
+
+    def __init__(
+        self,
+        endpoint_uris: List[str],
+        request_timeout: float = 10.0,
+        cooldown: float = 5.0,
+        max_cooldown: float = 60.0,
+    ):
+        if not endpoint_uris:
+            raise ValueError("RPC URL 이 하나 이상 필요합니다.")
+        super().__init__()
+        self.endpoints = [Endpoint(url=url, label=urlparse(url).netloc or url) for url in endpoint_uris]
+        self.request_timeout = request_timeout
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sticky: Endpoint = self.endpoints[0]
+
+    @property
+    def endpoint_uri(self) -> str:
+        """현재 전송용 엔드포인트 (로그 / 호환용)"""
+        return self._sticky.url
+
+    def __str__(self) -> str:
+        return f"RPC failover connection {[e.label for e in self.endpoints]}"
+
+    async def cache_async_session(self, session: aiohttp.ClientSession) -> aiohttp.ClientSession:
+        """BlockchainService 의 커넥션 풀 세션 사용"""
+        self._session = session
+        return session
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    # ============ 엔드포인트 선택 ============
+
+    def candidates(self, sticky: bool = False) -> List[Endpoint]:
+        """시도 순서: 정상 엔드포인트 (고정 엔드포인트 또는 빠른 순), 그 다음 제외 중인 엔드포인트"""
+        healthy = [e for e in self.endpoints if e.healthy]
+        # 측정 전 엔드포인트는 0 으로 보고 먼저 시도 (한 번 측정되면 실제 값으로 경쟁)
+        healthy.sort(key=lambda e: e.latency or 0.0)
+        if sticky and self._sticky in healthy:
+            healthy.remove(self._sticky)
+            healthy.insert(0, self._sticky)
+        cooling = sorted((e for e in self.endpoints if not e.healthy), key=lambda e: e.cooldown_until)
+        return healthy + cooling
+
+    def _mark_failed(self, endpoint: Endpoint, error: Exception):
+        endpoint.record_failure(self.cooldown, self.max_cooldown)
+        print(f"[RPC] {endpoint.label} 장애 (연속 {endpoint.failures}회), 다른 엔드포인트로 재시도: {_describe(error)}")
+
+    # ============ 요청 ============
+
+    async def _post(self, endpoint: Endpoint, data: bytes) -> bytes:
+        try:
+            async with self._get_session().post(
+                endpoint.url,
+                data=data,
+                headers={"Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            ) as response:
+                response.raise_for_status()
+                raw = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            raise EndpointUnavailable(e) from e
+        return raw
+
+    async def make_request(self, method, params: Any):
+        sticky = method in STICKY_METHODS
+        request_data = self.encode_rpc_request(method, params)
+        last_error: Optional[Exception] = None
+
+        for attempt, endpoint in enumerate(self.candidates(sticky)):
+            if attempt:
+                _failover_counter.inc()
+            start = time.monotonic()
+            try:
+                response = self.decode_rpc_response(await self._post(endpoint, request_data))
+                error = response.get("error")
+                if _is_rate_limited(error):
+                    raise EndpointUnavailable(RPCError(error))
+            except EndpointUnavailable as e:
+                self._mark_failed(endpoint, e)
+                last_error = e.__cause__ or e.args[0]
+                continue
+            endpoint.record_success(time.monotonic() - start)
+
+            if sticky and endpoint is not self._sticky:
+                print(f"[RPC] 전송 엔드포인트 변경: {self._sticky.label} -> {endpoint.label}")
+                self._sticky = endpoint
+            if (
+                attempt and method == "eth_sendRawTransaction" and error
+                and any(m in str(error.get("message", "")).lower() for m in _ALREADY_KNOWN)
+            ):
+                # 이전 엔드포인트가 타임아웃 전에 전파한 트랜잭션: 같은 트랜잭션이므로 성공으로 처리
+                raw_tx = bytes.fromhex(params[0][2:] if params[0].startswith("0x") else params[0])
+                return {"jsonrpc": "2.0", "id": response.get("id"), "result": "0x" + keccak(raw_tx).hex()}
+            return response
+
+        raise last_error
+
+    async def make_batch_request(self, calls: List[tuple]) -> List[Any]:
+        """JSON-RPC 배치 호출 (조회 전용, 가장 빠른 엔드포인트부터)"""
+        last_error: Optional[Exception] = None
+        # 배치 크기 제한으로 나뉘는 HTTP 요청 수만큼 제한 시간 부여
+        timeout = self.request_timeout * max(math.ceil(len(calls) / MAX_BATCH_SIZE), 1)
+        for attempt, endpoint in enumerate(self.candidates()):
+            if attempt:
+                _failover_counter.inc()
+            start = time.monotonic()
+            try:
+                results = await asyncio.wait_for(
+                    rpc_batch(self._get_session(), endpoint.url, calls), timeout
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError, RPCError) as e:
+                # RPCError: 배치를 지원하지 않거나 rate limit 으로 단일 에러 응답
+                self._mark_failed(endpoint, e)
+                last_error = e
+                continue
+            if any(isinstance(r, RPCError) and _is_rate_limited(r.error) for r in results):
+                error = RPCError("rate limited")
+                self._mark_failed(endpoint, error)
+                last_error = error
+                continue
+            endpoint.record_success(time.monotonic() - start)
+            return results
+        raise last_error
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
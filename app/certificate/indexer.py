@@ -0,0 +1,394 @@
+"""
+Issued / Revoked 이벤트 인덱서
+
+컨트랙트의 Issued(bytes32 indexed certId, uint256 timestamp) 로그를 로컬 SQLite 인덱스에 모아
+verify_certificate 가 RPC 호출 없이 답할 수 있게 합니다. (인덱스에 없으면 RPC 로 확인)
+OceanSealCertV2 의 Revoked 로그도 같은 방식으로 모읍니다. 취소는 드문 일이므로
+인덱스가 체인 헤드를 따라잡은 상태라면 인덱스에 없는 인증서는 취소되지 않은 것으로 봅니다.
+
+- 백필: 배포 블록부터 get_logs 를 청크 단위로 조회 (노드가 범위 제한 에러를 내면 청크를 절반으로)
+- 추적: poll_interval 마다 새 블록의 로그를 조회
+- reorg: 마지막으로 인덱싱한 블록의 해시가 바뀌었으면 reorg_depth 만큼 되돌린 뒤 다시 인덱싱
+- 워커 간: 파일 락을 잡은 한 워커만 인덱싱하고, 나머지 워커는 같은 SQLite 파일(WAL)을 읽기만 함
+  (인덱싱하던 워커가 종료되거나 연속으로 동기화에 실패하면 락을 놓고 다른 워커가 이어받음)
+- 동기화할 때마다 시각(synced_at)을 meta 에 기록하고, poll_interval 의 몇 배가 지나도록 갱신되지 않으면
+  인덱스가 멈춘 것으로 보고 취소 여부를 RPC 로 확인
+- 체인 헤드 대비 지연 블록 수는 certificate_index_lag_blocks 메트릭과 검증 결과(index_lag_blocks)로 노출
+  (마지막 동기화 때의 지연 + 그 뒤 지난 시간 동안 생겼을 블록 수, 인덱싱이 멈추면 계속 늘어남)
+
+환경변수:
+    CERTIFICATE_INDEXER: 인덱서 사용 여부 (기본 true)
+    CERTIFICATE_DEPLOY_BLOCK: 컨트랙트 배포 블록 (없으면 eth_getCode 이진 탐색으로 찾음)
+    INDEXER_PATH: SQLite 파일 경로 (기본 <임시 디렉터리>/oceanseal-index-<컨트랙트>.sqlite3)
+    INDEXER_POLL_INTERVAL: 새 블록 확인 주기 (초, 기본 5)
+    INDEXER_CHUNK_SIZE: get_logs 한 번에 조회할 최대 블록 수 (기본 2000)
+    INDEXER_REORG_DEPTH: reorg 감지 시 되돌릴 블록 수 (기본 64)
+"""
+import os
+import time
+import asyncio
+import sqlite3
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: 인덱서 비활성화
+    fcntl = None
+
+from web3 import AsyncWeb3
+
+from app.metrics import registry
+from .rpc import detach_request_budget
+
+ISSUED_TOPIC = AsyncWeb3.to_hex(AsyncWeb3.keccak(text="Issued(bytes32,uint256)"))
+REVOKED_TOPIC = AsyncWeb3.to_hex(AsyncWeb3.keccak(text="Revoked(bytes32,uint256)"))
+
+# 이 블록 수 이내로 따라잡았으면 인덱스에 없는 인증서를 '취소 안 됨'으로 답함 (Polygon 약 20초)
+REVOCATION_MAX_LAG = 10
+# 동기화 이후 지난 시간을 블록 수로 환산할 때 쓰는 블록 간격 (초)
+_BLOCK_TIME = 2.0
+# 마지막 동기화 후 poll_interval 의 이 배수가 지나면 인덱스가 멈춘 것으로 봄
+_STALE_POLLS = 3
+# 인덱싱 워커가 연속 이 횟수만큼 동기화에 실패하면 락을 놓음 (같은 시간 동안 다시 잡지 않음)
+_MAX_SYNC_FAILURES = 3
+
+_lag_blocks = registry.gauge("certificate_index_lag_blocks", "Issued 이벤트 인덱스가 체인 헤드보다 뒤처진 블록 수")
+_indexed_events = registry.counter("certificate_index_events_total", "인덱싱한 Issued / Revoked 이벤트 수")
+
+
+def _default_path(contract_address: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"oceanseal-index-{contract_address.lower()}.sqlite3")
+
+
+class IssuedEventIndexer:
+    """Issued / Revoked 이벤트 로컬 인덱스 (워커 프로세스별 인스턴스, 인덱스 파일은 공유)"""
+
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        contract_address: str,
+        path: Optional[str] = None,
+        deploy_block: Optional[int] = None,
+        poll_interval: float = 5.0,
+        chunk_size: int = 2000,
+        reorg_depth: int = 64,
+    ):
+        self.w3 = w3
+        self.contract_address = contract_address
+        self.path = path or _default_path(contract_address)
+        self.deploy_block = deploy_block
+        self.poll_interval = poll_interval
+        self.chunk_size = chunk_size
+        self.reorg_depth = reorg_depth
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._leader_fd: Optional[int] = None
+        self._leader_retry_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        # 마지막으로 확인한 인덱스 상태 (SQLite meta 에서 읽음)
+        self.indexed_block: Optional[int] = None
+        self.head_block: Optional[int] = None
+        self.synced_at: Optional[float] = None
+
+    @classmethod
+    def from_env(cls, w3: AsyncWeb3, contract_address: str) -> Optional["IssuedEventIndexer"]:
+        if os.getenv("CERTIFICATE_INDEXER", "true").lower() != "true" or fcntl is None:
+            return None
+        deploy_block = os.getenv("CERTIFICATE_DEPLOY_BLOCK")
+        return cls(
+            w3,
+            contract_address,
+            path=os.getenv("INDEXER_PATH"),
+            deploy_block=int(deploy_block) if deploy_block else None,
+            poll_interval=float(os.getenv("INDEXER_POLL_INTERVAL", "5")),
+            chunk_size=int(os.getenv("INDEXER_CHUNK_SIZE", "2000")),
+            reorg_depth=int(os.getenv("INDEXER_REORG_DEPTH", "64")),
+        )
+
+    @property
+    def lag_blocks(self) -> Optional[int]:
+        """체인 헤드 대비 지연 블록 수 (동기화 때 확인한 지연 + 그 뒤 지난 시간 / 블록 간격)"""
+        if self.indexed_block is None or self.head_block is None:
+            return None
+        lag = max(self.head_block - self.indexed_block, 0)
+        if self.synced_at is not None:
+            lag += int(max(time.time() - self.synced_at, 0.0) / _BLOCK_TIME)
+        return lag
+
+    @property
+    def stale(self) -> bool:
+        """인덱싱 워커가 poll_interval 의 몇 배 동안 동기화하지 못했는지 (wall-clock, 워커 간 비교)"""
+        return self.synced_at is None or time.time() - self.synced_at > self.poll_interval * _STALE_POLLS
+
+    # ============ SQLite (스레드에서 실행) ============
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS issued ("
+                "cert_id BLOB PRIMARY KEY, timestamp INTEGER NOT NULL, block_number INTEGER NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_issued_block ON issued(block_number)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS revoked ("
+                "cert_id BLOB PRIMARY KEY, timestamp INTEGER NOT NULL, block_number INTEGER NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_revoked_block ON revoked(block_number)")
+            db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+            self._db = db
+        return self._db
+
+    def _read_meta(self) -> dict:
+        with self._db_lock:
+            rows = self._connect().execute("SELECT key, value FROM meta").fetchall()
+        return dict(rows)
+
+    def _lookup(self, table: str, cert_id: bytes) -> Optional[Tuple[int, int]]:
+        with self._db_lock:
+            return self._connect().execute(
+                f"SELECT timestamp, block_number FROM {table} WHERE cert_id = ?", (cert_id,)
+            ).fetchone()
+
+    def _store(
+        self,
+        issued: List[Tuple[bytes, int, int]],
+        revoked: List[Tuple[bytes, int, int]],
+        indexed_block: int,
+        indexed_hash: bytes,
+        head: int,
+        synced_at: float,
+    ):
+        """청크 결과 저장 + 진행 상태 갱신 (한 트랜잭션)"""
+        with self._db_lock:
+            db = self._connect()
+            with db:
+                db.execute("BEGIN")
+                # 같은 certId 재기록은 컨트랙트와 같이 마지막 값으로 덮어씀 (블록 순서대로 처리)
+                db.executemany(
+                    "INSERT OR REPLACE INTO issued (cert_id, timestamp, block_number) VALUES (?, ?, ?)", issued
+                )
+                # 취소는 처음 한 번만 기록됨 (컨트랙트가 재취소 무시)
+                db.executemany(
+                    "INSERT OR IGNORE INTO revoked (cert_id, timestamp, block_number) VALUES (?, ?, ?)", revoked
+                )
+                db.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [
+                        ("indexed_block", indexed_block), ("indexed_hash", indexed_hash),
+                        ("head_block", head), ("synced_at", synced_at),
+                    ],
+                )
+
+    def _mark_synced(self, head: int, synced_at: float):
+        """체인 헤드까지 따라잡음 (새 블록이 없어도 확인한 헤드와 시각 기록)"""
+        with self._db_lock:
+            self._connect().executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("head_block", head), ("synced_at", synced_at)],
+            )
+
+    def _rewind(self, to_block: int):
+        """to_block 이후 이벤트 삭제 (reorg)"""
+        with self._db_lock:
+            db = self._connect()
+            with db:
+                db.execute("BEGIN")
+                db.execute("DELETE FROM issued WHERE block_number > ?", (to_block,))
+                db.execute("DELETE FROM revoked WHERE block_number > ?", (to_block,))
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('indexed_block', ?)", (to_block,))
+                db.execute("DELETE FROM meta WHERE key = 'indexed_hash'")
+
+    def _close_db(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # ============ 조회 ============
+
+    async def lookup(self, cert_id: bytes) -> Optional[int]:
+        """인덱스에 기록된 발급 타임스탬프 (없으면 None -> RPC 로 확인)"""
+        if self.indexed_block is None:
+            return None
+        try:
+            row = await asyncio.to_thread(self._lookup, "issued", cert_id)
+        except sqlite3.Error as e:
+            print(f"[Indexer] 인덱스 조회 실패: {e}")
+            return None
+        return row[0] if row else None
+
+    async def lookup_revocation(self, cert_id: bytes) -> Optional[int]:
+        """인덱스에 기록된 취소 타임스탬프 (0 = 취소 안 됨, None = 인덱스가 뒤처지거나 멈춤 -> RPC 로 확인)"""
+        if self.lag_blocks is None:
+            return None
+        try:
+            row = await asyncio.to_thread(self._lookup, "revoked", cert_id)
+        except sqlite3.Error as e:
+            print(f"[Indexer] 인덱스 조회 실패: {e}")
+            return None
+        if row:
+            return row[0]
+        return 0 if self.lag_blocks <= REVOCATION_MAX_LAG and not self.stale else None
+
+    async def refresh_status(self):
+        """다른 워커가 갱신한 인덱스 진행 상태 읽기"""
+        meta = await asyncio.to_thread(self._read_meta)
+        self.indexed_block = meta.get("indexed_block")
+        self.head_block = meta.get("head_block")
+        self.synced_at = meta.get("synced_at")
+
+    # ============ 인덱싱 ============
+
+    async def _find_deploy_block(self, head: int) -> int:
+        """컨트랙트 코드가 처음 나타난 블록 (eth_getCode 이진 탐색, 아카이브 노드 필요)"""
+        if self.deploy_block is not None:
+            return self.deploy_block
+        try:
+            low, high = 0, head
+            while low < high:
+                mid = (low + high) // 2
+                if await self.w3.eth.get_code(self.contract_address, mid):
+                    high = mid
+                else:
+                    low = mid + 1
+            self.deploy_block = low
+            print(f"[Indexer] 컨트랙트 배포 블록: {low}")
+        except Exception as e:
+            print(f"[Indexer] 배포 블록 탐색 실패, 0번 블록부터 인덱싱 (CERTIFICATE_DEPLOY_BLOCK 설정 권장): {e}")
+            self.deploy_block = 0
+        return self.deploy_block
+
+    async def _get_logs(self, from_block: int, to_block: int) -> list:
+        return await self.w3.eth.get_logs({
+            "address": self.contract_address,
+            "topics": [[ISSUED_TOPIC, REVOKED_TOPIC]],
+            "fromBlock": from_block,
+            "toBlock": to_block,
+        })
+
+    async def _check_reorg(self, meta: dict) -> Optional[int]:
+        """마지막 인덱싱 블록의 해시가 바뀌었으면 되돌릴 블록 반환"""
+        indexed_block, indexed_hash = meta.get("indexed_block"), meta.get("indexed_hash")
+        if indexed_block is None or indexed_hash is None:
+            return None
+        block = await self.w3.eth.get_block(indexed_block)
+        if bytes(block["hash"]) == bytes(indexed_hash):
+            return None
+        return max(indexed_block - self.reorg_depth, (self.deploy_block or 0) - 1)
+
+    async def sync_once(self):
+        """체인 헤드까지 인덱싱 (리더 워커에서만 호출)"""
+        meta = await asyncio.to_thread(self._read_meta)
+        head = await self.w3.eth.block_number
+
+        rewind_to = await self._check_reorg(meta)
+        if rewind_to is not None:
+            print(f"[Indexer] reorg 감지 (블록 {meta['indexed_block']}), 블록 {rewind_to} 까지 되돌림")
+            await asyncio.to_thread(self._rewind, rewind_to)
+            meta["indexed_block"] = rewind_to
+
+        indexed = meta.get("indexed_block")
+        if indexed is None:
+            indexed = await self._find_deploy_block(head) - 1
+
+        chunk = self.chunk_size
+        while indexed < head:
+            to_block = min(indexed + chunk, head)
+            try:
+                logs = await self._get_logs(indexed + 1, to_block)
+                block = await self.w3.eth.get_block(to_block)
+            except Exception as e:
+                if chunk == 1:
+                    raise
+                # 노드의 조회 범위 / 결과 수 제한: 청크 축소 후 재시도
+                chunk = max(chunk // 2, 1)
+                print(f"[Indexer] get_logs 실패, 청크 {chunk} 블록으로 재시도: {e}")
+                continue
+
+            issued, revoked = [], []
+            for log in logs:
+                if log.get("removed"):
+                    continue
+                event = (bytes(log["topics"][1]), int.from_bytes(bytes(log["data"])[:32], "big"), log["blockNumber"])
+                if AsyncWeb3.to_hex(log["topics"][0]) == REVOKED_TOPIC:
+                    revoked.append(event)
+                else:
+                    issued.append(event)
+            synced_at = time.time()
+            await asyncio.to_thread(
+                self._store, issued, revoked, to_block, bytes(block["hash"]), head, synced_at
+            )
+            _indexed_events.inc(len(issued) + len(revoked))
+            indexed = to_block
+            self.indexed_block, self.head_block, self.synced_at = indexed, head, synced_at
+            _lag_blocks.set(self.lag_blocks)
+
+        synced_at = time.time()
+        await asyncio.to_thread(self._mark_synced, head, synced_at)
+        self.indexed_block, self.head_block, self.synced_at = indexed, head, synced_at
+        _lag_blocks.set(self.lag_blocks)
+
+    def _acquire_leader(self) -> bool:
+        if self._leader_fd is not None:
+            return True
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._leader_fd = fd
+        print(f"[Indexer] 인덱싱 워커로 선출 (pid {os.getpid()})")
+        return True
+
+    def _release_leader(self):
+        """락을 놓고 잠시 다시 잡지 않음 (다른 워커가 이어받도록)"""
+        if self._leader_fd is None:
+            return
+        os.close(self._leader_fd)
+        self._leader_fd = None
+        self._leader_retry_at = time.monotonic() + self.poll_interval * _MAX_SYNC_FAILURES
+
+    async def _run(self):
+        detach_request_budget()
+        failures = 0
+        while True:
+            try:
+                if time.monotonic() >= self._leader_retry_at and self._acquire_leader():
+                    await self.sync_once()
+                    failures = 0
+                else:
+                    await self.refresh_status()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[Indexer] 인덱싱 실패 (다음 주기에 재시도): {e}")
+                if self._leader_fd is not None:
+                    failures += 1
+                    if failures >= _MAX_SYNC_FAILURES:
+                        print(f"[Indexer] 연속 {failures}회 실패, 다른 워커가 이어받도록 인덱싱 락 반환")
+                        self._release_leader()
+                        failures = 0
+            # 동기화에 실패해도 마지막 동기화 이후 지난 시간만큼 지연이 늘어난 것으로 보고
+            if self.lag_blocks is not None:
+                _lag_blocks.set(self.lag_blocks)
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        """백그라운드 인덱싱 시작 (lifespan warm-up 후)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._release_leader()
+        self._close_db()
@@ -0,0 +1,139 @@
+"""
+인증서 조회 캐시 (read-through)
+
+인증서 행은 발급 후 거의 바뀌지 않으므로(취소, 온체인 취소 기록 정도) QR 스캔 / 검증마다
+Supabase 를 조회하지 않도록 CertificateService.get_certificate 앞에 워커별 메모리 캐시를 둡니다.
+
+- 메모리 LRU (최대 항목 수) + TTL, 키는 조회 값 (전체 ID 또는 짧은 ID)
+- PENDING 인증서는 곧 온체인 기록 결과로 바뀌므로 캐시하지 않음
+- 무효화: 행을 바꾸는 쪽(취소, 온체인 취소 기록)이 invalidate 호출
+- 워커 간 전파: 공유 메모리 파일(mmap)의 버전 스탬프 테이블 (app.rate_limit 과 같은 방식)
+  cert_id 앞 8자리로 정한 슬롯마다 uint64 버전이 있고, 무효화는 슬롯 버전을 올립니다.
+  캐시 항목은 DB 조회 직전의 버전을 함께 저장하며, 조회할 때 버전이 다르면 버립니다. (8바이트 읽기)
+  짧은 ID 도 cert_id 의 접두사이므로 DB 조회 없이 같은 슬롯을 찾고,
+  조회 도중 무효화되면 저장되는 항목이 처음부터 오래된 버전이라 바로 버려집니다.
+- 단일 호스트 기준입니다. 여러 호스트에서 실행하면 다른 호스트의 취소는 최대 TTL 동안 반영되지 않습니다.
+
+환경변수:
+    CERTIFICATE_CACHE_SIZE: 최대 항목 수 (기본 10000)
+    CERTIFICATE_CACHE_TTL: 항목 유지 시간 (초, 기본 300, 0 이면 비활성화)
+    CERTIFICATE_CACHE_VERSION_PATH: 버전 스탬프 파일 (기본 /dev/shm/oceanseal-certificate-versions)
+"""
+import os
+import mmap
+import time
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: 워커 간 전파 없이 프로세스 내부에서만 동작
+    fcntl = None
+
+from app.metrics import registry
+from .models import CertificateStatus
+
+_cache_results = registry.counter("certificate_lookup_cache_total", "인증서 조회 캐시 결과 (hit/miss/stale)")
+
+# 버전 슬롯 수 (슬롯당 uint64, 32KB)
+_SLOTS = 4096
+_STAMP = struct.Struct("<Q")
+
+
+def _default_path() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "oceanseal-certificate-versions")
+
+
+class CertificateLookupCache:
+    """조회 값(cert_id 또는 short_id) -> 인증서 행 캐시 (메모리는 이벤트 루프에서만 접근)"""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0, path: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path or _default_path()
+        # 조회 값 -> (행, 만료 시각, 슬롯, 저장 시 버전)
+        self._entries: "OrderedDict[str, Tuple[dict, float, int, int]]" = OrderedDict()
+        self._thread_lock = threading.Lock()
+
+        size = _SLOTS * _STAMP.size
+        if fcntl is None:
+            self._fd = None
+            self._mm = mmap.mmap(-1, size)
+            return
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._mm = mmap.mmap(self._fd, size)
+
+    @classmethod
+    def from_env(cls) -> "CertificateLookupCache":
+        return cls(
+            max_size=int(os.getenv("CERTIFICATE_CACHE_SIZE", "10000")),
+            ttl=float(os.getenv("CERTIFICATE_CACHE_TTL", "300")),
+            path=os.getenv("CERTIFICATE_CACHE_VERSION_PATH"),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    # ============ 버전 스탬프 ============
+
+    @staticmethod
+    def _slot(value: str) -> int:
+        """cert_id / short_id -> 슬롯 (0x 뒤 앞 8자리, 같은 인증서면 같은 슬롯)"""
+        hex_id = value[2:] if value.startswith("0x") else value
+        return int(hex_id[:8] or "0", 16) % _SLOTS
+
+    def version(self, value: str) -> int:
+        """현재 버전 (DB 조회 직전에 읽어 put 에 전달)"""
+        return _STAMP.unpack_from(self._mm, self._slot(value) * _STAMP.size)[0]
+
+    def invalidate(self, cert_ids: Iterable[str]):
+        """인증서 행이 바뀜 -> 모든 워커의 캐시 항목 무효화"""
+        slots = {self._slot(cert_id) for cert_id in cert_ids}
+        if not slots:
+            return
+        with self._thread_lock:
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                for slot in slots:
+                    offset = slot * _STAMP.size
+                    _STAMP.pack_into(self._mm, offset, _STAMP.unpack_from(self._mm, offset)[0] + 1)
+            finally:
+                if self._fd is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    # ============ 조회 / 저장 ============
+
+    def get(self, value: str) -> Optional[dict]:
+        entry = self._entries.get(value)
+        if entry is None:
+            _cache_results.inc(result="miss")
+            return None
+        row, expires_at, slot, version = entry
+        if expires_at <= time.monotonic() or _STAMP.unpack_from(self._mm, slot * _STAMP.size)[0] != version:
+            del self._entries[value]
+            _cache_results.inc(result="stale")
+            return None
+        self._entries.move_to_end(value)
+        _cache_results.inc(result="hit")
+        return row
+
+    def put(self, value: str, row: dict, version: int):
+        """DB 에서 조회한 행 저장 (version 은 조회 직전에 읽은 값)"""
+        if not self.enabled or row.get("status") == CertificateStatus.PENDING.value:
+            return
+        self._entries[value] = (row, time.monotonic() + self.ttl, self._slot(value), version)
+        self._entries.move_to_end(value)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -0,0 +1,79 @@
+"""
+인증서 Merkle 트리
+
+여러 인증서 ID 를 하나의 Merkle 루트로 묶어 온체인에는 루트만 기록합니다.
+각 인증서는 루트까지의 포함 증명(proof)을 DB 에 저장하고, 검증 시 증명으로 루트를 재계산한 뒤
+그 루트가 컨트랙트에 기록되어 있는지 확인합니다.
+
+- 해시: SHA-256 (이미지 해시 / certId 와 동일)
+- 리프: sha256(0x00 || certId), 내부 노드: sha256(0x01 || min(a, b) || max(a, b))
+  도메인 분리로 내부 노드를 리프로 위조할 수 없고, 정렬된 쌍이라 증명에 좌/우 정보가 필요 없음
+- 홀수 개 레벨의 마지막 노드는 해시 없이 위 레벨로 올림
+"""
+import hashlib
+from typing import List
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(cert_id: bytes) -> bytes:
+    """인증서 ID (bytes32) -> 리프 해시"""
+    return hashlib.sha256(_LEAF_PREFIX + cert_id).digest()
+
+
+def _node_hash(a: bytes, b: bytes) -> bytes:
+    if b < a:
+        a, b = b, a
+    return hashlib.sha256(_NODE_PREFIX + a + b).digest()
+
+
+class MerkleTree:
+    """인증서 ID 목록으로 만든 Merkle 트리"""
+
+    def __init__(self, cert_ids: List[bytes]):
+        if not cert_ids:
+            raise ValueError("빈 목록으로 Merkle 트리를 만들 수 없습니다.")
+        level = [leaf_hash(cert_id) for cert_id in cert_ids]
+        self.levels: List[List[bytes]] = [level]
+        while len(level) > 1:
+            level = [
+                _node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                for i in range(0, len(level), 2)
+            ]
+            self.levels.append(level)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def proof(self, index: int) -> List[bytes]:
+        """index 번째 인증서의 포함 증명 (리프에서 루트 방향 형제 노드 목록)"""
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append(level[sibling])
+            index //= 2
+        return proof
+
+
+def compute_root(cert_id: bytes, proof: List[bytes]) -> bytes:
+    """증명으로 루트 재계산"""
+    node = leaf_hash(cert_id)
+    for sibling in proof:
+        node = _node_hash(node, sibling)
+    return node
+
+
+def verify_proof(cert_id: bytes, proof: List[bytes], root: bytes) -> bool:
+    """인증서 ID 가 root 트리에 포함되어 있는지 확인"""
+    return compute_root(cert_id, proof) == root
+
+
+def to_hex(value: bytes) -> str:
+    return "0x" + value.hex()
+
+
+def from_hex(value: str) -> bytes:
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
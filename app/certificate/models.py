@@ -36,6 +36,11 @@ class VerifyImageRequest(BaseModel):
     image_base64: str = Field(..., description="Base64 인코딩된 이미지")
 
 
+class BulkVerifyRequest(BaseModel):
+    """인증서 일괄 검증 요청"""
+    cert_ids: List[str] = Field(..., min_length=1, max_length=100, description="인증서 ID 목록 (전체 또는 앞 8자리, 최대 100개)")
+
+
 # ============ 응답 모델 ============
 
 class CertificateResponse(BaseModel):
@@ -50,6 +55,9 @@ class CertificateResponse(BaseModel):
     status: CertificateStatus = Field(..., description="인증서 상태")
     created_at: datetime = Field(..., description="발급 일시")
     verify_url: str = Field(..., description="검증 URL")
+    merkle_root: Optional[str] = Field(None, description="배치 Merkle 루트 (배치 발급 시)")
+    merkle_proof: Optional[List[str]] = Field(None, description="Merkle 포함 증명 (배치 발급 시)")
+    revoke_tx_hash: Optional[str] = Field(None, description="온체인 취소 트랜잭션 해시 (온체인 취소 기록 후)")
 
 
 class IssueCertificateResponse(BaseModel):
@@ -67,11 +75,23 @@ class VerifyCertificateResponse(BaseModel):
     message: str = Field(..., description="검증 결과 메시지")
 
 
+class BulkVerifyResult(VerifyCertificateResponse):
+    """일괄 검증의 인증서별 결과"""
+    cert_id: str = Field(..., description="요청한 인증서 ID")
+
+
+class BulkVerifyResponse(BaseModel):
+    """인증서 일괄 검증 응답 (요청 순서대로)"""
+    total_count: int
+    results: List[BulkVerifyResult]
+
+
 class UserCertificatesResponse(BaseModel):
-    """사용자 인증서 목록 응답"""
+    """사용자 인증서 목록 응답 (최신순 한 페이지)"""
     user_id: str
     total_count: int
     certificates: List[CertificateResponse]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
 
 
 # ============ 내부 모델 ============
@@ -80,6 +100,7 @@ class CertificateDB(BaseModel):
     """데이터베이스 인증서 모델"""
     id: Optional[str] = None
     cert_id: str
+    short_id: Optional[str] = None  # 검증 URL 용 짧은 ID (cert_id 앞부분, 유니크)
     user_id: str
     image_url: str
     image_hash: str
@@ -87,6 +108,8 @@ class CertificateDB(BaseModel):
     tx_hash: str
     block_number: int
     status: str = "active"
+    merkle_root: Optional[str] = None
+    merkle_proof: Optional[List[str]] = None
     created_at: Optional[datetime] = None
 
     class Config:
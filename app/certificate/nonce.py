@@ -0,0 +1,168 @@
+"""
+관리자 지갑 nonce 관리
+
+매 발급마다 get_transaction_count 를 읽으면 동시에 발급되는 트랜잭션(같은 워커의 동시 요청,
+다른 uvicorn 워커)이 같은 nonce 를 받아 한쪽이 실패하거나 서로를 교체합니다.
+이 모듈은 nonce 를 로컬에서 원자적으로 할당하여 여러 트랜잭션을 블록 하나에 연달아
+보낼 수 있게 합니다.
+
+- 워커 간 공유: 공유 메모리 파일(JSON) + 파일 락 (app.rate_limit 과 같은 방식)
+- 재동기화: 주기적으로 체인의 pending nonce 와 비교하여 외부 트랜잭션 반영
+- 빈 nonce(gap): 전송 실패로 쓰이지 않은 nonce 는 반납되어 다음 할당에서 먼저 재사용
+  전송 전에 워커가 죽어 생긴 gap 은 체인 nonce 가 gap_timeout 동안 멈춰 있으면 회수
+- 단일 호스트 기준입니다. 여러 컨테이너가 같은 지갑을 쓰면 지갑을 나눠야 합니다.
+
+환경변수:
+    NONCE_STATE_PATH: 공유 상태 파일 경로 (기본 /dev/shm/oceanseal-nonce-<주소>.json)
+"""
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: 워커 간 공유 없이 프로세스 내부에서만 동작
+    fcntl = None
+
+# 전송 시 nonce 충돌로 판단하는 RPC 에러 메시지 (노드 구현별)
+NONCE_CONFLICT_ERRORS = (
+    "nonce too low",
+    "already known",
+    "replacement transaction underpriced",
+    "known transaction",
+)
+
+
+def is_nonce_conflict(error: Exception) -> bool:
+    """이미 사용된 nonce 로 전송했는지 확인"""
+    message = str(error).lower()
+    return any(pattern in message for pattern in NONCE_CONFLICT_ERRORS)
+
+
+def _default_state_path(address: str) -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, f"oceanseal-nonce-{address.lower()}.json")
+
+
+class NonceManager:
+    """워커 간 공유되는 로컬 nonce 할당기
+
+    상태: {"next": 다음 할당 nonce, "gaps": [반납된 nonce], "chain": 마지막으로 본 체인 nonce,
+           "chain_since": chain 값이 처음 관측된 시각, "synced_at": 마지막 재동기화 시각}
+    """
+
+    def __init__(
+        self,
+        w3,
+        address: str,
+        path: Optional[str] = None,
+        resync_interval: float = 30.0,
+        gap_timeout: float = 120.0,
+    ):
+        self.w3 = w3
+        self.address = address
+        self.path = path or os.getenv("NONCE_STATE_PATH") or _default_state_path(address)
+        self.resync_interval = resync_interval
+        self.gap_timeout = gap_timeout
+        self._thread_lock = threading.Lock()
+        self._memory_state: dict = {}
+
+    # ============ 공유 상태 ============
+
+    def _update(self, fn: Callable[[dict], object]):
+        """락을 잡은 상태에서 상태를 읽고 fn 으로 수정한 뒤 저장"""
+        with self._thread_lock:
+            if fcntl is None:
+                return fn(self._memory_state)
+
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = os.read(fd, 65536)
+                try:
+                    state = json.loads(raw) if raw else {}
+                except ValueError:
+                    state = {}
+                if state.get("address") != self.address:
+                    state = {"address": self.address}
+
+                result = fn(state)
+
+                data = json.dumps(state).encode()
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, data)
+                return result
+            finally:
+                os.close(fd)  # 락도 함께 해제
+
+    def _needs_sync(self) -> bool:
+        def read(state):
+            return time.time() - state.get("synced_at", 0) >= self.resync_interval or "next" not in state
+        return self._update(read)
+
+    def _apply_chain_nonce(self, state: dict, chain_nonce: int):
+        """체인 pending nonce 반영 (락 안에서 호출)"""
+        now = time.time()
+        state["synced_at"] = now
+        if state.get("chain") != chain_nonce:
+            state["chain"] = chain_nonce
+            state["chain_since"] = now
+
+        next_nonce = state.get("next", 0)
+        if chain_nonce > next_nonce:
+            # 다른 곳에서 보낸 트랜잭션이 있음
+            print(f"[Nonce] 체인 nonce 가 앞서 있어 재동기화: {next_nonce} -> {chain_nonce}")
+            next_nonce = chain_nonce
+        elif chain_nonce < next_nonce and now - state["chain_since"] >= self.gap_timeout:
+            # 할당만 되고 전송되지 않은 nonce 가 있어 체인이 멈춰 있음 -> 회수
+            lost = [n for n in range(chain_nonce, next_nonce) if n not in state.get("gaps", [])]
+            if lost:
+                print(f"[Nonce] {self.gap_timeout:.0f}초 동안 전송되지 않은 nonce 회수: {lost}")
+            state["gaps"] = state.get("gaps", []) + lost
+            state["chain_since"] = now
+        state["next"] = next_nonce
+        state["gaps"] = sorted(n for n in set(state.get("gaps", [])) if chain_nonce <= n < next_nonce)
+
+    # ============ 할당 / 반납 ============
+
+    async def _chain_nonce(self) -> int:
+        return await self.w3.eth.get_transaction_count(self.address, "pending")
+
+    async def allocate(self) -> int:
+        """다음 nonce 할당 (반납된 nonce 가 있으면 가장 작은 것부터)"""
+        chain_nonce = None
+        if await asyncio.to_thread(self._needs_sync):
+            chain_nonce = await self._chain_nonce()
+
+        def take(state):
+            if chain_nonce is not None:
+                self._apply_chain_nonce(state, chain_nonce)
+            gaps = state.get("gaps", [])
+            if gaps:
+                return gaps.pop(0)
+            nonce = state["next"]
+            state["next"] = nonce + 1
+            return nonce
+
+        return await asyncio.to_thread(self._update, take)
+
+    async def release(self, nonce: int):
+        """전송하지 못한 nonce 반납 (다음 할당에서 재사용)"""
+        def give_back(state):
+            if nonce == state.get("next", 0) - 1:
+                state["next"] = nonce
+            elif nonce < state.get("next", 0) and nonce not in state.setdefault("gaps", []):
+                state["gaps"].append(nonce)
+                state["gaps"].sort()
+
+        await asyncio.to_thread(self._update, give_back)
+
+    async def resync(self):
+        """체인 nonce 로 즉시 재동기화 (nonce 충돌 에러 발생 시)"""
+        chain_nonce = await self._chain_nonce()
+        await asyncio.to_thread(self._update, lambda state: self._apply_chain_nonce(state, chain_nonce))
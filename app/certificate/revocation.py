@@ -0,0 +1,240 @@
+"""
+온체인 취소 배치 큐
+
+CERTIFICATE_REVOCATION_MODE=onchain 일 때 취소 API 는 DB 상태만 바로 바꾸고,
+취소된 인증서 ID 를 모아 일정 시간(또는 일정 개수)마다 revokeMany(bytes32[]) 트랜잭션 하나로 기록합니다.
+(OceanSealCertV2 필요, 취소마다 트랜잭션을 보내지 않음)
+
+- 기록되면 revoke_tx_hash 를 저장
+- 전송 실패 시 큐에 다시 넣고 지수 백오프(최대 REVOCATION_BATCH_MAX_WAIT) 후 재시도
+  인증서당 정해진 횟수를 넘게 실패하면 큐에서 빼고 재처리 조회(revoke_tx_hash 없음)에 맡김
+- 기록되지 못한 취소(revoke_tx_hash 없음: 워커 종료, 종료 시 실패, 재시도 횟수 초과)는
+  한 워커(파일 락)가 주기적으로 찾아 다시 큐에 넣음 (리더 워커가 종료되면 다른 워커가 다음 주기에 이어받음)
+- 오프체인 인증서(tx_hash = "offchain")는 온체인에 기록할 것이 없으므로 제외
+
+환경변수:
+    REVOCATION_BATCH_MAX_SIZE: 배치 최대 인증서 수 (기본 256)
+    REVOCATION_BATCH_MAX_WAIT: 첫 취소 후 배치 전송까지 최대 대기 시간 (초, 기본 60)
+    REVOCATION_RECOVER_AFTER: 취소된 지 이 시간(초)이 지나도 기록되지 않은 인증서를 재처리 (기본 600)
+    REVOCATION_RECOVER_INTERVAL: 재처리 대상 조회 주기 (초, 기본 60)
+"""
+import os
+import time
+import asyncio
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set, TYPE_CHECKING
+
+try:
+    import fcntl
+except ImportError:  # Windows: 재처리 비활성화
+    fcntl = None
+
+from . import db
+from .models import CertificateStatus
+from .merkle import from_hex
+from .rpc import detach_request_budget
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+    from .blockchain import BlockchainService
+
+# 기록 실패 후 재시도 대기 (초, 연속 실패마다 2배, 최대 max_wait)
+_RETRY_BASE_DELAY = 5.0
+# 인증서당 최대 기록 시도 횟수
+_MAX_ATTEMPTS = 5
+
+
+class RevocationQueue:
+    """취소된 인증서 ID 를 모아 온체인에 배치 기록 (워커 프로세스별)"""
+
+    def __init__(
+        self,
+        blockchain: "BlockchainService",
+        supabase: Optional["AsyncClient"],
+        max_size: int = 256,
+        max_wait: float = 60.0,
+        on_written: Optional[Callable[[List[str]], None]] = None,
+        recover_after: float = 600.0,
+        recover_interval: float = 60.0,
+    ):
+        self.blockchain = blockchain
+        self.supabase = supabase
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.recover_after = recover_after
+        self.recover_interval = recover_interval
+        # revoke_tx_hash 저장 후 호출 (인증서 조회 캐시 무효화)
+        self.on_written = on_written
+        # cert_id(hex) -> bytes32, 다음 배치에 기록할 취소
+        self._pending: Dict[str, bytes] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # cert_id -> 실패한 기록 시도 횟수, 연속 실패한 배치 수, 재시도 전까지 배치 크기로 바로 보내지 않음
+        self._attempts: Dict[str, int] = {}
+        self._failures = 0
+        self._retry_at = 0.0
+        self._tasks: Set[asyncio.Task] = set()
+        # 전송 중인 배치의 cert_id (재처리 조회에서 제외)
+        self._in_flight: Set[str] = set()
+        self._recover_task: Optional[asyncio.Task] = None
+        self._leader_fd: Optional[int] = None
+        self._closed = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.blockchain.revocation_mode == "onchain" and self.blockchain.is_configured()
+
+    # ============ 작업 등록 ============
+
+    def submit(self, cert_id: str):
+        """취소된 인증서를 다음 배치에 추가 (즉시 반환)"""
+        if not self.enabled:
+            return
+        self._pending[cert_id] = from_hex(cert_id)
+        if len(self._pending) >= self.max_size and time.monotonic() >= self._retry_at:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._write_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _write_batch(self, batch: Dict[str, bytes]):
+        # 배치를 마감시킨 요청의 RPC 호출 / 쿼리 수에 포함하지 않음
+        detach_request_budget()
+        db.detach_request_queries()
+        self._in_flight.update(batch)
+        try:
+            receipt = await self.blockchain.revoke_many(list(batch.values()))
+        except Exception as e:
+            self._retry_later(batch, e)
+            return
+        finally:
+            self._in_flight.difference_update(batch)
+
+        self._failures = 0
+        for cert_id in batch:
+            self._attempts.pop(cert_id, None)
+        tx_hash = receipt['transactionHash'].hex()
+        print(f"[Revocation] 온체인 취소 기록 완료: {len(batch)}건 (tx {tx_hash[:18]}...)")
+        await self._mark_written(list(batch), tx_hash)
+
+    def _retry_later(self, batch: Dict[str, bytes], error: Exception):
+        """실패한 배치를 큐에 다시 넣고 백오프 후 전송 (submit 을 거치지 않아 배치 크기로 바로 재전송하지 않음)"""
+        self._failures += 1
+        delay = min(_RETRY_BASE_DELAY * 2 ** (self._failures - 1), self.max_wait)
+        retry: Dict[str, bytes] = {}
+        for cert_id, key in batch.items():
+            attempts = self._attempts.get(cert_id, 0) + 1
+            if attempts >= _MAX_ATTEMPTS:
+                # 재처리 조회(revoke_tx_hash 없음)에 맡김
+                self._attempts.pop(cert_id, None)
+            else:
+                self._attempts[cert_id] = attempts
+                retry[cert_id] = key
+        print(
+            f"[Revocation] 온체인 취소 기록 실패 ({len(batch)}건), "
+            f"{len(retry)}건 {delay:.0f}초 후 재시도: {error}"
+        )
+        if self._closed or not retry:
+            return
+        self._pending.update(retry)
+        self._retry_at = time.monotonic() + delay
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._flush)
+
+    async def _mark_written(self, cert_ids: List[str], tx_hash: str):
+        if not self.supabase:
+            return
+        try:
+            await db.execute(
+                self.supabase.table("certificates").update({"revoke_tx_hash": tx_hash})
+                .in_("cert_id", cert_ids)
+            )
+        except Exception as e:
+            print(f"[Revocation] DB 갱신 실패 ({len(cert_ids)}건): {e}")
+            return
+        if self.on_written:
+            self.on_written(cert_ids)
+
+    # ============ 시작 / 재처리 / 종료 ============
+
+    def _acquire_leader(self) -> bool:
+        """재처리는 한 워커만 (프로세스가 살아있는 동안 파일 락 유지)"""
+        if fcntl is None:
+            return False
+        if self._leader_fd is not None:
+            return True
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        fd = os.open(os.path.join(base, "oceanseal-revocation.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._leader_fd = fd
+        return True
+
+    async def recover_pending(self):
+        """온체인에 기록되지 못한 취소의 주기적 재처리 시작 (lifespan warm-up 후)
+
+        모든 워커가 recover_interval 마다 리더 락을 시도하고, 리더만 재처리 대상을 조회합니다.
+        """
+        if not self.supabase or not self.enabled or fcntl is None:
+            return
+        if self._recover_task is None or self._recover_task.done():
+            self._recover_task = asyncio.get_running_loop().create_task(self._recover_loop())
+
+    async def _recover_loop(self):
+        detach_request_budget()
+        db.detach_request_queries()
+        while True:
+            if self._acquire_leader():
+                await self._recover_once()
+            await asyncio.sleep(self.recover_interval)
+
+    async def _recover_once(self):
+        """취소된 지 recover_after 가 지나도 기록되지 않은 인증서를 큐에 추가 (이 워커의 큐 / 전송 중인 것 제외)"""
+        # 취소 시 갱신된 updated_at 기준 (다른 워커의 큐에서 기다리거나 재시도 중인 취소는 아직 제외)
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=self.recover_after)).isoformat()
+        try:
+            result = await db.execute(
+                self.supabase.table("certificates").select("cert_id")
+                .eq("status", CertificateStatus.REVOKED.value)
+                .is_("revoke_tx_hash", "null")
+                .neq("tx_hash", "offchain")
+                .lt("updated_at", cutoff)
+                .limit(1000)
+            )
+        except Exception as e:
+            print(f"[Revocation] 미기록 취소 조회 실패: {e}")
+            return
+        rows = [
+            row for row in result.data or []
+            if row["cert_id"] not in self._pending and row["cert_id"] not in self._in_flight
+        ]
+        if rows:
+            print(f"[Revocation] 온체인에 기록되지 않은 취소 {len(rows)}건 재처리")
+        for row in rows:
+            self.submit(row["cert_id"])
+
+    async def close(self):
+        """모으던 취소를 바로 기록하고 완료까지 대기 (종료 시, 실패분은 리더 워커가 재처리)"""
+        self._closed = True
+        if self._recover_task is not None and not self._recover_task.done():
+            self._recover_task.cancel()
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._leader_fd is not None:
+            os.close(self._leader_fd)
+            self._leader_fd = None
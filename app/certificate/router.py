@@ -3,92 +3,42 @@
 
 디지털 인증서 발급, 조회, 검증 API 엔드포인트
 """
-import os
 from fastapi import APIRouter, HTTPException, Query, Request, Header, Depends
+from fastapi.responses import StreamingResponse
 from typing import Optional
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
-# Firebase Admin SDK
-import firebase_admin
-from firebase_admin import auth, credentials
-
-# Firebase 초기화 (한 번만)
-if not firebase_admin._apps:
-    # 서비스 계정 JSON 경로 (환경변수 또는 기본 경로)
-    service_account_path = os.getenv(
-        "FIREBASE_SERVICE_ACCOUNT_PATH",
-        "/app/ocean-seal-firebase-adminsdk-fbsvc-7e063c46ae.json"
-    )
-    if os.path.exists(service_account_path):
-        cred = credentials.Certificate(service_account_path)
-        firebase_admin.initialize_app(cred)
-    else:
-        # 서비스 계정 파일 없으면 인증 비활성화
-        print("[WARNING] Firebase service account not found. Auth disabled.")
-        firebase_admin.initialize_app()
+
+from app.auth import verify_firebase_token
+from app.rate_limit import limiter
 
 from .models import (
     IssueCertificateRequest,
     VerifyImageRequest,
+    BulkVerifyRequest,
+    BulkVerifyResponse,
     IssueCertificateResponse,
     VerifyCertificateResponse,
     UserCertificatesResponse,
     CertificateResponse
 )
-from .service import certificate_service
+from app.resources import get_certificate_service
+from .service import (
+    CertificateService,
+    REVOKE_NOT_FOUND,
+    REVOKE_FORBIDDEN,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE
+)
 
 router = APIRouter(prefix="/api/certificate", tags=["Certificate"])
 
 
-# ============== 인증 헬퍼 함수 ==============
-
-async def verify_firebase_token(authorization: Optional[str] = Header(None)) -> Optional[str]:
-    """
-    Firebase ID Token 검증
-
-    Returns:
-        검증된 user_id (Firebase UID) 또는 None (개발 환경에서 인증 비활성화 시)
-    """
-    # 개발 환경에서는 인증 건너뛰기 (선택)
-    if os.getenv("ENV") == "development" and os.getenv("SKIP_AUTH") == "true":
-        return None
-
-    if not authorization:
-        raise HTTPException(
-            status_code=401,
-            detail="Authorization header required"
-        )
-
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid authorization format. Use: Bearer <token>"
-        )
-
-    token = authorization.split(" ")[1]
-
-    try:
-        # Firebase ID 토큰 검증
-        decoded_token = auth.verify_id_token(token)
-        return decoded_token["uid"]
-    except auth.ExpiredIdTokenError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except auth.InvalidIdTokenError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 @router.post("/issue", response_model=IssueCertificateResponse)
 @limiter.limit("5/minute")  # 분당 5회 제한 (블록체인 비용 때문에 더 엄격)
 async def issue_certificate(
     request: Request,
     cert_request: IssueCertificateRequest,
-    verified_user_id: str = Depends(verify_firebase_token)
+    verified_user_id: str = Depends(verify_firebase_token),
+    certificate_service: CertificateService = Depends(get_certificate_service)
 ):
     """
     디지털 인증서 발급 (인증 필요)
@@ -120,7 +70,10 @@ async def issue_certificate(
 
 
 @router.get("/{cert_id}", response_model=CertificateResponse)
-async def get_certificate(cert_id: str):
+async def get_certificate(
+    cert_id: str,
+    certificate_service: CertificateService = Depends(get_certificate_service)
+):
     """
     인증서 상세 조회
 
@@ -138,7 +91,10 @@ async def get_certificate(cert_id: str):
 
 
 @router.get("/verify/{cert_id}", response_model=VerifyCertificateResponse)
-async def verify_certificate(cert_id: str):
+async def verify_certificate(
+    cert_id: str,
+    certificate_service: CertificateService = Depends(get_certificate_service)
+):
     """
     인증서 검증 (공개 API)
 
@@ -153,8 +109,30 @@ async def verify_certificate(cert_id: str):
     return result
 
 
+@router.post("/verify/bulk", response_model=BulkVerifyResponse)
+@limiter.limit("20/minute")
+async def verify_certificates_bulk(
+    request: Request,
+    bulk_request: BulkVerifyRequest,
+    certificate_service: CertificateService = Depends(get_certificate_service)
+):
+    """
+    인증서 일괄 검증 (공개 API)
+
+    목록 페이지의 인증서를 한 번에 검증합니다.
+    DB 조회 한 번 + 블록체인 조회 한 번(JSON-RPC 배치)으로 처리합니다.
+
+    - **cert_ids**: 인증서 ID 목록 (전체 또는 앞 8자리, 최대 100개)
+    - 결과는 요청 순서대로 반환 (찾을 수 없는 ID 는 is_valid=false)
+    """
+    return await certificate_service.verify_certificates(bulk_request.cert_ids)
+
+
 @router.post("/verify-image", response_model=VerifyCertificateResponse)
-async def verify_by_image(request: VerifyImageRequest):
+async def verify_by_image(
+    request: VerifyImageRequest,
+    certificate_service: CertificateService = Depends(get_certificate_service)
+):
     """
     이미지로 인증서 검증
 
@@ -169,17 +147,25 @@ async def verify_by_image(request: VerifyImageRequest):
 @router.get("/user/{user_id}", response_model=UserCertificatesResponse)
 async def get_user_certificates(
     user_id: str,
-    verified_user_id: str = Depends(verify_firebase_token)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    stream: bool = Query(False),
+    verified_user_id: str = Depends(verify_firebase_token),
+    certificate_service: CertificateService = Depends(get_certificate_service)
 ):
     """
     사용자의 인증서 목록 조회 (인증 필요)
 
-    특정 사용자가 발급받은 모든 인증서 목록을 조회합니다.
+    특정 사용자가 발급받은 인증서 목록을 최신순으로 한 페이지씩 조회합니다.
     본인의 인증서만 조회 가능합니다.
 
     **Authorization**: Bearer <Firebase ID Token> 필요
 
     - **user_id**: 사용자 ID (Firebase UID)
+    - **limit**: 페이지 크기 (기본 50, 최대 100)
+    - **cursor**: 이전 응답의 next_cursor (첫 페이지는 생략)
+    - **stream**: true 면 전체 목록을 NDJSON (application/x-ndjson, 한 줄에 인증서 하나) 으로 스트리밍
+      마지막 줄은 {"done": true} (완료) 또는 {"error": ..., "next_cursor": ...} (도중 실패, 커서로 이어받기)
     """
     # 본인 확인: URL의 user_id와 토큰의 user_id 일치 확인
     if verified_user_id and verified_user_id != user_id:
@@ -188,14 +174,22 @@ async def get_user_certificates(
             detail="Access denied. You can only view your own certificates."
         )
 
-    result = await certificate_service.get_user_certificates(user_id)
-    return result
+    try:
+        if stream:
+            return StreamingResponse(
+                certificate_service.stream_user_certificates(user_id, cursor=cursor),
+                media_type="application/x-ndjson"
+            )
+        return await certificate_service.get_user_certificates(user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{cert_id}")
 async def revoke_certificate(
     cert_id: str,
-    verified_user_id: str = Depends(verify_firebase_token)
+    verified_user_id: str = Depends(verify_firebase_token),
+    certificate_service: CertificateService = Depends(get_certificate_service)
 ):
     """
     인증서 취소 (인증 필요)
@@ -208,20 +202,11 @@ async def revoke_certificate(
 
     - **cert_id**: 인증서 ID
     """
-    # 인증서 소유자 확인
-    certificate = await certificate_service.get_certificate(cert_id)
-    if not certificate:
-        raise HTTPException(status_code=404, detail="Certificate not found")
-
-    if verified_user_id and certificate.user_id != verified_user_id:
-        raise HTTPException(
-            status_code=403,
-            detail="Access denied. You can only revoke your own certificates."
-        )
-
-    success, error = await certificate_service.revoke_certificate(cert_id)
+    # 소유자 확인은 취소 UPDATE 조건에 포함 (DB 왕복 한 번)
+    success, error = await certificate_service.revoke_certificate(cert_id, user_id=verified_user_id)
 
     if not success:
-        raise HTTPException(status_code=400, detail=error)
+        status_code = {REVOKE_NOT_FOUND: 404, REVOKE_FORBIDDEN: 403}.get(error, 400)
+        raise HTTPException(status_code=status_code, detail=error)
 
     return {"success": True, "message": "Certificate revoked"}
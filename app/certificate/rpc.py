@@ -0,0 +1,107 @@
+"""
+Polygon RPC 호출 유틸리티
+
+- JSON-RPC 배치 요청: web3.py 6 의 AsyncHTTPProvider 는 배치 요청을 지원하지 않으므로,
+  여러 조회(영수증 폴링, 인증서 일괄 검증 등)를 HTTP 요청 한 번으로 묶을 때 사용합니다.
+  BlockchainService 의 aiohttp 세션(커넥션 풀)을 그대로 사용합니다.
+- RPC 호출 수 집계: 노드로 실제 전송된 호출 수를 method 별 메트릭과
+  HTTP 요청별 카운터(contextvar)로 기록합니다. (응답 헤더 X-RPC-Calls)
+"""
+from contextvars import ContextVar
+from typing import Any, List, Optional, Tuple
+
+import aiohttp
+
+from app.metrics import registry
+
+# 공개 RPC 노드의 배치 크기 제한 대비 (요청당 최대 호출 수)
+MAX_BATCH_SIZE = 50
+
+_rpc_calls = registry.counter("polygon_rpc_calls_total", "노드로 전송된 Polygon RPC 호출 수 (method 별, 배치는 batch)")
+request_rpc_calls = registry.histogram(
+    "polygon_rpc_calls_per_request", "인증서 API 요청당 Polygon RPC 호출 수", buckets=(0, 1, 2, 3, 5, 10, 20)
+)
+
+# 현재 HTTP 요청의 RPC 호출 수 ([count], 요청 처리 중 만든 하위 태스크와 공유)
+_request_calls: ContextVar[Optional[List[int]]] = ContextVar("rpc_request_calls", default=None)
+
+
+def begin_request_budget():
+    """HTTP 요청 시작 시 RPC 호출 카운터 설정 (미들웨어에서 호출, reset 용 토큰 반환)"""
+    return _request_calls.set([0])
+
+
+def end_request_budget(token) -> int:
+    """HTTP 요청 종료 시 카운터 해제 후 호출 수 반환"""
+    counter = _request_calls.get()
+    _request_calls.reset(token)
+    return counter[0] if counter else 0
+
+
+def detach_request_budget():
+    """요청 중에 시작됐지만 응답 후에도 계속되는 백그라운드 태스크에서 호출
+
+    태스크는 생성 시점의 컨텍스트를 복사하므로, 해제하지 않으면 백그라운드 호출이
+    원래 요청의 호출 수에 더해집니다. (태스크 컨텍스트에서만 해제됨)
+    """
+    _request_calls.set(None)
+
+
+def record_rpc_call(method: str):
+    """노드로 전송한 RPC 호출 1회 기록"""
+    _rpc_calls.inc(method=method)
+    counter = _request_calls.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class RPCError(Exception):
+    """JSON-RPC 에러 응답"""
+
+    def __init__(self, error):
+        self.error = error
+        message = error.get("message") if isinstance(error, dict) else error
+        super().__init__(f"RPC error: {message}")
+
+
+async def rpc_batch(
+    session: aiohttp.ClientSession,
+    url: str,
+    calls: List[Tuple[str, list]],
+) -> List[Any]:
+    """JSON-RPC 배치 호출
+
+    Args:
+        session: aiohttp 세션
+        url: RPC URL
+        calls: [(method, params), ...]
+
+    Returns:
+        호출 순서대로 result 값 (개별 호출이 실패하면 해당 위치에 RPCError)
+    """
+    results: List[Any] = []
+    for start in range(0, len(calls), MAX_BATCH_SIZE):
+        chunk = calls[start:start + MAX_BATCH_SIZE]
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(chunk)
+        ]
+        record_rpc_call("batch")
+        async with session.post(url, json=payload) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+
+        # 배치를 지원하지 않는 노드는 단일 에러 객체를 반환
+        if isinstance(data, dict):
+            raise RPCError(data.get("error", data))
+
+        by_id = {item.get("id"): item for item in data}
+        for i in range(len(chunk)):
+            item = by_id.get(i)
+            if item is None:
+                results.append(RPCError("missing response"))
+            elif "error" in item:
+                results.append(RPCError(item["error"]))
+            else:
+                results.append(item.get("result"))
+    return results
@@ -2,15 +2,42 @@
 인증서 서비스 - 비즈니스 로직
 
 블록체인 + Supabase를 조합하여 인증서를 발급/관리합니다.
+
+블록체인이 설정되어 있으면 발급 API 는 PENDING 인증서를 바로 반환하고,
+온체인 기록은 CertificateConfirmer 가 백그라운드에서 처리합니다. (app.certificate.confirmer)
+CERTIFICATE_REVOCATION_MODE=onchain 이면 취소도 RevocationQueue 가 모아서 온체인에 기록합니다.
+(app.certificate.revocation)
+
+DB 는 supabase AsyncClient 로 접근합니다. (app.certificate.db, 쿼리마다 제한 시간)
+
+조회는 응답에 필요한 컬럼만 가져오고(CERTIFICATE_COLUMNS), 한 번 조회한 행을 검증까지 그대로 사용합니다.
+취소는 소유자 조건을 포함한 UPDATE 한 번으로 처리합니다.
+get_certificate (조회 / 검증 API) 는 워커 간 무효화되는 조회 캐시를 거칩니다. (app.certificate.lookup_cache)
+
+사용자 인증서 목록은 (created_at, id) 키셋 페이지네이션으로 조회하고(OFFSET 없음),
+전체 개수는 트리거가 관리하는 user_certificate_counts 에서 읽습니다.
+
+검증 URL 의 짧은 ID 는 short_id 컬럼(유니크 인덱스)에 저장하고 정확히 일치하는 행만 조회합니다.
+보통 cert_id 앞 8자리이며, 이미 쓰인 값이면 더 긴 접두사를 사용합니다.
 """
 import os
 import re
+import json
+import uuid
+import base64
+import asyncio
 import hashlib
-from typing import Optional, List, Tuple
+from typing import AsyncIterator, Optional, List, Tuple, TYPE_CHECKING
 from datetime import datetime
-from supabase import create_client, Client
 
-from .blockchain import blockchain_service
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+    from .blockchain import BlockchainService
+
+from . import db
+from .confirmer import CertificateConfirmer
+from .revocation import RevocationQueue
+from .lookup_cache import CertificateLookupCache
 from .models import (
     CertificateType,
     CertificateStatus,
@@ -18,22 +45,62 @@ from .models import (
     CertificateDB,
     IssueCertificateResponse,
     VerifyCertificateResponse,
+    BulkVerifyResult,
+    BulkVerifyResponse,
     UserCertificatesResponse
 )
 
+# 짧은 ID 길이 (cert_id 0x 뒤 접두사), 앞 길이가 이미 쓰였으면 다음 길이로 재시도
+SHORT_ID_LENGTHS = (8, 12, 16, 64)
 
-class CertificateService:
-    """인증서 서비스"""
+# 응답(_to_response)에 필요한 컬럼만 조회 (metadata 등 제외)
+CERTIFICATE_COLUMNS = (
+    "cert_id,short_id,user_id,image_url,image_hash,cert_type,tx_hash,block_number,"
+    "status,merkle_root,merkle_proof,revoke_tx_hash,created_at"
+)
 
-    def __init__(self):
-        # Supabase 클라이언트
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_SERVICE_KEY")  # 서비스 키 사용
+# 목록 조회는 키셋 커서용 id 포함
+LIST_COLUMNS = "id," + CERTIFICATE_COLUMNS
 
-        if supabase_url and supabase_key:
-            self.supabase: Client = create_client(supabase_url, supabase_key)
-        else:
-            self.supabase = None
+# 사용자 인증서 목록 페이지 크기
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# revoke_certificate 실패 사유 (라우터가 HTTP 상태 코드로 변환)
+REVOKE_NOT_FOUND = "Certificate not found"
+REVOKE_FORBIDDEN = "Access denied. You can only revoke your own certificates."
+
+
+class CertificateService:
+    """인증서 서비스
+
+    Supabase / 블록체인 클라이언트는 app.resources 에서 주입받습니다.
+    """
+
+    def __init__(self, supabase: Optional["AsyncClient"], blockchain: "BlockchainService"):
+        # Supabase 클라이언트 (설정 없으면 None)
+        self.supabase = supabase
+        self.blockchain = blockchain
+        # 인증서 조회 캐시 (취소 시 무효화)
+        self.cache = CertificateLookupCache.from_env()
+        # 온체인 기록 백그라운드 워커
+        self.confirmer = CertificateConfirmer(
+            blockchain,
+            supabase,
+            poll_interval=float(os.getenv("CONFIRM_POLL_INTERVAL", "2")),
+            recover_after=float(os.getenv("CONFIRM_RECOVER_AFTER", "600")),
+            recover_interval=float(os.getenv("CONFIRM_RECOVER_INTERVAL", "60")),
+        )
+        # 온체인 취소 배치 큐
+        self.revocations = RevocationQueue(
+            blockchain,
+            supabase,
+            max_size=int(os.getenv("REVOCATION_BATCH_MAX_SIZE", "256")),
+            max_wait=float(os.getenv("REVOCATION_BATCH_MAX_WAIT", "60")),
+            on_written=self.cache.invalidate,
+            recover_after=float(os.getenv("REVOCATION_RECOVER_AFTER", "600")),
+            recover_interval=float(os.getenv("REVOCATION_RECOVER_INTERVAL", "60")),
+        )
 
         # 검증 웹페이지 URL
         self.verify_base_url = os.getenv(
@@ -41,12 +108,38 @@ class CertificateService:
             "https://ocean-seal.shop/verify"
         )
 
-    def _get_verify_url(self, cert_id: str) -> str:
+    def _get_verify_url(self, cert_id: str, short_id: Optional[str] = None) -> str:
         """인증서 검증 URL 생성"""
-        # cert_id에서 0x 제거하고 앞 8자리만 사용 (짧은 URL)
-        short_id = cert_id[2:10] if cert_id.startswith("0x") else cert_id[:8]
+        # 저장된 short_id 가 없으면 cert_id에서 0x 제거하고 앞 8자리만 사용 (짧은 URL)
+        if not short_id:
+            short_id = self._strip_prefix(cert_id)[:SHORT_ID_LENGTHS[0]]
         return f"{self.verify_base_url}/{short_id}"
 
+    @staticmethod
+    def _strip_prefix(cert_id: str) -> str:
+        return cert_id[2:] if cert_id.startswith("0x") else cert_id
+
+    def _lookup_key(self, cert_id: str) -> Tuple[str, str]:
+        """조회 ID -> (컬럼, 값): 전체 ID 는 cert_id, 그 외는 short_id 정확히 일치 (모두 인덱스 조회)"""
+        hex_id = self._strip_prefix(cert_id).lower()
+        if len(hex_id) == 64:
+            return "cert_id", "0x" + hex_id
+        return "short_id", hex_id
+
+    async def _insert_certificate(self, row: dict):
+        """인증서 저장 (short_id 가 이미 쓰였으면 더 긴 접두사로 재시도)"""
+        from postgrest.exceptions import APIError
+
+        hex_id = self._strip_prefix(row["cert_id"]).lower()
+        for length in SHORT_ID_LENGTHS:
+            row["short_id"] = hex_id[:length]
+            try:
+                return await db.execute(self.supabase.table("certificates").insert(row))
+            except APIError as e:
+                # 23505: unique 위반 (cert_id 중복 등 다른 제약이면 그대로 전달)
+                if e.code != "23505" or "short_id" not in str(e) or length == SHORT_ID_LENGTHS[-1]:
+                    raise
+
     def _hash_user_id(self, user_id: str) -> str:
         """사용자 ID 해시 (개인정보 보호)"""
         return hashlib.sha256(user_id.encode()).hexdigest()[:16]
@@ -62,18 +155,19 @@ class CertificateService:
         인증서 발급
 
         1. 이미지 해시 계산
-        2. 블록체인에 기록
-        3. Supabase에 메타데이터 저장
+        2. 인증서 ID 결정 (블록체인 설정 시 certId, 아니면 오프체인 ID)
+        3. Supabase에 PENDING 상태로 저장 후 바로 반환
+        4. 온체인 기록은 confirmer 가 처리 (완료 시 ACTIVE, 실패 시 오프체인 ACTIVE)
         """
         try:
             # 1. 이미지 해시 계산
-            image_hash = blockchain_service.compute_image_hash_from_base64(image_base64)
+            image_hash = self.blockchain.compute_image_hash_from_base64(image_base64)
 
             # 2. 중복 체크 (이미 발급된 이미지인지)
             if self.supabase:
-                existing = self.supabase.table("certificates").select("*").eq(
+                existing = await db.execute(self.supabase.table("certificates").select(CERTIFICATE_COLUMNS).eq(
                     "image_hash", image_hash
-                ).execute()
+                ).limit(1))
 
                 if existing.data:
                     # 이미 발급된 인증서 반환
@@ -83,24 +177,22 @@ class CertificateService:
                         certificate=self._to_response(cert_data)
                     )
 
-            # 3. 블록체인에 발급
+            # 3. 인증서 ID 결정
             hashed_user_id = self._hash_user_id(user_id)
 
-            success, result, error = await blockchain_service.issue_certificate(
-                image_hash=image_hash,
-                cert_type=process_type.value,
-                user_id=hashed_user_id
-            )
-
-            if not success:
-                # 블록체인 실패 시 오프체인으로 발급
+            if self.blockchain.is_configured():
+                # 온체인 기록은 백그라운드에서 (PENDING 으로 바로 반환)
+                cert_id = "0x" + self.blockchain.compute_cert_id(
+                    image_hash, process_type.value, hashed_user_id
+                ).hex()
+                tx_hash = "pending"
+                status = CertificateStatus.PENDING
+            else:
+                # 블록체인 미설정 시 오프체인으로 발급
                 cert_id = self._generate_offchain_cert_id(image_hash, user_id)
                 tx_hash = "offchain"
-                block_number = 0
-            else:
-                cert_id = result['cert_id']
-                tx_hash = result['tx_hash']
-                block_number = result['block_number']
+                status = CertificateStatus.ACTIVE
+            block_number = 0
 
             # 4. Supabase에 저장
             cert_db = CertificateDB(
@@ -111,11 +203,11 @@ class CertificateService:
                 cert_type=process_type.value,
                 tx_hash=tx_hash,
                 block_number=block_number,
-                status=CertificateStatus.ACTIVE.value
+                status=status.value
             )
 
             if self.supabase:
-                insert_result = self.supabase.table("certificates").insert({
+                row = {
                     "cert_id": cert_db.cert_id,
                     "user_id": cert_db.user_id,
                     "image_url": cert_db.image_url,
@@ -124,16 +216,21 @@ class CertificateService:
                     "tx_hash": cert_db.tx_hash,
                     "block_number": cert_db.block_number,
                     "status": cert_db.status
-                }).execute()
+                }
+                insert_result = await self._insert_certificate(row)
 
                 if insert_result.data:
+                    if status == CertificateStatus.PENDING:
+                        self.confirmer.submit(cert_id)
                     cert_data = insert_result.data[0]
                     return IssueCertificateResponse(
                         success=True,
                         certificate=self._to_response(cert_data)
                     )
 
-            # Supabase 없이도 응답 생성
+            # Supabase 없이도 응답 생성 (기록 결과를 저장할 곳이 없어도 온체인 기록은 진행)
+            if status == CertificateStatus.PENDING:
+                self.confirmer.submit(cert_id)
             return IssueCertificateResponse(
                 success=True,
                 certificate=CertificateResponse(
@@ -144,7 +241,7 @@ class CertificateService:
                     user_id=user_id,
                     tx_hash=tx_hash,
                     block_number=block_number,
-                    status=CertificateStatus.ACTIVE,
+                    status=status,
                     created_at=datetime.utcnow(),
                     verify_url=self._get_verify_url(cert_id)
                 )
@@ -171,6 +268,13 @@ class CertificateService:
             return False
         return True
 
+    async def _fetch_certificate(self, column: str, value: str) -> Optional[dict]:
+        """인증서 행 한 건 조회 (쿼리 1회)"""
+        result = await db.execute(
+            self.supabase.table("certificates").select(CERTIFICATE_COLUMNS).eq(column, value).limit(1)
+        )
+        return result.data[0] if result.data else None
+
     async def get_certificate(self, cert_id: str) -> Optional[CertificateResponse]:
         """인증서 조회"""
         if not self.supabase:
@@ -180,21 +284,16 @@ class CertificateService:
         if not self._validate_cert_id(cert_id):
             return None
 
-        # cert_id가 짧은 경우 (8자리) LIKE 검색
-        if len(cert_id) <= 10:
-            # 0x 접두사 제거 후 검색
-            search_id = cert_id[2:] if cert_id.startswith("0x") else cert_id
-            result = self.supabase.table("certificates").select("*").like(
-                "cert_id", f"%{search_id}%"
-            ).execute()
-        else:
-            result = self.supabase.table("certificates").select("*").eq(
-                "cert_id", cert_id
-            ).execute()
-
-        if result.data:
-            return self._to_response(result.data[0])
-        return None
+        # 전체 ID 는 cert_id, 짧은 ID (검증 URL) 는 short_id 로 정확히 일치 검색
+        column, value = self._lookup_key(cert_id)
+        row = self.cache.get(value)
+        if row is None:
+            # 조회 중 다른 요청 / 워커가 취소하면 저장되는 항목이 바로 무효가 되도록 버전을 먼저 읽음
+            version = self.cache.version(value)
+            row = await self._fetch_certificate(column, value)
+            if row:
+                self.cache.put(value, row, version)
+        return self._to_response(row) if row else None
 
     async def verify_certificate(self, cert_id: str) -> VerifyCertificateResponse:
         """
@@ -206,6 +305,90 @@ class CertificateService:
         # 1. DB에서 조회
         certificate = await self.get_certificate(cert_id)
 
+        # 2. 블록체인 검증
+        return await self._verify(certificate)
+
+    async def _verify(self, certificate: Optional[CertificateResponse]) -> VerifyCertificateResponse:
+        """조회한 인증서를 검증 (온체인 인증서만 블록체인 조회, DB 재조회 없음)"""
+        chain_result = None
+        if self._needs_chain_check(certificate):
+            chain_result = await self.blockchain.verify_certificate(
+                certificate.cert_id,
+                merkle_root=certificate.merkle_root,
+                merkle_proof=certificate.merkle_proof
+            )
+
+        return self._verification(certificate, chain_result)
+
+    async def verify_certificates(self, cert_ids: List[str]) -> BulkVerifyResponse:
+        """
+        인증서 일괄 검증
+
+        1. Supabase 조회 한 번으로 모든 인증서 메타데이터 조회
+        2. 온체인 인증서는 블록체인 일괄 검증 (JSON-RPC 배치 요청 한 번)
+        """
+        # 1. DB에서 한 번에 조회 (전체 ID 는 cert_id, 짧은 ID 는 short_id 로 in)
+        keys = {
+            cert_id: self._lookup_key(cert_id)
+            for cert_id in dict.fromkeys(cert_ids) if self._validate_cert_id(cert_id)
+        }
+        rows = {}
+        if self.supabase and keys:
+            filters = []
+            for column in ("cert_id", "short_id"):
+                values = sorted({value for c, value in keys.values() if c == column})
+                if values:
+                    filters.append(f"{column}.in.({','.join(values)})")
+            result = await db.execute(
+                self.supabase.table("certificates").select(CERTIFICATE_COLUMNS).or_(",".join(filters))
+            )
+            for row in result.data or []:
+                rows[("cert_id", row['cert_id'])] = row
+                if row.get('short_id'):
+                    rows[("short_id", row['short_id'])] = row
+
+        def find(cert_id: str) -> Optional[CertificateResponse]:
+            row = rows.get(keys[cert_id]) if cert_id in keys else None
+            return self._to_response(row) if row else None
+
+        certificates = [find(cert_id) for cert_id in cert_ids]
+
+        # 2. 온체인 인증서만 모아서 일괄 검증
+        on_chain = [c for c in certificates if self._needs_chain_check(c)]
+        chain_results = {}
+        if on_chain:
+            results = await self.blockchain.verify_certificates([
+                (c.cert_id, c.merkle_root, c.merkle_proof) for c in on_chain
+            ])
+            chain_results = {c.cert_id: r for c, r in zip(on_chain, results)}
+
+        return BulkVerifyResponse(
+            total_count=len(cert_ids),
+            results=[
+                BulkVerifyResult(
+                    cert_id=cert_id,
+                    **self._verification(
+                        certificate, chain_results.get(certificate.cert_id) if certificate else None
+                    ).model_dump()
+                )
+                for cert_id, certificate in zip(cert_ids, certificates)
+            ]
+        )
+
+    @staticmethod
+    def _needs_chain_check(certificate: Optional[CertificateResponse]) -> bool:
+        return (
+            certificate is not None and
+            certificate.status == CertificateStatus.ACTIVE and
+            certificate.tx_hash != "offchain"
+        )
+
+    def _verification(
+        self,
+        certificate: Optional[CertificateResponse],
+        chain_result: Optional[Tuple[bool, Optional[dict], Optional[str]]]
+    ) -> VerifyCertificateResponse:
+        """DB 조회 결과 + 블록체인 검증 결과 -> 검증 응답"""
         if not certificate:
             return VerifyCertificateResponse(
                 is_valid=False,
@@ -213,7 +396,7 @@ class CertificateService:
                 message="인증서를 찾을 수 없습니다."
             )
 
-        # 2. 상태 확인
+        # 상태 확인
         if certificate.status == CertificateStatus.REVOKED:
             return VerifyCertificateResponse(
                 is_valid=False,
@@ -222,12 +405,24 @@ class CertificateService:
                 message="이 인증서는 취소되었습니다."
             )
 
-        # 3. 블록체인 검증 (온체인 인증서인 경우)
-        blockchain_verified = False
-        if certificate.tx_hash != "offchain":
-            is_valid, _, error = await blockchain_service.verify_certificate(certificate.cert_id)
-            blockchain_verified = is_valid
+        if certificate.status == CertificateStatus.PENDING:
+            return VerifyCertificateResponse(
+                is_valid=True,
+                certificate=certificate,
+                blockchain_verified=False,
+                message="유효한 인증서입니다. (블록체인 기록 대기 중)"
+            )
+
+        # DB 는 유효하지만 온체인에 취소가 기록된 경우 (CERTIFICATE_REVOCATION_MODE=onchain)
+        if chain_result and chain_result[1] and chain_result[1].get("revoked_at"):
+            return VerifyCertificateResponse(
+                is_valid=False,
+                certificate=certificate,
+                blockchain_verified=True,
+                message="이 인증서는 취소되었습니다."
+            )
 
+        blockchain_verified = bool(chain_result and chain_result[0])
         return VerifyCertificateResponse(
             is_valid=True,
             certificate=certificate,
@@ -238,17 +433,13 @@ class CertificateService:
     async def verify_by_image(self, image_base64: str) -> VerifyCertificateResponse:
         """이미지로 인증서 검증"""
         # 이미지 해시 계산
-        image_hash = blockchain_service.compute_image_hash_from_base64(image_base64)
+        image_hash = self.blockchain.compute_image_hash_from_base64(image_base64)
 
-        # DB에서 해시로 검색
+        # DB에서 해시로 검색 (조회한 행으로 바로 검증)
         if self.supabase:
-            result = self.supabase.table("certificates").select("*").eq(
-                "image_hash", image_hash
-            ).execute()
-
-            if result.data:
-                certificate = self._to_response(result.data[0])
-                return await self.verify_certificate(certificate.cert_id)
+            row = await self._fetch_certificate("image_hash", image_hash)
+            if row:
+                return await self._verify(self._to_response(row))
 
         return VerifyCertificateResponse(
             is_valid=False,
@@ -256,39 +447,128 @@ class CertificateService:
             message="이 이미지에 대한 인증서를 찾을 수 없습니다."
         )
 
-    async def get_user_certificates(self, user_id: str) -> UserCertificatesResponse:
-        """사용자의 인증서 목록 조회"""
-        certificates = []
+    @staticmethod
+    def _encode_cursor(position: Tuple[str, str]) -> str:
+        """(created_at, id) -> 커서"""
+        raw = "|".join(position).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
 
-        if self.supabase:
-            result = self.supabase.table("certificates").select("*").eq(
-                "user_id", user_id
-            ).order("created_at", desc=True).execute()
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, str]:
+        """커서 -> (created_at, id), 잘못된 커서면 ValueError"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            created_at, row_id = raw.split("|")
+            datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+            return created_at, str(uuid.UUID(row_id))
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    async def _user_page(
+        self, user_id: str, limit: int, position: Optional[Tuple[str, str]]
+    ) -> Tuple[List[dict], Optional[Tuple[str, str]]]:
+        """최신순 한 페이지 (position 이후) -> (행 목록, 다음 position)
+
+        (user_id, created_at DESC, id DESC) 인덱스 범위 조회 (OFFSET 없이 페이지마다 일정한 비용)
+        """
+        query = self.supabase.table("certificates").select(LIST_COLUMNS).eq("user_id", user_id)
+        if position:
+            created_at, row_id = position
+            query = query.or_(
+                f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})'
+            )
+        # 한 행 더 조회하여 다음 페이지가 있는지 확인
+        result = await db.execute(query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1))
+        rows = result.data or []
+        if len(rows) <= limit:
+            return rows, None
+        last = rows[limit - 1]
+        return rows[:limit], (last['created_at'], last['id'])
+
+    async def _user_certificate_count(self, user_id: str) -> int:
+        """사용자 인증서 수 (트리거가 관리하는 카운터 행 하나 조회)"""
+        result = await db.execute(
+            self.supabase.table("user_certificate_counts").select("total").eq("user_id", user_id)
+        )
+        return result.data[0]["total"] if result.data else 0
 
-            if result.data:
-                certificates = [self._to_response(cert) for cert in result.data]
+    async def get_user_certificates(
+        self, user_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> UserCertificatesResponse:
+        """사용자의 인증서 목록 조회 (최신순 한 페이지, 잘못된 커서면 ValueError)"""
+        position = self._decode_cursor(cursor) if cursor else None
+        if not self.supabase:
+            return UserCertificatesResponse(user_id=user_id, total_count=0, certificates=[])
 
+        (rows, next_position), total_count = await asyncio.gather(
+            self._user_page(user_id, limit, position),
+            self._user_certificate_count(user_id),
+        )
         return UserCertificatesResponse(
             user_id=user_id,
-            total_count=len(certificates),
-            certificates=certificates
+            total_count=total_count,
+            certificates=[self._to_response(row) for row in rows],
+            next_cursor=self._encode_cursor(next_position) if next_position else None
         )
 
-    async def revoke_certificate(self, cert_id: str) -> Tuple[bool, Optional[str]]:
-        """인증서 취소"""
+    def stream_user_certificates(self, user_id: str, cursor: Optional[str] = None) -> AsyncIterator[str]:
+        """사용자의 인증서 전체를 NDJSON 줄 단위로 (페이지 단위로 조회하며 전송, 잘못된 커서면 ValueError)
+
+        마지막 줄은 끝까지 보냈으면 {"done": true}, 도중에 실패하면 {"error": ..., "next_cursor": ...}
+        (next_cursor 는 이미 보낸 마지막 페이지 다음, 응답 상태 코드는 이미 200 으로 전송됨)
+        """
+        position = self._decode_cursor(cursor) if cursor else None
+        return self._stream_user_pages(user_id, position)
+
+    async def _stream_user_pages(self, user_id: str, position: Optional[Tuple[str, str]]) -> AsyncIterator[str]:
+        if not self.supabase:
+            yield json.dumps({"error": "Database not configured", "next_cursor": None}) + "\n"
+            return
+        while True:
+            try:
+                rows, next_position = await self._user_page(user_id, MAX_PAGE_SIZE, position)
+                page = "".join(self._to_response(row).model_dump_json() + "\n" for row in rows)
+            except Exception as e:
+                cursor = self._encode_cursor(position) if position else None
+                yield json.dumps({"error": str(e), "next_cursor": cursor}) + "\n"
+                return
+            if page:
+                yield page
+            position = next_position
+            if position is None:
+                yield json.dumps({"done": True}) + "\n"
+                return
+
+    async def revoke_certificate(self, cert_id: str, user_id: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """인증서 취소
+
+        user_id 가 주어지면 본인 인증서만 취소 (소유자 조건을 포함한 UPDATE 한 번)
+        """
         if not self.supabase:
             return False, "Database not configured"
+        if not self._validate_cert_id(cert_id):
+            return False, REVOKE_NOT_FOUND
 
         # DB 업데이트
-        result = self.supabase.table("certificates").update({
+        column, value = self._lookup_key(cert_id)
+        query = self.supabase.table("certificates").update({
             "status": CertificateStatus.REVOKED.value
-        }).eq("cert_id", cert_id).execute()
+        }).eq(column, value)
+        if user_id:
+            query = query.eq("user_id", user_id)
+        result = await db.execute(query)
 
-        if not result.data:
-            return False, "Certificate not found"
+        if result.data:
+            self.cache.invalidate(row["cert_id"] for row in result.data)
+        else:
+            # 실패한 경우에만 원인 확인 (없는 인증서 / 다른 사용자의 인증서)
+            if user_id and await self._fetch_certificate(column, value):
+                return False, REVOKE_FORBIDDEN
+            return False, REVOKE_NOT_FOUND
 
-        # 블록체인에서도 취소 (선택적)
-        # await blockchain_service.revoke_certificate(cert_id)
+        # 온체인 취소는 모아서 배치로 기록 (CERTIFICATE_REVOCATION_MODE=onchain, 오프체인 인증서 제외)
+        if result.data[0].get("tx_hash") != "offchain":
+            self.revocations.submit(result.data[0]["cert_id"])
 
         return True, None
 
@@ -304,9 +584,8 @@ class CertificateService:
             block_number=data['block_number'],
             status=CertificateStatus(data['status']),
             created_at=datetime.fromisoformat(data['created_at'].replace('Z', '+00:00')) if data.get('created_at') else datetime.utcnow(),
-            verify_url=self._get_verify_url(data['cert_id'])
+            verify_url=self._get_verify_url(data['cert_id'], data.get('short_id')),
+            merkle_root=data.get('merkle_root'),
+            merkle_proof=data.get('merkle_proof'),
+            revoke_tx_hash=data.get('revoke_tx_hash')
         )
-
-
-# 싱글톤 인스턴스
-certificate_service = CertificateService()
@@ -0,0 +1,141 @@
+"""
+온체인 검증 결과 캐시
+
+컨트랙트에 기록된 발급 타임스탬프는 한 번 확정되면 바뀌지 않으므로,
+QR 스캔마다 verify(bytes32) 를 호출하지 않고 결과를 캐시합니다.
+
+- 확정된 결과 (타임스탬프가 finality 보다 오래됨): 메모리 LRU + 로컬 디스크(SQLite)에 영구 저장
+  디스크는 워커 간 / 재시작 후에도 공유됩니다.
+- 아직 확정 전인 결과 / 기록 없음(0): 메모리에만 negative_ttl 동안 저장
+  (방금 채굴된 인증서가 reorg 로 사라지거나, 곧 기록될 인증서가 오래 '없음'으로 남지 않도록)
+- 캐시 키는 온체인 조회 키 (인증서 ID 또는 Merkle 루트), 컨트랙트 주소별로 파일 분리
+  온체인 취소 시각(revokedAt)도 같은 규칙으로 캐시 (키 앞에 b"revoked:", 취소는 되돌릴 수 없으므로 확정 후 영구)
+
+환경변수:
+    VERIFY_CACHE_PATH: SQLite 파일 경로 (기본 <임시 디렉터리>/oceanseal-verify-<컨트랙트>.sqlite3, 빈 값이면 디스크 미사용)
+    VERIFY_CACHE_SIZE: 메모리 캐시 최대 항목 수 (기본 10000)
+    VERIFY_NEGATIVE_TTL: 미확정 / 없음 결과 캐시 시간 (초, 기본 30)
+    VERIFY_FINALITY_SECONDS: 이 시간보다 오래된 타임스탬프만 영구 캐시 (초, 기본 300)
+"""
+import os
+import time
+import asyncio
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.metrics import registry
+
+_cache_results = registry.counter("certificate_verify_cache_total", "온체인 검증 캐시 조회 결과 (memory/disk/miss)")
+
+
+def _default_path(contract_address: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"oceanseal-verify-{contract_address.lower()}.sqlite3")
+
+
+class VerificationCache:
+    """온체인 조회 키(bytes32) -> 발급 타임스탬프 캐시 (메모리는 이벤트 루프에서만 접근)"""
+
+    def __init__(
+        self,
+        path: Optional[str],
+        max_size: int = 10000,
+        negative_ttl: float = 30.0,
+        finality_seconds: float = 300.0,
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.negative_ttl = negative_ttl
+        self.finality_seconds = finality_seconds
+        # 키 -> (타임스탬프, 만료 시각 또는 None=영구)
+        self._entries: "OrderedDict[bytes, Tuple[int, Optional[float]]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, contract_address: str) -> "VerificationCache":
+        path = os.getenv("VERIFY_CACHE_PATH")
+        return cls(
+            path=_default_path(contract_address) if path is None else (path or None),
+            max_size=int(os.getenv("VERIFY_CACHE_SIZE", "10000")),
+            negative_ttl=float(os.getenv("VERIFY_NEGATIVE_TTL", "30")),
+            finality_seconds=float(os.getenv("VERIFY_FINALITY_SECONDS", "300")),
+        )
+
+    # ============ 디스크 (스레드에서 실행) ============
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS anchors (anchor_id BLOB PRIMARY KEY, timestamp INTEGER NOT NULL)"
+            )
+            self._db = db
+        return self._db
+
+    def _disk_get(self, key: bytes) -> Optional[int]:
+        with self._db_lock:
+            row = self._connect().execute(
+                "SELECT timestamp FROM anchors WHERE anchor_id = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _disk_put(self, key: bytes, timestamp: int):
+        with self._db_lock:
+            self._connect().execute(
+                "INSERT OR IGNORE INTO anchors (anchor_id, timestamp) VALUES (?, ?)", (key, timestamp)
+            )
+
+    # ============ 조회 / 저장 ============
+
+    def _remember(self, key: bytes, timestamp: int, expires_at: Optional[float]):
+        self._entries[key] = (timestamp, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: bytes) -> Optional[int]:
+        """캐시된 타임스탬프 (0 = 기록 없음으로 캐시됨, None = 캐시 없음)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            timestamp, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                _cache_results.inc(result="memory")
+                return timestamp
+            del self._entries[key]
+
+        if self.path:
+            try:
+                timestamp = await asyncio.to_thread(self._disk_get, key)
+            except sqlite3.Error as e:
+                print(f"[VerifyCache] 디스크 캐시 조회 실패: {e}")
+                timestamp = None
+            if timestamp is not None:
+                self._remember(key, timestamp, None)
+                _cache_results.inc(result="disk")
+                return timestamp
+
+        _cache_results.inc(result="miss")
+        return None
+
+    async def put(self, key: bytes, timestamp: int):
+        """온체인 조회 결과 저장 (확정된 결과만 영구 저장)"""
+        if timestamp and time.time() - timestamp >= self.finality_seconds:
+            self._remember(key, timestamp, None)
+            if self.path:
+                try:
+                    await asyncio.to_thread(self._disk_put, key, timestamp)
+                except sqlite3.Error as e:
+                    print(f"[VerifyCache] 디스크 캐시 저장 실패: {e}")
+        else:
+            self._remember(key, timestamp, time.monotonic() + self.negative_ttl)
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
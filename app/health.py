@@ -0,0 +1,218 @@
+"""
+의존성 상태 확인 (/healthz, /readyz)
+
+- /healthz: 프로세스 생존 여부만 확인 (I/O 없음, 로드밸런서/도커 헬스체크용)
+- /readyz: Gemini / Supabase / Polygon RPC / Firebase 공개키 조회를 실제로 한 번씩 호출하여
+  연결(TLS 세션, 커넥션 풀, 공개키 캐시)을 데운 뒤에만 ready 로 응답
+
+의존성 확인은 백그라운드에서 주기적으로 실행되고, /readyz 는 캐시된 결과만 반환합니다.
+(요청마다 외부 API 를 호출하지 않음)
+
+환경변수:
+    READINESS_DEPENDENCIES: 확인할 의존성 (기본 gemini,supabase,blockchain,firebase)
+        PRELOAD_SUBSYSTEMS 를 줄인 프로세스는 여기도 같이 줄여야 해당 SDK 를 로드하지 않습니다.
+    HEALTH_CHECK_INTERVAL: 의존성 재확인 주기 (초, 기본 30)
+    HEALTH_CHECK_TIMEOUT: 의존성별 확인 제한 시간 (초, 기본 5)
+"""
+import os
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from app import config
+from app.metrics import registry
+from app.resources import resources
+
+STATUS_UNKNOWN = "unknown"    # 아직 확인 전 (warm-up 중)
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_DISABLED = "disabled"  # 설정되지 않은 의존성 (ready 판정에서 제외)
+
+_dependency_up = registry.gauge("dependency_up", "의존성 확인 결과 (1=ok/disabled, 0=error/unknown)")
+_check_latency = registry.gauge("dependency_check_latency_seconds", "마지막 의존성 확인 소요 시간 (초)")
+
+
+class DependencyDisabled(Exception):
+    """의존성이 설정되지 않음 (예: SUPABASE_URL 없음)"""
+
+
+@dataclass
+class DependencyStatus:
+    """의존성별 마지막 확인 결과"""
+    status: str = STATUS_UNKNOWN
+    latency_ms: Optional[float] = None
+    checked_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.status in (STATUS_OK, STATUS_DISABLED)
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "latency_ms": self.latency_ms,
+            "checked_at": self.checked_at,
+            "error": self.error,
+        }
+
+
+# ============ 의존성별 확인 함수 (동기 함수는 스레드에서 실행) ============
+
+def check_gemini():
+    """모델 메타데이터 조회 (이미지 생성 쿼터를 쓰지 않고 HTTPS 연결만 데움)"""
+    client = resources.gemini_client()
+    if client is None:
+        raise DependencyDisabled("GEMINI_API_KEY not set")
+    client.models.get(model=config.GEMINI_MODEL)
+
+
+async def check_supabase():
+    """certificates 테이블 1행 조회 (AsyncClient, 커넥션 풀도 함께 데움)"""
+    supabase = await asyncio.to_thread(resources.supabase)
+    if supabase is None:
+        raise DependencyDisabled("SUPABASE_URL / SUPABASE_SERVICE_KEY not set")
+    await supabase.table("certificates").select("id").limit(1).execute()
+
+
+async def check_blockchain():
+    """Polygon RPC 최신 블록 번호 조회 (AsyncWeb3, RPC 세션도 함께 생성)
+
+    확인 주기 안에 실제 RPC 호출이 성공했다면 추가 호출 없이 정상으로 봅니다.
+    """
+    blockchain = await asyncio.to_thread(resources.blockchain)
+    if blockchain.is_connected_recently(health_monitor.interval):
+        return
+    await blockchain.get_block_number()
+
+
+def check_firebase():
+    """ID 토큰 검증용 공개키 조회 (토큰 검증기의 공개키 캐시를 미리 채움)"""
+    from app.auth import prefetch_signing_keys
+    prefetch_signing_keys()
+
+
+DEFAULT_CHECKS: Dict[str, Callable[[], None]] = {
+    "gemini": check_gemini,
+    "supabase": check_supabase,
+    "blockchain": check_blockchain,
+    "firebase": check_firebase,
+}
+
+
+class HealthMonitor:
+    """의존성 상태를 주기적으로 확인하고 결과를 캐시"""
+
+    def __init__(
+        self,
+        checks: Dict[str, Callable[[], None]],
+        interval: float = 30.0,
+        timeout: float = 5.0,
+    ):
+        self.checks = checks
+        self.interval = interval
+        self.timeout = timeout
+        self.statuses: Dict[str, DependencyStatus] = {name: DependencyStatus() for name in checks}
+        # 한 번이라도 정상 확인된(연결이 데워진) 의존성
+        self._warmed = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """모든 의존성이 한 번 이상 정상 확인됨
+
+        warm-up 이후의 일시적인 외부 장애로는 not ready 가 되지 않습니다.
+        (모든 워커가 동시에 트래픽에서 빠지는 것 방지, 현재 상태는 degraded 로 노출)
+        """
+        return self._warmed >= set(self.checks)
+
+    @property
+    def degraded(self) -> bool:
+        """마지막 확인에서 실패한 의존성이 있음"""
+        return not all(status.healthy for status in self.statuses.values())
+
+    def snapshot(self) -> dict:
+        return {
+            "ready": self.ready,
+            "degraded": self.degraded,
+            "dependencies": {
+                name: status.to_dict() for name, status in self.statuses.items()
+            },
+        }
+
+    async def _check(self, name: str):
+        start = time.perf_counter()
+        try:
+            check = self.checks[name]
+            if asyncio.iscoroutinefunction(check):
+                await asyncio.wait_for(check(), timeout=self.timeout)
+            else:
+                await asyncio.wait_for(asyncio.to_thread(check), timeout=self.timeout)
+            status, error = STATUS_OK, None
+        except DependencyDisabled as e:
+            status, error = STATUS_DISABLED, str(e)
+        except asyncio.TimeoutError:
+            status, error = STATUS_ERROR, f"timeout after {self.timeout}s"
+        except Exception as e:
+            status, error = STATUS_ERROR, f"{type(e).__name__}: {e}"
+        latency = time.perf_counter() - start
+
+        previous = self.statuses[name].status
+        self.statuses[name] = DependencyStatus(
+            status=status,
+            latency_ms=round(latency * 1000, 2),
+            checked_at=time.time(),
+            error=error,
+        )
+        if self.statuses[name].healthy:
+            self._warmed.add(name)
+        _dependency_up.set(1 if self.statuses[name].healthy else 0, dependency=name)
+        _check_latency.set(round(latency, 4), dependency=name)
+        if status != previous:
+            print(f"[Health] {name}: {previous} -> {status}" + (f" ({error})" if error else ""))
+
+    async def check_all(self):
+        """모든 의존성을 병렬로 확인"""
+        await asyncio.gather(*(self._check(name) for name in self.checks))
+
+    async def _run(self, after: Optional[asyncio.Task]):
+        # 리소스 warm-up 이 끝난 뒤 첫 확인 (클라이언트 생성과 중복되지 않도록)
+        if after is not None:
+            try:
+                await after
+            except Exception:
+                pass
+        while True:
+            await self.check_all()
+            # ready 전에는 짧은 간격으로 재시도
+            await asyncio.sleep(self.interval if self.ready else min(self.interval, 2.0))
+
+    def start(self, after: Optional[asyncio.Task] = None):
+        """백그라운드 확인 루프 시작 (lifespan)"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(after))
+        return self._task
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+
+
+def _checks_from_env() -> Dict[str, Callable[[], None]]:
+    value = os.getenv("READINESS_DEPENDENCIES", ",".join(DEFAULT_CHECKS))
+    wanted = {v.strip() for v in value.split(",") if v.strip()}
+    return {name: check for name, check in DEFAULT_CHECKS.items() if name in wanted}
+
+
+# 프로세스 전역 모니터 (워커별)
+health_monitor = HealthMonitor(
+    _checks_from_env(),
+    interval=float(os.getenv("HEALTH_CHECK_INTERVAL", "30")),
+    timeout=float(os.getenv("HEALTH_CHECK_TIMEOUT", "5")),
+)
@@ -11,17 +11,14 @@
 import time
 import traceback
 import logging
+from contextlib import asynccontextmanager
 from typing import Optional
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from starlette.datastructures import UploadFile as StarletteUploadFile
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 import os
 
-from app.config import client
 from app.models import ProcessResult
 from app.prompts import (
     get_prompt_by_type,
@@ -40,14 +37,19 @@ from app.utils import encode_image_to_base64, extract_image_from_response
 import base64
 from app.gemini_client import call_gemini_api
 from app.certificate.router import router as certificate_router
+from app.auth import optional_firebase_user, signing_key_refresher
+from app.rate_limit import limiter
+from app.admission import resolve_priority
+from app.metrics import registry as metrics_registry
+from app.resources import resources
+from app.health import health_monitor
+from app.certificate.rpc import begin_request_budget, end_request_budget, request_rpc_calls
+from app.certificate.db import begin_request_queries, end_request_queries, request_queries
 
 # 로깅 설정
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Rate Limiter 설정 (API 남용 방지)
-limiter = Limiter(key_func=get_remote_address)
-
 # CORS 허용 도메인 목록 (보안)
 ALLOWED_ORIGINS = [
     "https://ocean-seal.shop",
@@ -63,16 +65,29 @@ if os.getenv("ENV", "production") == "development":
         "http://localhost:19006",  # Expo web
     ])
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """워커 시작/종료 시 외부 클라이언트 초기화/정리"""
+    # import 시점이 아니라 여기서 병렬로 초기화 (백그라운드, 요청 수신은 바로 시작)
+    warm_up_task = resources.start_warm_up()
+    # warm-up 후 의존성 연결 확인 (/readyz)
+    health_monitor.start(after=warm_up_task)
+    # Firebase 공개키 만료 전 갱신
+    signing_key_refresher.start()
+    yield
+    await signing_key_refresher.close()
+    await health_monitor.close()
+    await resources.close()
+
+
 app = FastAPI(
     title="당근 부스터 API",
     description="중고거래 프리미엄 포토 서비스 - AI 기반 이미지 변환",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Rate Limiter 등록
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # 전역 예외 핸들러
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -109,9 +124,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "Accept"],
-    expose_headers=["Content-Length"],
+    expose_headers=["Content-Length", "X-RPC-Calls", "X-DB-Queries"],
 )
 
+
+@app.middleware("http")
+async def count_rpc_calls(request: Request, call_next):
+    """인증서 API 요청별 Polygon RPC 호출 수 / Supabase 쿼리 수 (X-RPC-Calls, X-DB-Queries 헤더 + /metrics)"""
+    if not request.url.path.startswith("/api/certificate"):
+        return await call_next(request)
+    token = begin_request_budget()
+    query_token = begin_request_queries()
+    try:
+        response = await call_next(request)
+    finally:
+        calls = end_request_budget(token)
+        queries = end_request_queries(query_token)
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    request_rpc_calls.observe(calls, route=route)
+    request_queries.observe(queries, route=route)
+    response.headers["X-RPC-Calls"] = str(calls)
+    response.headers["X-DB-Queries"] = str(queries)
+    return response
+
 # 인증서 라우터 등록
 app.include_router(certificate_router)
 
@@ -133,6 +168,21 @@ async def root():
     }
 
 
+@app.get("/healthz")
+async def healthz():
+    """생존 확인 (외부 의존성 확인 없음)"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """트래픽 수신 가능 여부 (의존성 연결 warm-up 완료 후 200, 캐시된 상태 반환)"""
+    return JSONResponse(
+        status_code=200 if health_monitor.ready else 503,
+        content=health_monitor.snapshot()
+    )
+
+
 @app.post("/api/process", response_model=ProcessResult)
 @limiter.limit("10/minute")  # 분당 10회 제한
 async def process_image(
@@ -143,7 +193,8 @@ async def process_image(
     mask_x: Optional[int] = Form(None),
     mask_y: Optional[int] = Form(None),
     mask_width: Optional[int] = Form(None),
-    mask_height: Optional[int] = Form(None)
+    mask_height: Optional[int] = Form(None),
+    user_id: Optional[str] = Depends(optional_firebase_user)
 ):
     """
     이미지 처리 API
@@ -257,7 +308,8 @@ async def process_image(
             image_base64=image_base64,
             prompt=prompt,
             mime_type=file.content_type,
-            reference_images=reference_images_base64 if reference_images_base64 else None
+            reference_images=reference_images_base64 if reference_images_base64 else None,
+            priority=resolve_priority(request)
         )
         
         # 결과 이미지 추출
@@ -339,7 +391,8 @@ async def create_poster_thumbnail(
     request: Request,
     file: UploadFile = File(...),
     style: Optional[str] = Form("minimal"),
-    background_color: Optional[str] = Form("#F8F8F8")
+    background_color: Optional[str] = Form("#F8F8F8"),
+    user_id: Optional[str] = Depends(optional_firebase_user)
 ):
     """
     포스터형 썸네일 생성 (전용 엔드포인트)
@@ -416,7 +469,8 @@ async def create_poster_thumbnail(
             image_base64=image_base64,
             prompt=prompt,
             mime_type=file.content_type,
-            reference_images=reference_images_base64 if reference_images_base64 else None
+            reference_images=reference_images_base64 if reference_images_base64 else None,
+            priority=resolve_priority(request)
         )
 
         # 결과 이미지 추출
@@ -438,6 +492,8 @@ async def create_poster_thumbnail(
                 process_type="poster",
                 processing_time_ms=0
             )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[POSTER API] 처리 중 오류: {e}", flush=True)
         return ProcessResult(
@@ -457,7 +513,8 @@ async def enhance_serial_area(
     x: Optional[int] = Form(None),
     y: Optional[int] = Form(None),
     width: Optional[int] = Form(None),
-    height: Optional[int] = Form(None)
+    height: Optional[int] = Form(None),
+    user_id: Optional[str] = Depends(optional_firebase_user)
 ):
     """
     민감 정보 자동 감지 및 제거 (전용 엔드포인트)
@@ -473,7 +530,8 @@ async def enhance_serial_area(
         mask_x=x,
         mask_y=y,
         mask_width=width,
-        mask_height=height
+        mask_height=height,
+        user_id=user_id
     )
 
 
@@ -486,7 +544,8 @@ async def highlight_defect(
     y: Optional[int] = Form(None),
     width: Optional[int] = Form(None),
     height: Optional[int] = Form(None),
-    defect_description: Optional[str] = Form(None)
+    defect_description: Optional[str] = Form(None),
+    user_id: Optional[str] = Depends(optional_firebase_user)
 ):
     """
     하자 자동 감지 및 강조 (전용 엔드포인트)
@@ -509,7 +568,8 @@ async def highlight_defect(
         mask_x=x,
         mask_y=y,
         mask_width=width,
-        mask_height=height
+        mask_height=height,
+        user_id=user_id
     )
 
 
@@ -520,4 +580,10 @@ async def get_prompts():
         "poster": POSTER_THUMBNAIL_PROMPT,
         "serial": SERIAL_ENHANCEMENT_PROMPT,
         "defect": DEFECT_HIGHLIGHT_PROMPT
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """워커 메트릭 (Prometheus 텍스트 포맷) - Gemini 큐 길이/대기 시간 등"""
+    return metrics_registry.render()
@@ -0,0 +1,147 @@
+"""
+프로세스 내부 메트릭 레지스트리
+
+오토스케일링/모니터링용 지표를 Prometheus 텍스트 포맷으로 노출합니다. (/metrics)
+워커별 값이므로 모든 샘플에 워커 pid 라벨을 붙이고, 수집 측에서 pid 라벨로 구분 / 합산합니다.
+"""
+import os
+import abc
+import threading
+from typing import Dict, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    items = list(key) + sorted((extra or {}).items())
+    if not items:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in items)
+    return "{" + body + "}"
+
+
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def render(self, worker: Dict[str, str]) -> List[str]:
+        """샘플 줄 목록 (worker: 모든 샘플에 붙일 라벨)"""
+
+
+class Gauge(_Metric):
+    """현재 값 (큐 길이, 동시 실행 수 등)"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def render(self, worker: Dict[str, str]) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(k, worker)} {v}" for k, v in self._values.items()]
+
+
+class Counter(Gauge):
+    """누적 카운터"""
+    kind = "counter"
+
+
+class Histogram(_Metric):
+    """분포 (대기 시간, 지연 시간 등)"""
+    kind = "histogram"
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [버킷별 카운트..., 합계, 개수]
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self, worker: Dict[str, str]) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, series in self._series.items():
+                for i, bound in enumerate(self.buckets):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, {**worker, 'le': str(bound)})} {series[i]}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, {**worker, 'le': '+Inf'})} {series[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(key, worker)} {series[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(key, worker)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    """메트릭 레지스트리"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register(Gauge(name, help_text))
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = Histogram.DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 포맷 (모든 샘플에 pid 라벨, fork 후 워커마다 다름)"""
+        worker = {"pid": str(os.getpid())}
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render(worker))
+        return "\n".join(lines) + "\n"
+
+
+# 전역 레지스트리
+registry = Registry()
@@ -0,0 +1,233 @@
+"""
+워커 간 공유 레이트 리미터 (토큰 버킷)
+
+uvicorn --workers N 으로 띄우면 워커마다 메모리가 분리되어
+프로세스 내부 리미터로는 실제 허용량이 N배가 됩니다.
+이 모듈은 공유 메모리 파일(mmap)에 토큰 버킷을 두고 파일 락으로 동기화하여
+모든 워커가 같은 버킷을 사용하도록 합니다.
+
+- 키: Firebase UID (인증된 요청) / 클라이언트 IP (그 외)
+- 버킷 테이블: 고정 크기 해시 테이블 (선형 탐사, 오래된 슬롯부터 재사용)
+- 체크 비용: 락 1회 + struct 읽기/쓰기 (수 마이크로초)
+"""
+import os
+import math
+import mmap
+import time
+import struct
+import hashlib
+import tempfile
+import threading
+import functools
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+try:
+    import fcntl
+except ImportError:  # Windows: 워커 간 공유 없이 프로세스 내부에서만 동작
+    fcntl = None
+
+
+_UNITS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+# 헤더: magic(8) + version(4) + slot 수(4)
+_HEADER = struct.Struct("<8sII")
+_MAGIC = b"OSRLTB01"
+_VERSION = 1
+# 슬롯: 키 해시(uint64) + 남은 토큰(float64) + 마지막 갱신 시각(float64)
+_SLOT = struct.Struct("<Qdd")
+# 한 키당 최대 탐사 슬롯 수
+_MAX_PROBES = 8
+
+
+def parse_limit(limit_value: str) -> Tuple[int, float]:
+    """'10/minute' 형식을 (버킷 용량, 초당 충전량)으로 변환"""
+    amount, _, unit = limit_value.partition("/")
+    unit = unit.strip().lower().rstrip("s")
+    if unit not in _UNITS:
+        raise ValueError(f"지원하지 않는 레이트 리밋 단위: {limit_value}")
+    capacity = int(amount)
+    return capacity, capacity / _UNITS[unit]
+
+
+def _default_shm_path() -> str:
+    """공유 메모리 파일 경로 (Linux는 /dev/shm 사용)"""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "oceanseal-ratelimit")
+
+
+class SharedTokenBucketStore:
+    """mmap 공유 메모리에 저장되는 토큰 버킷 테이블"""
+
+    def __init__(self, path: Optional[str] = None, slots: int = 65536):
+        self.path = path or _default_shm_path()
+        self.slots = slots
+        self.size = _HEADER.size + slots * _SLOT.size
+        self._thread_lock = threading.Lock()
+
+        if fcntl is None:
+            # 공유 불가 환경: 익명 메모리 사용
+            self._fd = None
+            self._mm = mmap.mmap(-1, self.size)
+            self._init_header()
+            return
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < self.size:
+                os.ftruncate(self._fd, self.size)
+            self._mm = mmap.mmap(self._fd, self.size)
+            magic, version, slots_in_file = _HEADER.unpack_from(self._mm, 0)
+            if magic != _MAGIC or version != _VERSION or slots_in_file != slots:
+                # 처음 생성했거나 레이아웃이 바뀐 경우 초기화
+                self._init_header()
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _init_header(self):
+        self._mm[:self.size] = bytes(self.size)
+        _HEADER.pack_into(self._mm, 0, _MAGIC, _VERSION, self.slots)
+
+    def _lock(self):
+        self._thread_lock.acquire()
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def _unlock(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    @staticmethod
+    def _hash_key(key: str) -> int:
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        # 0은 빈 슬롯 표시용이므로 사용하지 않음
+        return int.from_bytes(digest, "little") or 1
+
+    def take(self, key: str, capacity: int, rate: float) -> Tuple[bool, float]:
+        """토큰 1개 소비 시도
+
+        Returns:
+            (허용 여부, 재시도까지 남은 초)
+        """
+        key_hash = self._hash_key(key)
+        start = key_hash % self.slots
+        now = time.time()
+
+        self._lock()
+        try:
+            target = None
+            oldest_offset, oldest_updated = None, math.inf
+            for probe in range(_MAX_PROBES):
+                offset = _HEADER.size + ((start + probe) % self.slots) * _SLOT.size
+                slot_hash, tokens, updated = _SLOT.unpack_from(self._mm, offset)
+                if slot_hash == key_hash:
+                    target = (offset, tokens, updated)
+                    break
+                if slot_hash == 0:
+                    target = (offset, float(capacity), now)
+                    break
+                if updated < oldest_updated:
+                    oldest_offset, oldest_updated = offset, updated
+
+            if target is None:
+                # 탐사 범위가 가득 차면 가장 오래 사용되지 않은 버킷을 재사용
+                target = (oldest_offset, float(capacity), now)
+
+            offset, tokens, updated = target
+            tokens = min(float(capacity), tokens + max(0.0, now - updated) * rate)
+            if tokens >= 1.0:
+                _SLOT.pack_into(self._mm, offset, key_hash, tokens - 1.0, now)
+                return True, 0.0
+            _SLOT.pack_into(self._mm, offset, key_hash, tokens, now)
+            return False, (1.0 - tokens) / rate
+        finally:
+            self._unlock()
+
+
+def get_rate_limit_key(request: Request) -> str:
+    """레이트 리밋 키: 검증된 Firebase UID가 있으면 UID, 없으면 클라이언트 IP"""
+    user_id = getattr(request.state, "user_id", None)
+    if user_id:
+        return f"uid:{user_id}"
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+class Limiter:
+    """엔드포인트 데코레이터 방식의 레이트 리미터
+
+    사용법:
+        @router.post("/path")
+        @limiter.limit("10/minute")
+        async def endpoint(request: Request, ...):
+
+    FastAPI 의존성(verify_firebase_token 등)이 먼저 실행되므로
+    키 계산 시점에는 request.state.user_id 가 채워져 있습니다.
+    """
+
+    def __init__(
+        self,
+        key_func: Callable[[Request], str] = get_rate_limit_key,
+        store: Optional[SharedTokenBucketStore] = None,
+        enabled: bool = True,
+    ):
+        self.key_func = key_func
+        self.enabled = enabled
+        self._store = store
+
+    @property
+    def store(self) -> SharedTokenBucketStore:
+        if self._store is None:
+            self._store = SharedTokenBucketStore(
+                path=os.getenv("RATE_LIMIT_SHM_PATH") or None,
+                slots=int(os.getenv("RATE_LIMIT_SLOTS", "65536")),
+            )
+        return self._store
+
+    def check(self, request: Request, scope: str, limit_value: str, capacity: int, rate: float):
+        """한도를 초과하면 429 + Retry-After 를 반환"""
+        key = f"{scope}|{self.key_func(request)}"
+        allowed, retry_after = self.store.take(key, capacity, rate)
+        if not allowed:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded: {limit_value}",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+    def limit(self, limit_value: str):
+        capacity, rate = parse_limit(limit_value)
+
+        def decorator(func):
+            scope = f"{func.__module__}.{func.__name__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request = kwargs.get("request")
+                if request is None:
+                    request = next((a for a in args if isinstance(a, Request)), None)
+                # /api/serial -> process_image 처럼 내부 호출되는 경우 한 번만 차감
+                if (
+                    self.enabled
+                    and request is not None
+                    and not getattr(request.state, "rate_limit_checked", False)
+                ):
+                    request.state.rate_limit_checked = True
+                    self.check(request, scope, limit_value, capacity, rate)
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+# 모든 라우터가 공유하는 인스턴스
+limiter = Limiter()
@@ -0,0 +1,221 @@
+"""
+외부 클라이언트 리소스 컨테이너
+
+Gemini / Firebase / Web3 / Supabase 클라이언트를 import 시점이 아니라
+처음 필요할 때 한 번만 생성합니다. (지연 초기화)
+
+- FastAPI lifespan 에서 warm_up() 으로 모든 리소스를 병렬 초기화 (백그라운드)
+- 요청이 warm-up 보다 먼저 오면 해당 리소스만 즉시 초기화
+- 엔드포인트는 get_certificate_service 등 의존성 함수로 주입받음
+"""
+import os
+import time
+import asyncio
+import threading
+from typing import Dict, Optional
+
+from app import config
+
+_UNSET = object()
+
+# PRELOAD_SUBSYSTEMS 값 -> 리소스 이름
+_SUBSYSTEMS = {
+    "gemini": "gemini_client",
+    "firebase": "firebase_app",
+    "supabase": "supabase",
+    "blockchain": "blockchain",
+}
+
+
+class Resources:
+    """지연 초기화되는 외부 클라이언트 모음 (프로세스당 하나)"""
+
+    # 리소스 이름 -> 생성 메서드 이름
+    _FACTORIES = {
+        "gemini_client": "_create_gemini_client",
+        "firebase_app": "_create_firebase_app",
+        "supabase": "_create_supabase",
+        "blockchain": "_create_blockchain",
+        "certificate_service": "_create_certificate_service",
+    }
+
+    def __init__(self):
+        self._values: Dict[str, object] = {name: _UNSET for name in self._FACTORIES}
+        self._locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in self._FACTORIES}
+        # 리소스별 초기화 소요 시간 (ms) - 시작 프로파일용
+        self.init_timings_ms: Dict[str, float] = {}
+        self.warm_up_ms: Optional[float] = None
+        self._warm_up_task: Optional[asyncio.Task] = None
+
+    # ============ 지연 초기화 ============
+
+    def _get(self, name: str):
+        value = self._values[name]
+        if value is not _UNSET:
+            return value
+        with self._locks[name]:
+            value = self._values[name]
+            if value is _UNSET:
+                start = time.perf_counter()
+                value = getattr(self, self._FACTORIES[name])()
+                self.init_timings_ms[name] = round((time.perf_counter() - start) * 1000, 2)
+                self._values[name] = value
+        return value
+
+    def override(self, name: str, value):
+        """리소스 교체 (벤치마크/로컬 테스트용)"""
+        if name not in self._FACTORIES:
+            raise KeyError(name)
+        self._values[name] = value
+
+    def is_initialized(self, name: str) -> bool:
+        return self._values[name] is not _UNSET
+
+    def gemini_client(self):
+        """Gemini 클라이언트 (API 키 없으면 None)"""
+        return self._get("gemini_client")
+
+    def firebase_app(self):
+        """Firebase Admin 앱"""
+        return self._get("firebase_app")
+
+    def supabase(self):
+        """Supabase 클라이언트 (설정 없으면 None)"""
+        return self._get("supabase")
+
+    def blockchain(self):
+        """BlockchainService 인스턴스"""
+        return self._get("blockchain")
+
+    def certificate_service(self):
+        """CertificateService 인스턴스"""
+        return self._get("certificate_service")
+
+    # ============ 생성 함수 ============
+
+    def _create_gemini_client(self):
+        return config.create_gemini_client()
+
+    def _create_firebase_app(self):
+        import firebase_admin
+        from firebase_admin import credentials
+
+        if firebase_admin._apps:
+            return firebase_admin.get_app()
+
+        # 서비스 계정 JSON 경로 (환경변수 또는 기본 경로)
+        service_account_path = os.getenv(
+            "FIREBASE_SERVICE_ACCOUNT_PATH",
+            "/app/ocean-seal-firebase-adminsdk-fbsvc-7e063c46ae.json"
+        )
+        if os.path.exists(service_account_path):
+            cred = credentials.Certificate(service_account_path)
+            return firebase_admin.initialize_app(cred)
+
+        # 서비스 계정 파일 없으면 인증 비활성화
+        print("[WARNING] Firebase service account not found. Auth disabled.")
+        return firebase_admin.initialize_app()
+
+    def _create_supabase(self):
+        supabase_url = os.getenv("SUPABASE_URL")
+        supabase_key = os.getenv("SUPABASE_SERVICE_KEY")  # 서비스 키 사용
+        if not (supabase_url and supabase_key):
+            return None
+
+        # 비동기 클라이언트 + 워커당 공유 커넥션 풀 (app.certificate.db)
+        from app.certificate.db import create_client
+        return create_client(supabase_url, supabase_key)
+
+    def _create_blockchain(self):
+        from app.certificate.blockchain import BlockchainService
+        return BlockchainService()
+
+    def _create_certificate_service(self):
+        from app.certificate.service import CertificateService
+        return CertificateService(supabase=self.supabase(), blockchain=self.blockchain())
+
+    # ============ lifespan ============
+
+    @staticmethod
+    def _preload_targets():
+        """warm-up 대상 리소스 (PRELOAD_SUBSYSTEMS 환경변수)
+
+        이미지 API만 서비스하는 프로세스는 PRELOAD_SUBSYSTEMS=gemini 처럼 지정하면
+        web3 / firebase_admin / supabase 를 실제로 쓰기 전까지 로드하지 않습니다.
+        """
+        value = os.getenv("PRELOAD_SUBSYSTEMS", "gemini,firebase,supabase,blockchain")
+        wanted = {v.strip() for v in value.split(",") if v.strip()}
+        return [name for key, name in _SUBSYSTEMS.items() if key in wanted]
+
+    async def _warm_up(self):
+        start = time.perf_counter()
+        # 서로 독립적인 리소스는 스레드에서 병렬로 초기화
+        independent = self._preload_targets()
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._get, name) for name in independent),
+            return_exceptions=True
+        )
+        for name, result in zip(independent, results):
+            if isinstance(result, Exception):
+                print(f"[초기화] {name} 초기화 실패: {result}")
+        if self.is_initialized("blockchain") and self._values["blockchain"].indexer is not None:
+            # Issued 이벤트 인덱싱 (워커 중 하나만 실제로 인덱싱)
+            self._values["blockchain"].indexer.start()
+        if {"supabase", "blockchain"} <= set(independent):
+            try:
+                # 이전 프로세스가 끝내지 못한 PENDING 인증서 / 온체인 취소 재처리
+                await self.certificate_service().confirmer.recover_pending()
+                await self.certificate_service().revocations.recover_pending()
+            except Exception as e:
+                print(f"[초기화] certificate_service 초기화 실패: {e}")
+        self.warm_up_ms = round((time.perf_counter() - start) * 1000, 2)
+        print(f"[초기화] 리소스 warm-up 완료: {self.warm_up_ms}ms {self.init_timings_ms}")
+
+    def start_warm_up(self):
+        """백그라운드 warm-up 시작 (서버는 바로 요청을 받기 시작함)"""
+        if self._warm_up_task is None:
+            self._warm_up_task = asyncio.get_running_loop().create_task(self._warm_up())
+        return self._warm_up_task
+
+    async def close(self):
+        """종료 시 정리"""
+        if self._warm_up_task is not None and not self._warm_up_task.done():
+            self._warm_up_task.cancel()
+            try:
+                await self._warm_up_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        # 온체인 기록 대기 작업 정리 (RPC 세션보다 먼저)
+        if self.is_initialized("certificate_service"):
+            try:
+                await self._values["certificate_service"].confirmer.close()
+            except Exception as e:
+                print(f"[종료] certificate confirmer 정리 실패: {e}")
+            try:
+                await self._values["certificate_service"].revocations.close()
+            except Exception as e:
+                print(f"[종료] 온체인 취소 큐 정리 실패: {e}")
+        # Polygon RPC HTTP 세션 정리
+        if self.is_initialized("blockchain"):
+            try:
+                await self._values["blockchain"].close()
+            except Exception as e:
+                print(f"[종료] blockchain 세션 정리 실패: {e}")
+        # Supabase HTTP 커넥션 풀 정리
+        if self.is_initialized("supabase") and self._values["supabase"] is not None:
+            try:
+                from app.certificate.db import close_client
+                await close_client(self._values["supabase"])
+            except Exception as e:
+                print(f"[종료] supabase 커넥션 정리 실패: {e}")
+
+
+# 프로세스 전역 컨테이너
+resources = Resources()
+
+
+# ============ FastAPI 의존성 ============
+
+def get_certificate_service():
+    """CertificateService 의존성"""
+    return resources.certificate_service()
@@ -0,0 +1,34 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+/**
+ * @title OceanSealCert
+ * @dev 서버(app/certificate/blockchain.py)가 사용하는 배포 컨트랙트 (scripts/deploy_final.py 로 배포)
+ *
+ * - issue(certId): certId 의 기록 시각 저장 (관리자만)
+ * - verify(certId): 기록 시각 반환 (없으면 0)
+ *
+ * CERTIFICATE_ANCHOR_MODE=merkle 이면 certId 자리에 여러 인증서를 묶은 Merkle 루트를 기록하고,
+ * 개별 인증서는 DB 에 저장된 포함 증명으로 루트를 재계산하여 검증합니다.
+ */
+contract OceanSealCert {
+    address public admin;
+    mapping(bytes32 => uint256) public certificates;
+
+    event Issued(bytes32 indexed certId, uint256 timestamp);
+
+    constructor() {
+        admin = msg.sender;
+    }
+
+    function issue(bytes32 certId) external returns (uint256) {
+        require(msg.sender == admin, "Not admin");
+        certificates[certId] = block.timestamp;
+        emit Issued(certId, block.timestamp);
+        return block.timestamp;
+    }
+
+    function verify(bytes32 certId) external view returns (uint256) {
+        return certificates[certId];
+    }
+}
@@ -0,0 +1,97 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+/**
+ * @title OceanSealCertV2
+ * @dev OceanSealCert 의 가스 최적화 버전 + 온체인 취소
+ *
+ * 서버(app/certificate/blockchain.py)가 쓰는 ABI (issue / verify / certificates / Issued) 를 그대로 유지하므로
+ * 배포 후 CERTIFICATE_CONTRACT_ADDRESS 만 바꾸면 됩니다.
+ *
+ * - 기록 / 취소 시각: bytes32 => (uint64 issuedAt, uint64 revokedAt) 한 슬롯에 패킹
+ * - admin: immutable (발급마다 storage 읽기 없음)
+ * - 인증서 유형 / 사용자 등 메타데이터는 저장하지 않음 (DB 와 Issued 이벤트로 충분)
+ * - issueMany: 여러 인증서를 트랜잭션 하나로 기록 (기본 트랜잭션 비용 21000 가스를 나눠 부담)
+ * - 이미 기록된 ID 는 덮어쓰지 않음: 재전송 / 재처리되어도 처음 기록 시각 유지
+ *   (서버의 검증 캐시와 이벤트 인덱스는 기록 시각이 바뀌지 않는다고 가정)
+ * - revokeMany: 취소를 모아 한 트랜잭션으로 기록 (CERTIFICATE_REVOCATION_MODE=onchain)
+ *   발급 기록이 있으면 같은 슬롯 갱신이라 새 슬롯보다 저렴하고, 한 번 취소되면 되돌릴 수 없음
+ *   Merkle 배치로 발급된 인증서도 루트가 아닌 인증서 ID 로 취소
+ *
+ * 가스 비교: python scripts/benchmark_gas.py
+ */
+contract OceanSealCertV2 {
+    struct Record {
+        uint64 issuedAt;
+        uint64 revokedAt;
+    }
+
+    address public immutable admin;
+    mapping(bytes32 => Record) private records;
+
+    event Issued(bytes32 indexed certId, uint256 timestamp);
+    event Revoked(bytes32 indexed certId, uint256 timestamp);
+
+    error NotAdmin();
+
+    modifier onlyAdmin() {
+        if (msg.sender != admin) revert NotAdmin();
+        _;
+    }
+
+    constructor() {
+        admin = msg.sender;
+    }
+
+    function issue(bytes32 certId) external onlyAdmin returns (uint256) {
+        return _issue(certId, uint64(block.timestamp));
+    }
+
+    function issueMany(bytes32[] calldata certIds) external onlyAdmin {
+        uint64 timestamp = uint64(block.timestamp);
+        uint256 count = certIds.length;
+        for (uint256 i; i < count; ) {
+            _issue(certIds[i], timestamp);
+            unchecked { ++i; }
+        }
+    }
+
+    function revokeMany(bytes32[] calldata certIds) external onlyAdmin {
+        uint64 timestamp = uint64(block.timestamp);
+        uint256 count = certIds.length;
+        for (uint256 i; i < count; ) {
+            Record storage record = records[certIds[i]];
+            if (record.revokedAt == 0) {
+                record.revokedAt = timestamp;
+                emit Revoked(certIds[i], timestamp);
+            }
+            unchecked { ++i; }
+        }
+    }
+
+    /// @dev 발급 시각 (취소 여부와 무관, 없으면 0)
+    function verify(bytes32 certId) external view returns (uint256) {
+        return records[certId].issuedAt;
+    }
+
+    /// @dev 취소 시각 (취소되지 않았으면 0)
+    function revokedAt(bytes32 certId) external view returns (uint256) {
+        return records[certId].revokedAt;
+    }
+
+    /// @dev OceanSealCert 의 public mapping getter 호환
+    function certificates(bytes32 certId) external view returns (uint256) {
+        return records[certId].issuedAt;
+    }
+
+    function _issue(bytes32 certId, uint64 timestamp) private returns (uint256) {
+        Record storage record = records[certId];
+        uint64 existing = record.issuedAt;
+        if (existing != 0) {
+            return existing;
+        }
+        record.issuedAt = timestamp;
+        emit Issued(certId, timestamp);
+        return timestamp;
+    }
+}
@@ -51,6 +51,9 @@ export default function MyCertificatesScreen({ navigation }) {
   const [certificates, setCertificates] = useState([]);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
+  const [totalCount, setTotalCount] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const loadCertificates = useCallback(async () => {
     try {
@@ -59,6 +62,8 @@ export default function MyCertificatesScreen({ navigation }) {
       console.log('인증서 목록 조회 결과:', JSON.stringify(result, null, 2));
       if (result.success) {
         setCertificates(result.certificates);
+        setTotalCount(result.totalCount);
+        setNextCursor(result.nextCursor);
       } else {
         console.error('인증서 목록 조회 실패:', result.error);
       }
@@ -76,6 +81,24 @@ export default function MyCertificatesScreen({ navigation }) {
     initLoad();
   }, [loadCertificates]);
 
+  // 다음 페이지 (목록 끝에 도달 시)
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const result = await getUserCertificates(nextCursor);
+      if (result.success) {
+        setCertificates((prev) => [...prev, ...result.certificates]);
+        setTotalCount(result.totalCount);
+        setNextCursor(result.nextCursor);
+      }
+    } catch (error) {
+      console.error('인증서 목록 추가 로드 에러:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const onRefresh = async () => {
     setRefreshing(true);
     await loadCertificates();
@@ -188,7 +211,7 @@ export default function MyCertificatesScreen({ navigation }) {
         </TouchableOpacity>
         <Text style={styles.headerTitle}>내 인증서</Text>
         <View style={styles.headerRight}>
-          <Text style={styles.countBadge}>{certificates.length}</Text>
+          <Text style={styles.countBadge}>{totalCount}</Text>
         </View>
       </View>
 
@@ -213,6 +236,9 @@ export default function MyCertificatesScreen({ navigation }) {
             <RefreshControl refreshing={refreshing} onRefresh={onRefresh} />
           }
           showsVerticalScrollIndicator={false}
+          onEndReached={loadMore}
+          onEndReachedThreshold={0.5}
+          ListFooterComponent={loadingMore ? <ActivityIndicator style={styles.footerLoader} /> : null}
         />
       )}
     </SafeAreaView>
@@ -224,6 +250,9 @@ const styles = StyleSheet.create({
     flex: 1,
     backgroundColor: COLORS.background,
   },
+  footerLoader: {
+    paddingVertical: 16,
+  },
   loadingContainer: {
     flex: 1,
     justifyContent: 'center',
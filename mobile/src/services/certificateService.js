@@ -106,10 +106,11 @@ export const verifyCertificate = async (certId) => {
 };
 
 /**
- * 사용자의 인증서 목록 조회
- * @returns {Promise<{success: boolean, certificates?: array, error?: string}>}
+ * 사용자의 인증서 목록 조회 (최신순 한 페이지)
+ * @param {string|null} cursor - 이전 페이지의 nextCursor (첫 페이지는 null)
+ * @returns {Promise<{success: boolean, certificates?: array, totalCount?: number, nextCursor?: string|null, error?: string}>}
  */
-export const getUserCertificates = async () => {
+export const getUserCertificates = async (cursor = null) => {
   try {
     const user = await getCurrentUser();
     console.log('getUserCertificates - user:', user);
@@ -124,7 +125,8 @@ export const getUserCertificates = async () => {
       return { success: false, error: '인증 토큰을 가져올 수 없습니다.', certificates: [] };
     }
 
-    const url = `${API_URL}/api/certificate/user/${user.uid}`;
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+    const url = `${API_URL}/api/certificate/user/${user.uid}${query}`;
     console.log('getUserCertificates - API URL:', url);
 
     const response = await fetch(url, {
@@ -147,6 +149,7 @@ export const getUserCertificates = async () => {
       success: true,
       certificates: data.certificates || [],
       totalCount: data.total_count || 0,
+      nextCursor: data.next_cursor || null,
     };
   } catch (error) {
     console.error('인증서 목록 조회 에러:', error);
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+이미지 엔드포인트 처리량 벤치마크
+
+스텁 Gemini 백엔드(scripts/benchmark_stub.py)로 uvicorn을 띄운 뒤
+/api/process, /api/poster, /api/serial, /api/defect 에 실제와 비슷한
+multipart 요청(1~15MB 사진 + 레퍼런스 이미지)을 보내고,
+워커 수 x 동시 요청 수 조합별로 다음을 측정합니다.
+
+- 처리량 (req/s)
+- 지연시간 p50 / p95 / p99 (ms)
+- 워커별 최대 RSS (MB, Linux /proc 기준)
+
+결과는 JSON 파일로 저장되므로 릴리스 간 diff로 비교할 수 있습니다.
+
+사용법:
+    python scripts/benchmark_endpoints.py
+    python scripts/benchmark_endpoints.py --workers 1,2,4 --concurrency 1,8,32 \\
+        --sizes-mb 1,5,15 --references 2 --output bench_results/endpoints.json
+"""
+import os
+import sys
+import io
+import json
+import math
+import time
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+from PIL import Image
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCRIPTS_DIR = Path(__file__).parent
+
+ENDPOINTS = {
+    "process": ("/api/process", {"process_type": "poster"}),
+    "poster": ("/api/poster", {"style": "dramatic"}),
+    "serial": ("/api/serial", {}),
+    "defect": ("/api/defect", {"defect_description": "scratch"}),
+}
+
+# 노이즈 JPEG(q=95)의 대략적인 픽셀당 바이트 수 (목표 파일 크기 -> 해상도 계산용)
+_JPEG_BYTES_PER_PIXEL = 2.7
+
+
+def make_jpeg_payload(target_mb: float, seed: int = 0) -> bytes:
+    """목표 크기(MB)에 근접한 JPEG 생성 (압축이 잘 안 되는 노이즈 이미지)"""
+    random.seed(seed)
+    target_bytes = int(target_mb * 1024 * 1024)
+    pixels = target_bytes / _JPEG_BYTES_PER_PIXEL
+    width = int((pixels * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    image = Image.effect_noise((width, height), 80).convert("RGB")
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=95)
+    return output.getvalue()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """nearest-rank 방식 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _process_tree(root_pid: int) -> List[int]:
+    """root_pid 와 모든 자손 프로세스 PID (Linux /proc 기준)"""
+    children: Dict[int, List[int]] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # comm 필드에 공백/괄호가 있을 수 있으므로 마지막 ')' 이후를 파싱
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def _peak_rss_mb(pid: int) -> Optional[float]:
+    """프로세스의 최대 RSS (VmHWM)"""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def worker_peak_rss(server_pid: int, workers: int) -> List[float]:
+    """워커별 최대 RSS 목록 (MB)
+
+    workers > 1 이면 uvicorn 부모는 감독 프로세스일 뿐이므로 제외합니다.
+    """
+    if not Path("/proc").exists():
+        return []
+    pids = _process_tree(server_pid)
+    if workers > 1:
+        pids = [pid for pid in pids if pid != server_pid]
+    values = [_peak_rss_mb(pid) for pid in pids]
+    # 멀티프로세싱 리소스 트래커 같은 작은 보조 프로세스는 제외
+    return sorted((round(v, 1) for v in values if v and v > 30), reverse=True)
+
+
+class Server:
+    """스텁 앱을 띄운 uvicorn 서브프로세스"""
+
+    def __init__(self, workers: int, stub_latency_ms: int):
+        self.workers = workers
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        env = dict(os.environ)
+        env["BENCH_STUB_LATENCY_MS"] = str(stub_latency_ms)
+        env["PYTHONPATH"] = str(PROJECT_ROOT)
+        self.proc = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "benchmark_stub:app",
+                "--app-dir", str(SCRIPTS_DIR),
+                "--host", "127.0.0.1",
+                "--port", str(self.port),
+                "--workers", str(workers),
+                "--log-level", "warning",
+            ],
+            cwd=str(PROJECT_ROOT),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def wait_ready(self, timeout: float = 60.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError("uvicorn 서버가 시작 중 종료되었습니다.")
+            try:
+                if httpx.get(self.base_url + "/", timeout=1.0).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        raise TimeoutError("uvicorn 서버 준비 시간 초과")
+
+    def stop(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+async def run_level(
+    base_url: str,
+    endpoint: str,
+    concurrency: int,
+    total_requests: int,
+    photos: List[bytes],
+    references: List[bytes],
+) -> dict:
+    """한 조합(엔드포인트 x 동시성)을 실행하고 지표를 계산"""
+    path, form = ENDPOINTS[endpoint]
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total_requests))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300.0) as client:
+
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                photo = photos[i % len(photos)]
+                files = [("file", (f"photo_{i}.jpg", photo, "image/jpeg"))]
+                for j, ref in enumerate(references):
+                    files.append(("reference_files", (f"ref_{j}.jpg", ref, "image/jpeg")))
+                start = time.perf_counter()
+                try:
+                    response = await client.post(path, data=form, files=files)
+                    ok = response.status_code == 200 and response.json().get("success")
+                except (httpx.HTTPError, ValueError):
+                    ok = False
+                latencies.append((time.perf_counter() - start) * 1000)
+                if not ok:
+                    errors += 1
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "errors": errors,
+        "duration_s": round(wall, 3),
+        "throughput_rps": round(total_requests / wall, 3) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "max": round(latencies[-1], 1) if latencies else 0.0,
+        },
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=str(PROJECT_ROOT), text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _float_list(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이미지 엔드포인트 처리량 벤치마크")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="쉼표 구분 (process,poster,serial,defect)")
+    parser.add_argument("--workers", type=_int_list, default=[1, 2], help="uvicorn 워커 수 목록")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 4, 16], help="동시 요청 수 목록")
+    parser.add_argument("--requests", type=int, default=48, help="조합당 요청 수")
+    parser.add_argument("--sizes-mb", type=_float_list, default=[1, 5, 15], help="메인 사진 크기(MB) 목록")
+    parser.add_argument("--references", type=int, default=2, help="요청당 레퍼런스 이미지 수")
+    parser.add_argument("--reference-mb", type=float, default=1.0, help="레퍼런스 이미지 크기(MB)")
+    parser.add_argument("--stub-latency-ms", type=int, default=800, help="스텁 Gemini 응답 지연")
+    parser.add_argument("--output", default="bench_results/endpoints.json", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    endpoints = [e for e in args.endpoints.split(",") if e]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"알 수 없는 엔드포인트: {', '.join(sorted(unknown))}")
+
+    print("[Bench] 페이로드 생성 중...")
+    photos = [make_jpeg_payload(mb, seed=i) for i, mb in enumerate(args.sizes_mb)]
+    references = [make_jpeg_payload(args.reference_mb, seed=100 + i) for i in range(args.references)]
+    print(f"[Bench] 사진: {[round(len(p) / 1024 / 1024, 2) for p in photos]} MB, "
+          f"레퍼런스 {len(references)}장")
+
+    results = []
+    for workers in args.workers:
+        server = Server(workers, args.stub_latency_ms)
+        try:
+            server.wait_ready()
+            for endpoint in endpoints:
+                for concurrency in args.concurrency:
+                    level = asyncio.run(run_level(
+                        server.base_url, endpoint, concurrency, args.requests, photos, references
+                    ))
+                    level["workers"] = workers
+                    level["peak_rss_mb_per_worker"] = worker_peak_rss(server.proc.pid, workers)
+                    results.append(level)
+                    print(f"[Bench] workers={workers} {endpoint:<8} c={concurrency:<3} "
+                          f"{level['throughput_rps']:>7.2f} req/s  "
+                          f"p50={level['latency_ms']['p50']}ms p95={level['latency_ms']['p95']}ms "
+                          f"p99={level['latency_ms']['p99']}ms  errors={level['errors']}")
+        finally:
+            server.stop()
+
+    report = {
+        "meta": {
+            "git_revision": _git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "stub_latency_ms": args.stub_latency_ms,
+            "photo_bytes": [len(p) for p in photos],
+            "reference_bytes": [len(r) for r in references],
+            "requests_per_level": args.requests,
+        },
+        "results": results,
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, sort_keys=True)
+    print(f"[Bench] 결과 저장: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+인증서 컨트랙트 가스 벤치마크 (로컬 EVM)
+
+contracts/ 의 세 컨트랙트를 컴파일하여 프로세스 내부 EVM(eth-tester)에 배포한 뒤,
+같은 인증서 수를 발급하면서 인증서당 가스 사용량(트랜잭션 기본 비용 포함)을 비교합니다.
+
+- OceanSealCertificate: 구조체 + 문자열(유형, 사용자 ID) + 사용자별 배열 저장
+  (issueCertificate 단건 / batchIssueCertificates)
+- OceanSealCert: 현재 배포된 컨트랙트, bytes32 => uint256 (issue 단건)
+- OceanSealCert + Merkle: 배치 Merkle 루트 하나만 기록 (CERTIFICATE_ANCHOR_MODE=merkle)
+- OceanSealCertV2: bytes32 => uint64, immutable admin (issue 단건 / issueMany, 취소는 revokeMany)
+
+V2 가 재전송된 ID 의 기록 시각을 덮어쓰지 않는지도 확인하며, 위반 시 종료 코드 1을 반환합니다.
+결과는 --output 으로 JSON 저장 가능 (릴리스 간 비교용)
+
+필요 패키지:
+    pip install "web3[tester]==6.15.1" py-solc-x
+
+사용법:
+    python scripts/benchmark_gas.py
+    python scripts/benchmark_gas.py --certs 200 --batch-sizes 10,50,100 --gas-price-gwei 30 \\
+        --output bench_results/gas.json
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    import solcx
+    from web3 import AsyncWeb3
+    from web3.providers.eth_tester import AsyncEthereumTesterProvider
+except ImportError:
+    print('필요한 패키지가 없습니다: pip install "web3[tester]==6.15.1" py-solc-x')
+    sys.exit(1)
+
+CONTRACTS_DIR = PROJECT_ROOT / "contracts"
+# OceanSealCertificate.sol 이 ^0.8.20 이므로 모두 0.8.20 으로 컴파일
+SOLC_VERSION = "0.8.20"
+# 로컬 EVM 에 PUSH0 (shanghai) 가 없을 수 있으므로 paris 기준 (가스 차이는 무시할 수준)
+EVM_VERSION = "paris"
+# OceanSealCertificate.batchIssueCertificates 제한
+LEGACY_MAX_BATCH = 50
+TX_GAS = 15_000_000
+
+
+def compile_contracts() -> Dict[str, dict]:
+    """contracts/*.sol 컴파일 -> {컨트랙트 이름: {abi, bin}}"""
+    if SOLC_VERSION not in [str(v) for v in solcx.get_installed_solc_versions()]:
+        print(f"[GasBench] solc {SOLC_VERSION} 설치 중...")
+        solcx.install_solc(SOLC_VERSION)
+    compiled = solcx.compile_files(
+        [str(p) for p in sorted(CONTRACTS_DIR.glob("*.sol"))],
+        output_values=["abi", "bin"],
+        solc_version=SOLC_VERSION,
+        evm_version=EVM_VERSION,
+        optimize=True,
+        optimize_runs=200,
+    )
+    return {key.split(":")[-1]: value for key, value in compiled.items()}
+
+
+class GasMeter:
+    """tester 계정으로 트랜잭션을 보내고 gasUsed 를 합산"""
+
+    def __init__(self, w3, sender: str):
+        self.w3 = w3
+        self.sender = sender
+
+    async def deploy(self, artifact: dict):
+        factory = self.w3.eth.contract(abi=artifact["abi"], bytecode=artifact["bin"])
+        tx_hash = await factory.constructor().transact({"from": self.sender, "gas": TX_GAS})
+        receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        return self.w3.eth.contract(address=receipt["contractAddress"], abi=artifact["abi"]), receipt["gasUsed"]
+
+    async def send(self, call) -> int:
+        tx_hash = await call.transact({"from": self.sender, "gas": TX_GAS})
+        receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        if receipt["status"] != 1:
+            raise RuntimeError(f"트랜잭션 실패: {call.fn_name}")
+        return receipt["gasUsed"]
+
+
+def chunks(items: list, size: int) -> List[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def run(certs: int, batch_sizes: List[int]) -> dict:
+    artifacts = compile_contracts()
+    w3 = AsyncWeb3(AsyncEthereumTesterProvider())
+    meter = GasMeter(w3, (await w3.eth.accounts)[0])
+
+    results = []
+    failures = []
+
+    def record(variant: str, mode: str, total_gas: int, transactions: int, deploy_gas: int):
+        per_cert = total_gas / certs
+        results.append({
+            "variant": variant,
+            "mode": mode,
+            "certs": certs,
+            "transactions": transactions,
+            "total_gas": total_gas,
+            "gas_per_cert": round(per_cert),
+            "deploy_gas": deploy_gas,
+        })
+        print(f"[GasBench] {variant:<22} {mode:<16} 인증서당 {per_cert:>9,.0f} 가스 ({transactions} tx)")
+
+    def fresh_ids(tag: int) -> List[bytes]:
+        # 변형마다 새 ID (같은 슬롯 재사용으로 가스가 줄어드는 것 방지)
+        return [(tag << 128 | i).to_bytes(32, "big") for i in range(certs)]
+
+    # OceanSealCertificate: 구조체 + 문자열 (사용자 ID 는 Firebase UID 해시 길이)
+    user_ids = [os.urandom(32).hex() for _ in range(7)]
+    legacy, deploy_gas = await meter.deploy(artifacts["OceanSealCertificate"])
+    total = 0
+    for i, image_hash in enumerate(fresh_ids(1)):
+        total += await meter.send(legacy.functions.issueCertificate(image_hash, "poster", user_ids[i % 7]))
+    record("OceanSealCertificate", "single", total, certs, deploy_gas)
+
+    legacy, deploy_gas = await meter.deploy(artifacts["OceanSealCertificate"])
+    batch = min(max(batch_sizes), LEGACY_MAX_BATCH)
+    total, transactions = 0, 0
+    for group in chunks(list(enumerate(fresh_ids(2))), batch):
+        total += await meter.send(legacy.functions.batchIssueCertificates(
+            [h for _, h in group], ["poster"] * len(group), [user_ids[i % 7] for i, _ in group]
+        ))
+        transactions += 1
+    record("OceanSealCertificate", f"batch x{batch}", total, transactions, deploy_gas)
+
+    # OceanSealCert: 인증서마다 issue / Merkle 루트만 기록
+    current, deploy_gas = await meter.deploy(artifacts["OceanSealCert"])
+    total = 0
+    for cert_id in fresh_ids(3):
+        total += await meter.send(current.functions.issue(cert_id))
+    record("OceanSealCert", "single", total, certs, deploy_gas)
+
+    from app.certificate.merkle import MerkleTree
+    for size in batch_sizes:
+        total, transactions = 0, 0
+        for group in chunks(fresh_ids(4 + size), size):
+            total += await meter.send(current.functions.issue(MerkleTree(group).root))
+            transactions += 1
+        record("OceanSealCert", f"merkle x{size}", total, transactions, deploy_gas)
+
+    # OceanSealCertV2: issue / issueMany
+    v2, deploy_gas = await meter.deploy(artifacts["OceanSealCertV2"])
+    single_ids = fresh_ids(5)
+    total = 0
+    for cert_id in single_ids:
+        total += await meter.send(v2.functions.issue(cert_id))
+    record("OceanSealCertV2", "single", total, certs, deploy_gas)
+
+    for size in batch_sizes:
+        ids = fresh_ids(6 << 16 | size)
+        total, transactions = 0, 0
+        for group in chunks(ids, size):
+            total += await meter.send(v2.functions.issueMany(group))
+            transactions += 1
+        record("OceanSealCertV2", f"issueMany x{size}", total, transactions, deploy_gas)
+        missing = [i for i in (ids[0], ids[-1]) if await v2.functions.verify(i).call() == 0]
+        if missing:
+            failures.append(f"issueMany x{size}: 기록되지 않은 인증서 {len(missing)}건")
+
+    # V2 취소: issueMany 로 발급한 인증서를 같은 배치 크기로 취소 (발급 기록과 같은 슬롯 갱신)
+    for size in batch_sizes:
+        ids = fresh_ids(6 << 16 | size)
+        issued_at = await v2.functions.verify(ids[0]).call()
+        total, transactions = 0, 0
+        for group in chunks(ids, size):
+            total += await meter.send(v2.functions.revokeMany(group))
+            transactions += 1
+        record("OceanSealCertV2", f"revokeMany x{size}", total, transactions, deploy_gas)
+        if await v2.functions.revokedAt(ids[-1]).call() == 0:
+            failures.append(f"revokeMany x{size}: 취소가 기록되지 않음")
+        if await v2.functions.verify(ids[0]).call() != issued_at:
+            failures.append(f"revokeMany x{size}: 취소가 발급 시각을 바꿈")
+
+    # V2: 재전송된 ID 는 처음 기록 시각 유지 (로컬 EVM 은 트랜잭션마다 이후 시각의 블록 생성)
+    first = await v2.functions.verify(single_ids[0]).call()
+    await meter.send(v2.functions.issue(single_ids[0]))
+    await meter.send(v2.functions.issueMany([single_ids[0]]))
+    if await v2.functions.verify(single_ids[0]).call() != first:
+        failures.append("V2 가 이미 기록된 인증서의 기록 시각을 덮어씀")
+
+    return {"certs": certs, "solc": SOLC_VERSION, "results": results, "failures": failures}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="인증서 컨트랙트 가스 벤치마크 (로컬 EVM)")
+    parser.add_argument("--certs", type=int, default=100, help="변형별 발급할 인증서 수")
+    parser.add_argument("--batch-sizes", default="10,50", help="배치 크기 목록 (쉼표 구분)")
+    parser.add_argument("--gas-price-gwei", type=float, default=30.0, help="비용 환산용 가스 가격 (gwei)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    batch_sizes = [int(s) for s in args.batch_sizes.split(",") if s.strip()]
+    report = asyncio.run(run(args.certs, batch_sizes))
+
+    baseline = next(r for r in report["results"] if r["variant"] == "OceanSealCert" and r["mode"] == "single")
+    print(f"\n{'컨트랙트':<22} {'방식':<16} {'인증서당 가스':>12} {'현재 대비':>9} {'1,000건 비용 (POL)':>18}")
+    for r in report["results"]:
+        ratio = r["gas_per_cert"] / baseline["gas_per_cert"]
+        cost = r["gas_per_cert"] * 1000 * args.gas_price_gwei / 1e9
+        print(f"{r['variant']:<22} {r['mode']:<16} {r['gas_per_cert']:>12,} {ratio:>8.0%} {cost:>18.4f}")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        report["gas_price_gwei"] = args.gas_price_gwei
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\n[GasBench] 결과 저장: {args.output}")
+
+    if report["failures"]:
+        print("\n[GasBench] 실패:")
+        for failure in report["failures"]:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+벤치마크용 스텁 앱
+
+실제 app.main 앱을 그대로 사용하되, Gemini 호출만 가짜 클라이언트로 교체합니다.
+(네트워크/쿼터 없이 엔드포인트 자체의 처리량을 측정하기 위함)
+
+환경변수:
+    BENCH_STUB_LATENCY_MS: 가짜 Gemini 응답 지연 (기본 800ms)
+    BENCH_STUB_OUTPUT_PX: 가짜 결과 이미지 한 변 크기 (기본 1024px)
+
+사용법 (benchmark_endpoints.py가 자동으로 실행):
+    python -m uvicorn benchmark_stub:app --app-dir scripts --workers 2
+"""
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import app.main as main  # noqa: E402
+from app.resources import resources  # noqa: E402
+
+STUB_LATENCY_MS = int(os.getenv("BENCH_STUB_LATENCY_MS", "800"))
+STUB_OUTPUT_PX = int(os.getenv("BENCH_STUB_OUTPUT_PX", "1024"))
+
+
+def _make_output_png(size: int) -> bytes:
+    """결과 이미지 (한 번만 생성해서 재사용)"""
+    image = Image.effect_noise((size, size), 64).convert("RGB")
+    output = io.BytesIO()
+    image.save(output, format="PNG", compress_level=1)
+    return output.getvalue()
+
+
+class _StubInlineData:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.mime_type = "image/png"
+
+
+class _StubPart:
+    def __init__(self, text=None, data: bytes = None):
+        self.text = text
+        self.inline_data = _StubInlineData(data) if data is not None else None
+
+
+class _StubResponse:
+    def __init__(self, parts):
+        self.parts = parts
+        self.candidates = []
+
+
+class _StubModels:
+    def __init__(self):
+        self._output = _make_output_png(STUB_OUTPUT_PX)
+
+    def generate_content(self, model, contents, config=None):
+        # 실제 SDK와 동일하게 동기 호출 (블로킹 특성까지 재현)
+        time.sleep(STUB_LATENCY_MS / 1000)
+        return _StubResponse([
+            _StubPart(text="stub response"),
+            _StubPart(data=self._output),
+        ])
+
+
+class _StubClient:
+    def __init__(self):
+        self.models = _StubModels()
+
+
+resources.override("gemini_client", _StubClient())
+
+# 레이트 리밋은 처리량 측정에 방해되므로 비활성화 (모든 라우터 공용 인스턴스)
+main.limiter.enabled = False
+
+app = main.app
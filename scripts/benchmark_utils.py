@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+app/utils 이미지 헬퍼 마이크로 벤치마크
+
+매 요청마다 실행되는 다음 함수들의 실행 시간과 메모리 할당을 측정합니다.
+- resize_image_if_needed
+- encode_image_to_base64
+- extract_image_from_response
+- Gemini 응답 파싱 루프 (app.gemini_client._response_to_dict)
+
+이미지 크기 x 모드(RGB/RGBA/P) x 포맷(JPEG/PNG/WEBP) 조합별로 측정하며,
+--baseline 으로 이전 결과를 넘기면 허용치 이상 느려진 항목이 있을 때
+종료 코드 1을 반환합니다. (배포 전 회귀 검사용)
+
+사용법:
+    python scripts/benchmark_utils.py --output bench_results/utils.json
+    python scripts/benchmark_utils.py --baseline bench_results/utils.json --max-regression 0.25
+"""
+import os
+import io
+import sys
+import json
+import time
+import base64
+import argparse
+import platform
+import statistics
+import tracemalloc
+import contextlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from PIL import Image
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.utils import (  # noqa: E402
+    resize_image_if_needed,
+    encode_image_to_base64,
+    extract_image_from_response,
+)
+
+# 모드별로 지원되는 포맷 (JPEG는 알파/팔레트 미지원)
+FORMATS_BY_MODE = {
+    "RGB": ["JPEG", "PNG", "WEBP"],
+    "RGBA": ["PNG", "WEBP"],
+    "P": ["PNG"],
+}
+
+
+def make_image(size: int, mode: str) -> Image.Image:
+    """사진과 비슷하게 압축되는 테스트 이미지 (그라디언트 + 노이즈)"""
+    gradient = Image.linear_gradient("L").resize((size, size))
+    noise = Image.effect_noise((size, size), 32)
+    image = Image.merge("RGB", (gradient, noise, gradient.rotate(90)))
+    if mode == "RGBA":
+        image.putalpha(gradient)
+    elif mode == "P":
+        image = image.convert("P", palette=Image.Palette.ADAPTIVE)
+    return image
+
+
+def encode(image: Image.Image, fmt: str) -> bytes:
+    output = io.BytesIO()
+    image.save(output, format=fmt, **({"quality": 90} if fmt in ("JPEG", "WEBP") else {}))
+    return output.getvalue()
+
+
+# ============ Gemini 응답 스텁 ============
+
+class _StubInlineData:
+    def __init__(self, data: bytes, mime_type: str):
+        self.data = data
+        self.mime_type = mime_type
+
+
+class _StubPart:
+    def __init__(self, text=None, data: bytes = None, mime_type: str = "image/png"):
+        self.text = text
+        self.inline_data = _StubInlineData(data, mime_type) if data is not None else None
+
+
+class _StubResponse:
+    def __init__(self, parts):
+        self.parts = parts
+        self.candidates = []
+
+
+# ============ 측정 ============
+
+def measure(func: Callable[[], object], repeat: int, min_time: float = 0.2) -> dict:
+    """실행 시간(반복 측정)과 1회 호출의 메모리 할당을 측정"""
+    devnull = open(os.devnull, "w")
+    try:
+        # 헬퍼 내부 print 비용은 포함하되 출력은 버림
+        with contextlib.redirect_stdout(devnull):
+            func()  # 워밍업
+
+            # 할당량: 1회 호출 동안의 최대 메모리와 할당 블록 수
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            func()
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            stats = after.compare_to(before, "filename")
+            alloc_blocks = sum(max(s.count_diff, 0) for s in stats)
+
+            # 실행 시간: 최소 min_time 초 이상, 최소 repeat 회
+            timings: List[float] = []
+            deadline = time.perf_counter() + min_time
+            while len(timings) < repeat or time.perf_counter() < deadline:
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        devnull.close()
+
+    return {
+        "runs": len(timings),
+        "min_ms": round(min(timings), 4),
+        "median_ms": round(statistics.median(timings), 4),
+        "peak_alloc_kb": round(peak / 1024, 1),
+        "alloc_blocks": alloc_blocks,
+    }
+
+
+def build_cases(sizes: List[int]) -> Dict[str, Callable[[], object]]:
+    """벤치마크 케이스 목록 (이름 -> 호출 함수)"""
+    from app.gemini_client import _response_to_dict
+
+    cases: Dict[str, Callable[[], object]] = {}
+    for size in sizes:
+        for mode, formats in FORMATS_BY_MODE.items():
+            image = make_image(size, mode)
+
+            # resize: 디코딩된 이미지 기준 (1500px 초과 시 LANCZOS 리사이즈)
+            cases[f"resize_image_if_needed/{mode}/{size}"] = (
+                lambda image=image: resize_image_if_needed(image, 1500)
+            )
+
+            for fmt in formats:
+                raw = encode(image, fmt)
+                cases[f"encode_image_to_base64/{mode}/{fmt}/{size}"] = (
+                    lambda raw=raw: encode_image_to_base64(raw, optimize=True, max_size=1500)
+                )
+
+        # 응답 파싱: Gemini가 돌려주는 PNG 결과 이미지 크기별
+        png = encode(make_image(size, "RGB"), "PNG")
+        png_b64 = base64.b64encode(png).decode("utf-8")
+        response_dict = {
+            "candidates": [{
+                "content": {
+                    "parts": [
+                        {"text": "done"},
+                        {"inlineData": {"mimeType": "image/png", "data": png_b64}},
+                    ]
+                }
+            }]
+        }
+        cases[f"extract_image_from_response/PNG/{size}"] = (
+            lambda response_dict=response_dict: extract_image_from_response(response_dict)
+        )
+
+        sdk_response = _StubResponse([_StubPart(text="done"), _StubPart(data=png)])
+        cases[f"gemini_response_to_dict/PNG/{size}"] = (
+            lambda sdk_response=sdk_response: _response_to_dict(sdk_response)
+        )
+
+    return cases
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], max_regression: float) -> List[str]:
+    """기준 결과 대비 median 시간이 max_regression 비율 이상 늘어난 항목"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or previous["median_ms"] <= 0:
+            continue
+        ratio = current["median_ms"] / previous["median_ms"] - 1
+        if ratio > max_regression:
+            regressions.append(
+                f"{name}: {previous['median_ms']}ms -> {current['median_ms']}ms (+{ratio:.0%})"
+            )
+    return regressions
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="app/utils 이미지 헬퍼 마이크로 벤치마크")
+    parser.add_argument("--sizes", type=_int_list, default=[512, 1500, 3000, 4032], help="이미지 한 변 크기(px) 목록")
+    parser.add_argument("--repeat", type=int, default=5, help="케이스별 최소 반복 횟수")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 케이스만 실행")
+    parser.add_argument("--output", default="bench_results/utils.json", help="결과 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="허용 성능 저하 비율 (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    # 결과 파일과 기준 파일이 같은 경로일 수 있으므로 기준 결과를 먼저 읽어둠
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    cases = build_cases(args.sizes)
+    results: Dict[str, dict] = {}
+    for name, func in cases.items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(func, args.repeat)
+        r = results[name]
+        print(f"[Bench] {name:<48} median={r['median_ms']:>9.3f}ms "
+              f"peak={r['peak_alloc_kb']:>9.1f}KB blocks={r['alloc_blocks']}")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "pillow": Image.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"[Bench] 결과 저장: {output_path}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\n[Bench] 성능 회귀 감지 ({len(regressions)}건, 허용치 {args.max_regression:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("[Bench] 기준 대비 성능 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+인증서 API 요청당 Supabase 쿼리 수 검증 (로컬 PostgREST 대역 서버)
+
+app/certificate/service.py 의 CertificateService 를 로컬 aiohttp PostgREST 대역 서버에 연결하여
+각 작업이 보내는 쿼리 수(X-DB-Queries 헤더와 같은 카운터)와 조회 컬럼을 확인합니다.
+
+- 인증서 조회 / 검증 / 이미지 검증 / 일괄 검증: 쿼리 1회
+- 취소: 소유자 조건을 포함한 UPDATE 1회 (실패 시에만 원인 확인 1회 추가)
+- 발급: 중복 확인 + 저장 2회 (이미 발급된 이미지는 1회)
+- 조회 캐시: 같은 인증서 재조회는 0회, 취소하면 다른 워커(같은 버전 스탬프 파일)도 다시 조회
+- 사용자 목록: 페이지마다 2회 (키셋 페이지 + 개수 카운터), 페이지가 겹치거나 빠지지 않는지
+- NDJSON 목록: 완료 줄로 끝나는지, 도중 실패하면 이어받을 커서가 담긴 에러 줄로 끝나는지
+- 조회는 select=* 대신 필요한 컬럼만
+
+위반 시 종료 코드 1을 반환합니다. (네트워크 / 실제 DB 불필요)
+
+사용법:
+    python scripts/check_db_queries.py
+"""
+import os
+import sys
+import json
+import uuid
+import socket
+import tempfile
+import asyncio
+import hashlib
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    from aiohttp import web
+    import supabase  # noqa: F401
+except ImportError:
+    print("필요한 패키지가 없습니다: pip install -r requirements.txt")
+    sys.exit(1)
+
+from app.certificate import db
+from app.certificate import service as service_module
+from app.certificate.models import CertificateType
+from app.certificate.service import CertificateService, REVOKE_NOT_FOUND, REVOKE_FORBIDDEN
+
+OWNER = "owner-uid"
+
+
+def split_top_level(text: str) -> list:
+    """쉼표로 분리 (괄호 / 따옴표 안의 쉼표 제외)"""
+    parts, depth, quoted, current = [], 0, False, ""
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch in "()":
+            depth += 1 if ch == "(" else -1
+        elif not quoted and depth == 0 and ch == ",":
+            parts.append(current)
+            current = ""
+            continue
+        current += ch
+    return parts + [current]
+
+
+class PostgRESTStandIn:
+    """certificates / user_certificate_counts 테이블을 메모리에 두는 PostgREST 대역
+
+    필터는 eq / lt / in 과 or / and 조합, 정렬은 order, limit 만 지원
+    """
+
+    def __init__(self):
+        self.tables = {"certificates": [], "user_certificate_counts": []}
+        self.requests = []
+        self.port = None
+        self._runner = None
+
+    @classmethod
+    def _matches(cls, row: dict, column: str, expr: str) -> bool:
+        if column in ("or", "and"):
+            results = [cls._matches(row, *part.split(".", 1)) for part in split_top_level(expr[1:-1])]
+            return any(results) if column == "or" else all(results)
+        if "(" in column:
+            # or(...) 안의 and(...)
+            op, inner = column.split("(", 1)
+            return cls._matches(row, op, "(" + inner + "." + expr)
+        op, value = expr.split(".", 1)
+        value = value.strip('"')
+        actual = str(row.get(column))
+        if op == "eq":
+            return actual == value
+        if op == "lt":
+            return actual < value
+        if op == "in":
+            return actual in value.strip("()").split(",")
+        raise ValueError(f"지원하지 않는 필터: {column}={expr}")
+
+    def _filter(self, rows: list, query) -> list:
+        for column, expr in query.items():
+            if column not in ("select", "limit", "order", "columns"):
+                rows = [r for r in rows if self._matches(r, column, expr)]
+        for key in reversed(query.get("order", "").split(",") if query.get("order") else []):
+            column, direction = key.split(".")[:2]
+            rows = sorted(rows, key=lambda r: str(r.get(column)), reverse=direction == "desc")
+        if "limit" in query:
+            rows = rows[:int(query["limit"])]
+        return rows
+
+    def insert(self, row: dict) -> dict:
+        """certificates 저장 (DB 기본값 + 개수 트리거 흉내)"""
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", f"2026-01-01T00:00:{len(self.tables['certificates']) // 2:02d}.000000+00:00")
+        row["metadata"] = {"large": "x" * 1000}
+        self.tables["certificates"].append(row)
+        counts = self.tables["user_certificate_counts"]
+        entry = next((c for c in counts if c["user_id"] == row["user_id"]), None)
+        if entry is None:
+            counts.append({"user_id": row["user_id"], "total": 1})
+        else:
+            entry["total"] += 1
+        return row
+
+    @property
+    def rows(self) -> list:
+        return self.tables["certificates"]
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        query = dict(request.query)
+        self.requests.append((request.method, query))
+        if request.method == "POST":
+            row = self.insert(await request.json())
+            return web.json_response([row], status=201)
+        rows = self._filter(self.tables[request.path.rsplit("/", 1)[-1]], query)
+        if request.method == "PATCH":
+            changes = await request.json()
+            for row in rows:
+                row.update(changes)
+        elif query.get("select") not in (None, "*"):
+            columns = query["select"].split(",")
+            rows = [{c: r.get(c) for c in columns} for r in rows]
+        return web.Response(text=json.dumps(rows), content_type="application/json")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+class OffchainBlockchain:
+    """블록체인 미설정 상태 (오프체인 발급 / 검증, RPC 호출 없음)"""
+
+    revocation_mode = "db"
+
+    def is_configured(self) -> bool:
+        return False
+
+    def compute_image_hash_from_base64(self, image_base64: str) -> str:
+        return "0x" + hashlib.sha256(image_base64.encode()).hexdigest()
+
+
+async def counted(coro):
+    """코루틴 실행 -> (결과, 쿼리 수) (HTTP 요청 미들웨어와 같은 카운터)"""
+    token = db.begin_request_queries()
+    try:
+        result = await coro
+    finally:
+        queries = db.end_request_queries(token)
+    return result, queries
+
+
+async def run() -> list:
+    failures = []
+    server = PostgRESTStandIn()
+    await server.start()
+    client = db.create_client(f"http://127.0.0.1:{server.port}", "service.role.key")
+    # 실행 중인 서버의 조회 캐시 버전 파일과 분리
+    os.environ["CERTIFICATE_CACHE_VERSION_PATH"] = os.path.join(
+        tempfile.mkdtemp(), "oceanseal-certificate-versions"
+    )
+    service = CertificateService(client, OffchainBlockchain())
+
+    def expect(name: str, queries: int, limit: int):
+        print(f"[DBQueryCheck] {name:<24} 쿼리 {queries}회")
+        if queries > limit:
+            failures.append(f"{name}: 쿼리 {queries}회 (최대 {limit}회)")
+
+    try:
+        issued, queries = await counted(service.issue_certificate("image-a", CertificateType.POSTER, OWNER))
+        expect("발급", queries, 2)
+        if not issued.success:
+            failures.append(f"발급 실패: {issued.error}")
+            return failures
+        cert = issued.certificate
+        short_id = cert.verify_url.rsplit("/", 1)[-1]
+
+        _, queries = await counted(service.issue_certificate("image-a", CertificateType.POSTER, OWNER))
+        expect("발급 (이미 발급된 이미지)", queries, 1)
+
+        found, queries = await counted(service.get_certificate(short_id))
+        expect("조회 (짧은 ID)", queries, 1)
+        if not found or found.cert_id != cert.cert_id:
+            failures.append("짧은 ID 로 인증서를 찾지 못함")
+
+        result, queries = await counted(service.verify_certificate(cert.cert_id))
+        expect("검증", queries, 1)
+        if not result.is_valid:
+            failures.append(f"검증 실패: {result.message}")
+
+        result, queries = await counted(service.verify_by_image("image-a"))
+        expect("이미지 검증", queries, 1)
+        if not result.is_valid:
+            failures.append(f"이미지 검증 실패: {result.message}")
+
+        other, _ = await counted(service.issue_certificate("image-b", CertificateType.DEFECT, OWNER))
+        bulk, queries = await counted(service.verify_certificates([short_id, other.certificate.cert_id, "0000"]))
+        expect("일괄 검증 (3건)", queries, 1)
+        if [r.is_valid for r in bulk.results] != [True, True, False]:
+            failures.append(f"일괄 검증 결과가 잘못됨: {[r.is_valid for r in bulk.results]}")
+
+        (success, error), queries = await counted(service.revoke_certificate(short_id, user_id="someone-else"))
+        expect("취소 (다른 사용자)", queries, 2)
+        if success or error != REVOKE_FORBIDDEN:
+            failures.append(f"다른 사용자의 취소가 거부되지 않음: {error}")
+
+        (success, error), queries = await counted(service.revoke_certificate("0" * 64, user_id=OWNER))
+        expect("취소 (없는 인증서)", queries, 2)
+        if success or error != REVOKE_NOT_FOUND:
+            failures.append(f"없는 인증서 취소 결과가 잘못됨: {error}")
+
+        (success, error), queries = await counted(service.revoke_certificate(short_id, user_id=OWNER))
+        expect("취소 (본인)", queries, 1)
+        if not success:
+            failures.append(f"본인 인증서 취소 실패: {error}")
+
+        result, _ = await counted(service.verify_certificate(short_id))
+        if result.is_valid:
+            failures.append("취소된 인증서가 유효로 검증됨")
+
+        # 조회 캐시: 두 번째 조회부터 DB 미조회, 다른 워커의 취소도 반영
+        other_worker = CertificateService(client, OffchainBlockchain())
+        other_id = other.certificate.cert_id
+        await service.get_certificate(other_id)
+        await other_worker.get_certificate(other_id)
+        _, queries = await counted(service.get_certificate(other_id))
+        expect("조회 (캐시)", queries, 0)
+        (success, error), _ = await counted(service.revoke_certificate(other_id, user_id=OWNER))
+        found, queries = await counted(other_worker.get_certificate(other_id))
+        expect("조회 (다른 워커 취소 후)", queries, 1)
+        if queries != 1 or not found or found.status.value != "revoked":
+            failures.append("다른 워커의 취소 후에도 캐시된 인증서가 반환됨")
+
+        # 사용자 목록: 같은 created_at 이 겹치는 행이 있어도 (created_at, id) 커서로 빠짐없이
+        for i in range(5):
+            await service.issue_certificate(f"image-list-{i}", CertificateType.SERIAL, OWNER)
+        expected = [
+            r["cert_id"] for r in sorted(
+                (r for r in server.rows if r["user_id"] == OWNER),
+                key=lambda r: (r["created_at"], r["id"]), reverse=True
+            )
+        ]
+        listed, cursor, pages = [], None, 0
+        while True:
+            page, queries = await counted(service.get_user_certificates(OWNER, limit=3, cursor=cursor))
+            expect(f"사용자 목록 {pages + 1}페이지", queries, 2)
+            if page.total_count != len(expected):
+                failures.append(f"total_count {page.total_count} (실제 {len(expected)})")
+            listed += [c.cert_id for c in page.certificates]
+            cursor, pages = page.next_cursor, pages + 1
+            if cursor is None or pages > len(expected):
+                break
+        if listed != expected:
+            failures.append(f"목록 페이지가 겹치거나 빠짐: {len(listed)}건 (실제 {len(expected)}건)")
+
+        async def read_stream():
+            body = "".join([chunk async for chunk in service.stream_user_certificates(OWNER)])
+            return [json.loads(line) for line in body.splitlines()]
+
+        lines = await read_stream()
+        streamed = [line["cert_id"] for line in lines[:-1]]
+        if streamed != expected:
+            failures.append(f"NDJSON 목록이 잘못됨: {len(streamed)}건 (실제 {len(expected)}건)")
+        if not lines or lines[-1] != {"done": True}:
+            failures.append(f"NDJSON 완료 줄이 없음: {lines[-1:]}")
+
+        # 도중 실패 (2페이지 조회): 이미 보낸 페이지 다음 커서와 함께 에러 줄로 끝나야 함
+        user_page = service._user_page
+        calls = 0
+
+        async def failing_page(*args):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise RuntimeError("connection lost")
+            return await user_page(*args)
+
+        service._user_page = failing_page
+        page_size, service_module.MAX_PAGE_SIZE = service_module.MAX_PAGE_SIZE, 3
+        try:
+            lines = await read_stream()
+        finally:
+            service._user_page = user_page
+            service_module.MAX_PAGE_SIZE = page_size
+        if [line.get("cert_id") for line in lines[:-1]] != expected[:3]:
+            failures.append(f"NDJSON 도중 실패 전 페이지가 잘못됨: {len(lines) - 1}줄")
+        elif "error" not in lines[-1] or not lines[-1].get("next_cursor"):
+            failures.append(f"NDJSON 도중 실패가 에러 줄로 끝나지 않음: {lines[-1:]}")
+
+        try:
+            await service.get_user_certificates(OWNER, cursor="not-a-cursor")
+            failures.append("잘못된 커서가 거부되지 않음")
+        except ValueError:
+            pass
+
+        full_rows = [q for method, q in server.requests if method == "GET" and q.get("select") == "*"]
+        if full_rows:
+            failures.append(f"select=* 조회 {len(full_rows)}회")
+    finally:
+        await db.close_client(client)
+        await server.stop()
+
+    return failures
+
+
+def main():
+    failures = asyncio.run(run())
+    if failures:
+        print("\n[DBQueryCheck] 실패:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("[DBQueryCheck] 통과")
+
+
+if __name__ == "__main__":
+    main()
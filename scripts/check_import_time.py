@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+import 시간 예산 검사
+
+`python -X importtime -c "import app.main"` 결과를 분석하여
+1. app.main import 누적 시간이 예산(--budget-ms)을 넘는지
+2. 서브시스템을 처음 사용할 때까지 미뤄야 하는 무거운 모듈
+   (web3, eth_account, firebase_admin, supabase, google.genai)이 import 시점에 로드되는지
+를 검사합니다. 위반 시 종료 코드 1을 반환하므로 배포 전 검사(CI)에 사용할 수 있습니다.
+
+사용법:
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget-ms 600 --runs 5 --top 20
+"""
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# import app.main 시점에 로드되면 안 되는 모듈 (해당 서브시스템 첫 사용 시 로드)
+DEFERRED_MODULES = (
+    "web3",
+    "eth_account",
+    "firebase_admin",
+    "supabase",
+    "postgrest",
+    "google.genai",
+)
+
+
+def run_importtime(target: str) -> List[Tuple[str, int, int, int]]:
+    """-X importtime 결과 파싱
+
+    Returns:
+        [(모듈 이름, 들여쓰기 깊이, self us, cumulative us), ...]
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=str(PROJECT_ROOT), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        raise RuntimeError(f"import {target} 실패")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:       123 |       456 |   package.module"
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|", 2)
+        # 이름 앞 공백: 최상위는 1칸, 하위 import 는 깊이마다 2칸씩 추가
+        name = name.rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import 시간 예산 검사")
+    parser.add_argument("--target", default="app.main", help="검사할 모듈")
+    parser.add_argument("--budget-ms", type=float, default=800.0, help="누적 import 시간 예산 (ms)")
+    parser.add_argument("--runs", type=int, default=3, help="반복 측정 횟수 (최소값 사용)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 상위 모듈 수")
+    args = parser.parse_args()
+
+    best_total = None
+    best_entries = None
+    for _ in range(args.runs):
+        entries = run_importtime(args.target)
+        target_entry = next((e for e in entries if e[0] == args.target), None)
+        if target_entry is None:
+            raise RuntimeError(f"importtime 결과에 {args.target} 가 없습니다.")
+        # 대상 모듈 이전에 로드된 최상위 모듈까지 포함한 전체 시간
+        total_us = sum(e[3] for e in entries if e[1] == 0)
+        if best_total is None or total_us < best_total:
+            best_total, best_entries = total_us, entries
+
+    total_ms = best_total / 1000
+    print(f"[ImportTime] import {args.target}: {total_ms:.1f}ms (예산 {args.budget_ms:.0f}ms)")
+
+    # 누적 시간 기준 상위 최상위 패키지
+    top_level: Dict[str, int] = {}
+    for name, depth, _, cumulative_us in best_entries:
+        root = name.split(".")[0]
+        if depth <= 1:
+            top_level[root] = max(top_level.get(root, 0), cumulative_us)
+    print(f"[ImportTime] 상위 {args.top}개 패키지 (누적):")
+    for root, cumulative_us in sorted(top_level.items(), key=lambda x: -x[1])[:args.top]:
+        print(f"  {cumulative_us / 1000:>8.1f}ms  {root}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import 시간 {total_ms:.1f}ms 가 예산 {args.budget_ms:.0f}ms 를 초과")
+
+    loaded = {name for name, _, _, _ in best_entries}
+    for module in DEFERRED_MODULES:
+        if module in loaded:
+            failures.append(f"{module} 가 import 시점에 로드됨 (서브시스템 첫 사용 시 로드해야 함)")
+
+    if failures:
+        print("\n[ImportTime] 실패:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("[ImportTime] 통과")
+
+
+if __name__ == "__main__":
+    main()
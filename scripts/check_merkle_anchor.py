@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Merkle 배치 앵커링 검증 (로컬 EVM)
+
+contracts/OceanSealCert.sol 을 컴파일하여 프로세스 내부 EVM(eth-tester)에 배포한 뒤,
+CERTIFICATE_ANCHOR_MODE=merkle 로 BlockchainService 를 실행하여 다음을 확인합니다.
+
+1. 동시에 발급한 인증서가 배치 크기 단위의 Merkle 루트 트랜잭션으로 묶이는지
+2. 모든 인증서가 포함 증명 + 온체인 루트로 검증되는지
+3. 다른 인증서 ID / 변조된 증명 / 기록되지 않은 루트는 검증에 실패하는지
+4. 인증서당 가스 사용량 (단건 발급 대비)
+
+위반 시 종료 코드 1을 반환합니다. (네트워크 / 실제 지갑 불필요)
+
+필요 패키지:
+    pip install "web3[tester]==6.15.1" py-solc-x
+
+사용법:
+    python scripts/check_merkle_anchor.py
+    python scripts/check_merkle_anchor.py --certs 100 --batch-size 32
+"""
+import os
+import sys
+import math
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    import solcx
+    from eth_account import Account
+    from web3 import AsyncWeb3
+    from web3.providers.eth_tester import AsyncEthereumTesterProvider
+except ImportError:
+    print('필요한 패키지가 없습니다: pip install "web3[tester]==6.15.1" py-solc-x')
+    sys.exit(1)
+
+CONTRACT_PATH = PROJECT_ROOT / "contracts" / "OceanSealCert.sol"
+SOLC_VERSION = "0.8.19"
+
+
+def compile_contract():
+    """contracts/OceanSealCert.sol 컴파일 -> (abi, bytecode)"""
+    if SOLC_VERSION not in [str(v) for v in solcx.get_installed_solc_versions()]:
+        print(f"[MerkleCheck] solc {SOLC_VERSION} 설치 중...")
+        solcx.install_solc(SOLC_VERSION)
+    compiled = solcx.compile_files(
+        [str(CONTRACT_PATH)], output_values=["abi", "bin"], solc_version=SOLC_VERSION
+    )
+    contract = next(v for k, v in compiled.items() if k.endswith(":OceanSealCert"))
+    return contract["abi"], contract["bin"]
+
+
+async def deploy(w3, admin, abi, bytecode) -> str:
+    """관리자 지갑으로 컨트랙트 배포 (issue 는 admin 만 호출 가능)"""
+    funder = (await w3.eth.accounts)[0]
+    await w3.eth.send_transaction({"from": funder, "to": admin.address, "value": 10 ** 20})
+
+    contract = w3.eth.contract(abi=abi, bytecode=bytecode)
+    tx = await contract.constructor().build_transaction({
+        "from": admin.address,
+        "nonce": await w3.eth.get_transaction_count(admin.address),
+        "gas": 500000,
+        "gasPrice": await w3.eth.gas_price,
+        "chainId": await w3.eth.chain_id,
+    })
+    from app.certificate.blockchain import raw_transaction
+    signed = w3.eth.account.sign_transaction(tx, admin.key)
+    tx_hash = await w3.eth.send_raw_transaction(raw_transaction(signed))
+    receipt = await w3.eth.wait_for_transaction_receipt(tx_hash)
+    return receipt["contractAddress"]
+
+
+async def run(certs: int, batch_size: int) -> list:
+    abi, bytecode = compile_contract()
+    w3 = AsyncWeb3(AsyncEthereumTesterProvider())
+    admin = Account.create()
+    address = await deploy(w3, admin, abi, bytecode)
+    print(f"[MerkleCheck] 컨트랙트 배포: {address}")
+
+    # BlockchainService 는 생성 시 환경변수를 읽음
+    state_dir = tempfile.mkdtemp()
+    os.environ.update({
+        "POLYGON_PRIVATE_KEY": admin.key.hex(),
+        "CERTIFICATE_CONTRACT_ADDRESS": address,
+        "CERTIFICATE_ANCHOR_MODE": "merkle",
+        "CERTIFICATE_BATCH_MAX_SIZE": str(batch_size),
+        "CERTIFICATE_BATCH_MAX_WAIT": "0.2",
+        "NONCE_STATE_PATH": os.path.join(state_dir, "nonce.json"),
+    })
+    from app.certificate.blockchain import BlockchainService
+    service = BlockchainService(w3=w3)
+
+    failures = []
+    results = await asyncio.gather(*(
+        service.issue_certificate(
+            image_hash=f"0x{i:064x}", cert_type="poster", user_id=f"user{i % 7}"
+        )
+        for i in range(certs)
+    ))
+    issued = []
+    for success, result, error in results:
+        if not success:
+            failures.append(f"발급 실패: {error}")
+        else:
+            issued.append(result)
+
+    roots = {r["merkle_root"] for r in issued}
+    expected_batches = math.ceil(certs / batch_size)
+    print(f"[MerkleCheck] 인증서 {len(issued)}건 -> 루트 트랜잭션 {len(roots)}건 (예상 {expected_batches}건)")
+    if len(roots) != expected_batches:
+        failures.append(f"배치 수 {len(roots)} != 예상 {expected_batches}")
+
+    for r in issued:
+        ok, _, error = await service.verify_certificate(r["cert_id"], r["merkle_root"], r["merkle_proof"])
+        if not ok:
+            failures.append(f"검증 실패 {r['cert_id'][:18]}...: {error}")
+
+    if issued:
+        first = issued[0]
+        # 같은 증명으로 다른 인증서 ID
+        ok, _, _ = await service.verify_certificate(
+            "0x" + "ab" * 32, first["merkle_root"], first["merkle_proof"]
+        )
+        if ok:
+            failures.append("다른 인증서 ID 가 검증을 통과함")
+        # 변조된 증명
+        if first["merkle_proof"]:
+            tampered = ["0x" + "00" * 32] + first["merkle_proof"][1:]
+            ok, _, _ = await service.verify_certificate(first["cert_id"], first["merkle_root"], tampered)
+            if ok:
+                failures.append("변조된 증명이 검증을 통과함")
+        # 기록되지 않은 루트 (단일 리프 트리)
+        from app.certificate.merkle import MerkleTree, to_hex
+        unanchored = os.urandom(32)
+        ok, _, _ = await service.verify_certificate(
+            to_hex(unanchored), to_hex(MerkleTree([unanchored]).root), []
+        )
+        if ok:
+            failures.append("온체인에 없는 루트가 검증을 통과함")
+
+        # 가스: 단건 발급 트랜잭션과 비교
+        batch_gas = {r["merkle_root"]: r["gas_used"] for r in issued}
+        per_cert = sum(batch_gas.values()) / len(issued)
+        single = await service.send_transaction(service.contract.functions.issue(os.urandom(32)), gas=100000)
+        print(f"[MerkleCheck] 가스: 단건 {single['gasUsed']} / 배치 인증서당 {per_cert:.0f}")
+
+    await service.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merkle 배치 앵커링 검증 (로컬 EVM)")
+    parser.add_argument("--certs", type=int, default=50, help="발급할 인증서 수")
+    parser.add_argument("--batch-size", type=int, default=16, help="배치 최대 크기")
+    args = parser.parse_args()
+
+    failures = asyncio.run(run(args.certs, args.batch_size))
+    if failures:
+        print("\n[MerkleCheck] 실패:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("[MerkleCheck] 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+RPC 다중 엔드포인트 장애 조치 검증 (로컬 대역 서버)
+
+app/certificate/failover.py 의 FailoverHTTPProvider 를 로컬 aiohttp JSON-RPC 대역 서버들에
+연결하여 다음을 확인합니다.
+
+1. 조회 요청이 측정된 지연 시간이 가장 짧은 엔드포인트로 가는지
+2. 응답 없음(타임아웃) / HTTP 500 / rate limit / 연결 거부 시 다음 엔드포인트로 넘어가는지
+3. 장애 엔드포인트가 쿨다운 동안 제외되고, 쿨다운 후 다시 사용되는지
+   (rate limit 이 계속되면 쿨다운이 지수적으로 늘어나는지)
+4. 트랜잭션 전송이 한 엔드포인트에 고정되고, 그 엔드포인트 장애 시에만 바뀌는지
+5. 타임아웃 후 재전송이 "already known" 으로 거절되면 같은 트랜잭션 해시로 성공 처리되는지
+6. JSON-RPC 배치 요청도 장애 조치되는지
+   (eth_getLogs 조회 범위 / 결과 수 제한 에러는 장애가 아니라 호출한 쪽에 그대로 전달되는지)
+7. 모든 엔드포인트 장애 시 에러가 전달되는지
+
+위반 시 종료 코드 1을 반환합니다. (네트워크 / 실제 노드 불필요)
+
+사용법:
+    python scripts/check_rpc_failover.py
+"""
+import sys
+import json
+import time
+import asyncio
+import socket
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    from aiohttp import web
+    from eth_utils import keccak
+    from web3 import AsyncWeb3
+except ImportError:
+    print("필요한 패키지가 없습니다: pip install -r requirements.txt")
+    sys.exit(1)
+
+from app.certificate.failover import FailoverHTTPProvider
+
+TIMEOUT = 0.5
+COOLDOWN = 0.5
+RAW_TX = "0x" + "f8" * 40
+
+
+class StandIn:
+    """모드를 바꿀 수 있는 JSON-RPC 대역 서버
+
+    mode: ok / slow / hang / error500 / limited / known / range
+    """
+
+    def __init__(self, name: str, delay: float = 0.0):
+        self.name = name
+        self.delay = delay
+        self.mode = "ok"
+        self.hits = []
+        self.port = None
+        self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/rpc"
+
+    def _answer(self, call: dict) -> dict:
+        self.hits.append(call["method"])
+        if self.mode == "limited":
+            return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32005, "message": "rate limit exceeded"}}
+        if call["method"] == "eth_sendRawTransaction":
+            if self.mode == "known":
+                return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32000, "message": "already known"}}
+            return {"jsonrpc": "2.0", "id": call["id"], "result": "0x" + keccak(hexstr=call["params"][0]).hex()}
+        if call["method"] == "eth_getLogs" and self.mode == "range":
+            # rate limit 과 같은 코드지만 요청 범위가 원인
+            return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32005, "message": "query returned more than 10000 results"}}
+        if call["method"] == "eth_call":
+            # revert: 엔드포인트 장애가 아닌 정상 응답
+            return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": 3, "message": "execution reverted"}}
+        return {"jsonrpc": "2.0", "id": call["id"], "result": "0x10"}
+
+    async def handle(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        if self.mode == "hang":
+            # 요청은 받았지만 (트랜잭션은 전파됐지만) 제한 시간 안에 응답하지 않음
+            for call in payload if isinstance(payload, list) else [payload]:
+                self.hits.append(call["method"])
+            await asyncio.sleep(TIMEOUT * 4)
+        if self.mode == "error500":
+            return web.Response(status=500, text="internal error")
+        await asyncio.sleep(self.delay)
+        if isinstance(payload, list):
+            body = [self._answer(call) for call in payload]
+        else:
+            body = self._answer(payload)
+        return web.Response(text=json.dumps(body), content_type="application/json")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/rpc", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def unused_url() -> str:
+    """연결 거부되는 URL"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/rpc"
+
+
+def make_w3(urls):
+    provider = FailoverHTTPProvider(urls, request_timeout=TIMEOUT, cooldown=COOLDOWN, max_cooldown=COOLDOWN * 4)
+    return AsyncWeb3(provider, middlewares=[]), provider
+
+
+async def run():
+    failures = []
+    fast, slow, flaky = StandIn("fast", 0.0), StandIn("slow", 0.15), StandIn("flaky", 0.0)
+    for server in (fast, slow, flaky):
+        await server.start()
+
+    def reset():
+        for server in (fast, slow, flaky):
+            server.hits.clear()
+            server.mode = "ok"
+
+    try:
+        # 1. 지연 시간 기반 선택
+        w3, provider = make_w3([slow.url, fast.url])
+        for _ in range(10):
+            await w3.eth.block_number
+        print(f"[FailoverCheck] 조회 분배: slow {len(slow.hits)} / fast {len(fast.hits)}")
+        if len(slow.hits) > 1 or len(fast.hits) < 9:
+            failures.append(f"조회가 빠른 엔드포인트로 가지 않음 (slow {len(slow.hits)}, fast {len(fast.hits)})")
+        await provider.close()
+
+        # 2 + 3. 장애 조치 / 쿨다운 / 복구
+        for mode in ("hang", "error500", "limited"):
+            reset()
+            w3, provider = make_w3([flaky.url, slow.url])
+            flaky.mode = mode
+            start = time.monotonic()
+            try:
+                await w3.eth.block_number
+            except Exception as e:
+                failures.append(f"{mode}: 장애 조치 실패 ({e!r})")
+                await provider.close()
+                continue
+            elapsed = time.monotonic() - start
+            if not slow.hits:
+                failures.append(f"{mode}: 다음 엔드포인트로 넘어가지 않음")
+            if elapsed > TIMEOUT * 2:
+                failures.append(f"{mode}: 장애 조치가 너무 느림 ({elapsed:.2f}s)")
+            # 쿨다운 중에는 장애 엔드포인트로 보내지 않음
+            flaky.hits.clear()
+            await w3.eth.block_number
+            if flaky.hits:
+                failures.append(f"{mode}: 쿨다운 중인 엔드포인트로 요청이 감")
+            # 쿨다운 후 복구되면 (더 빠르므로) 다시 사용
+            flaky.mode = "ok"
+            await asyncio.sleep(COOLDOWN * 1.2)
+            await w3.eth.block_number
+            if not flaky.hits:
+                failures.append(f"{mode}: 쿨다운 후 복구된 엔드포인트를 다시 사용하지 않음")
+            print(f"[FailoverCheck] {mode}: {elapsed:.2f}s 만에 장애 조치, 쿨다운 후 복구")
+            await provider.close()
+
+        # 연속 rate limit: 응답을 받았다는 이유로 연속 실패 횟수가 초기화되지 않고 백오프가 늘어나야 함
+        reset()
+        w3, provider = make_w3([flaky.url, slow.url])
+        flaky.mode = "limited"
+        await w3.eth.block_number
+        await asyncio.sleep(COOLDOWN * 1.2)
+        await w3.eth.block_number
+        if provider.endpoints[0].failures != 2:
+            failures.append(f"연속 rate limit 의 실패 횟수가 누적되지 않음 ({provider.endpoints[0].failures})")
+        await provider.close()
+
+        # 연결 거부
+        reset()
+        w3, provider = make_w3([unused_url(), fast.url])
+        try:
+            await w3.eth.block_number
+        except Exception as e:
+            failures.append(f"연결 거부: 장애 조치 실패 ({e!r})")
+        await provider.close()
+
+        # revert 는 엔드포인트 장애가 아님
+        reset()
+        w3, provider = make_w3([fast.url, slow.url])
+        try:
+            await w3.eth.call({"to": "0x" + "11" * 20, "data": "0x"})
+        except Exception:
+            pass
+        if slow.hits or provider.endpoints[0].failures:
+            failures.append("revert 응답이 엔드포인트 장애로 처리됨")
+        await provider.close()
+
+        # 4. 전송 고정
+        reset()
+        w3, provider = make_w3([slow.url, fast.url])
+        await w3.eth.block_number  # 측정 전 엔드포인트를 먼저 시도하므로 두 번
+        await w3.eth.block_number
+        for _ in range(3):
+            await w3.eth.send_raw_transaction(RAW_TX)
+        if slow.hits.count("eth_sendRawTransaction") != 3:
+            failures.append("전송이 고정 엔드포인트가 아닌 곳으로 감 (조회와 같이 지연 시간으로 분산됨)")
+        slow.mode = "error500"
+        await w3.eth.send_raw_transaction(RAW_TX)
+        slow.mode = "ok"
+        await asyncio.sleep(COOLDOWN * 1.2)
+        fast.hits.clear()
+        await w3.eth.send_raw_transaction(RAW_TX)
+        if fast.hits.count("eth_sendRawTransaction") != 1:
+            failures.append("전송 엔드포인트 장애 후 새 엔드포인트에 고정되지 않음")
+        print(f"[FailoverCheck] 전송 고정: {provider.endpoint_uri == fast.url}")
+        await provider.close()
+
+        # 5. 타임아웃 후 재전송 -> already known
+        reset()
+        w3, provider = make_w3([flaky.url, fast.url])
+        flaky.mode = "hang"
+        fast.mode = "known"
+        try:
+            tx_hash = await w3.eth.send_raw_transaction(RAW_TX)
+            if tx_hash != keccak(hexstr=RAW_TX):
+                failures.append("already known 재전송의 트랜잭션 해시가 다름")
+        except Exception as e:
+            failures.append(f"already known 재전송이 실패로 처리됨 ({e!r})")
+        await provider.close()
+
+        # 6. 배치 장애 조치
+        reset()
+        w3, provider = make_w3([flaky.url, fast.url])
+        flaky.mode = "limited"
+        calls = [("eth_blockNumber", []) for _ in range(5)]
+        try:
+            results = await provider.make_batch_request(calls)
+            if results != ["0x10"] * 5:
+                failures.append(f"배치 응답이 잘못됨: {results}")
+        except Exception as e:
+            failures.append(f"배치 장애 조치 실패 ({e!r})")
+        await provider.close()
+
+        # 조회 범위 제한 에러는 엔드포인트 장애가 아님 (호출한 쪽에서 범위를 줄여 재시도)
+        reset()
+        w3, provider = make_w3([fast.url, slow.url])
+        fast.mode = slow.mode = "range"
+        try:
+            await w3.eth.get_logs({"fromBlock": 0, "toBlock": 100000})
+            failures.append("조회 범위 제한 에러가 호출한 쪽에 전달되지 않음")
+        except Exception:
+            pass
+        if slow.hits or provider.endpoints[0].failures:
+            failures.append("조회 범위 제한 에러가 엔드포인트 장애로 처리됨")
+        fast.hits.clear()
+        slow.hits.clear()
+        try:
+            results = await provider.make_batch_request([("eth_getLogs", [{"fromBlock": "0x0"}])])
+        except Exception as e:
+            results = [None]
+            failures.append(f"배치의 조회 범위 제한 에러로 배치 전체가 실패함 ({e!r})")
+        if (
+            len(fast.hits) + len(slow.hits) != 1
+            or any(e.failures for e in provider.endpoints)
+            or not isinstance(results[0], Exception)
+        ):
+            failures.append("배치의 조회 범위 제한 에러가 엔드포인트 장애로 처리됨")
+        await provider.close()
+
+        # 7. 모든 엔드포인트 장애
+        reset()
+        w3, provider = make_w3([flaky.url, slow.url])
+        flaky.mode = slow.mode = "error500"
+        try:
+            await w3.eth.block_number
+            failures.append("모든 엔드포인트 장애인데 성공함")
+        except Exception:
+            pass
+        await provider.close()
+    finally:
+        for server in (fast, slow, flaky):
+            await server.stop()
+
+    return failures
+
+
+def main():
+    failures = asyncio.run(run())
+    if failures:
+        print("\n[FailoverCheck] 실패:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("[FailoverCheck] 통과")
+
+
+if __name__ == "__main__":
+    main()
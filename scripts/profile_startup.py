@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+워커 부팅 / 콜드 스타트 프로파일
+
+다음 항목을 새 인터프리터에서 반복 측정합니다.
+- import_ms: `import app.main` 소요 시간
+- first_response_ms: uvicorn 프로세스 시작 ~ GET / 첫 200 응답 (콜드 스타트)
+- warm_up_ms / init_timings_ms: lifespan 리소스 병렬 초기화 시간 (리소스별)
+
+--baseline-ref 를 지정하면 해당 git 리비전을 임시 worktree 로 꺼내
+같은 측정을 하고 나란히 비교합니다.
+
+사용법:
+    python scripts/profile_startup.py --runs 5
+    python scripts/profile_startup.py --baseline-ref HEAD~1 --output bench_results/startup.json
+"""
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+_IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import app.main
+print((time.perf_counter() - start) * 1000)
+"""
+
+_WARM_UP_SNIPPET = """
+import json, asyncio
+import app.main
+try:
+    from app.resources import resources
+except ImportError:
+    print(json.dumps(None))
+else:
+    asyncio.run(resources._warm_up())
+    print(json.dumps({"warm_up_ms": resources.warm_up_ms, "init_timings_ms": resources.init_timings_ms}))
+"""
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _run_python(root: Path, code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=str(root), capture_output=True, text=True, check=True,
+    )
+    # 앱 초기화 로그가 섞이므로 마지막 줄만 결과로 사용
+    return result.stdout.strip().splitlines()[-1]
+
+
+def measure_first_response(root: Path, timeout: float = 60.0) -> float:
+    """uvicorn 시작부터 첫 200 응답까지 (ms)"""
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=str(root), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + timeout
+        while time.perf_counter() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError("uvicorn 이 시작 중 종료되었습니다.")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/", timeout=0.5).status_code == 200:
+                    return (time.perf_counter() - start) * 1000
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError("첫 응답 대기 시간 초과")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def profile(root: Path, runs: int) -> dict:
+    import_ms = [float(_run_python(root, _IMPORT_SNIPPET)) for _ in range(runs)]
+    first_response_ms = [measure_first_response(root) for _ in range(runs)]
+    warm_up = json.loads(_run_python(root, _WARM_UP_SNIPPET))
+    return {
+        "import_ms": {
+            "median": round(statistics.median(import_ms), 1),
+            "min": round(min(import_ms), 1),
+        },
+        "first_response_ms": {
+            "median": round(statistics.median(first_response_ms), 1),
+            "min": round(min(first_response_ms), 1),
+        },
+        "warm_up": warm_up,
+    }
+
+
+def _print_profile(label: str, result: dict):
+    print(f"[Startup] {label}: import={result['import_ms']['median']}ms "
+          f"first_response={result['first_response_ms']['median']}ms")
+    if result.get("warm_up"):
+        print(f"[Startup]   warm-up={result['warm_up']['warm_up_ms']}ms "
+              f"{result['warm_up']['init_timings_ms']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 부팅 / 콜드 스타트 프로파일")
+    parser.add_argument("--runs", type=int, default=5, help="항목별 반복 횟수")
+    parser.add_argument("--baseline-ref", help="비교할 git 리비전 (예: HEAD~1)")
+    parser.add_argument("--output", default="bench_results/startup.json", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    report = {"current": profile(PROJECT_ROOT, args.runs)}
+    _print_profile("current", report["current"])
+
+    if args.baseline_ref:
+        with tempfile.TemporaryDirectory() as tmp:
+            worktree = Path(tmp) / "baseline"
+            subprocess.run(
+                ["git", "worktree", "add", "--detach", str(worktree), args.baseline_ref],
+                cwd=str(PROJECT_ROOT), check=True, capture_output=True,
+            )
+            try:
+                env_file = PROJECT_ROOT / ".env"
+                if env_file.exists():
+                    (worktree / ".env").write_text(env_file.read_text())
+                report["baseline"] = profile(worktree, args.runs)
+                report["baseline"]["ref"] = args.baseline_ref
+            finally:
+                subprocess.run(
+                    ["git", "worktree", "remove", "--force", str(worktree)],
+                    cwd=str(PROJECT_ROOT), check=False, capture_output=True,
+                )
+        _print_profile(f"baseline ({args.baseline_ref})", report["baseline"])
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"[Startup] 결과 저장: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
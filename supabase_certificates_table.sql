@@ -5,6 +5,7 @@
 CREATE TABLE IF NOT EXISTS certificates (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     cert_id VARCHAR(66) UNIQUE NOT NULL,        -- 블록체인 인증서 ID (0x...)
+    short_id VARCHAR(64),                        -- 검증 URL 짧은 ID (cert_id 앞 8자리, 중복 시 더 길게)
     user_id VARCHAR(128) NOT NULL,               -- Firebase UID
     image_url VARCHAR(512),                      -- Supabase Storage 이미지 URL
     image_hash VARCHAR(66) NOT NULL,             -- SHA-256 해시 (0x...)
@@ -12,6 +13,9 @@ CREATE TABLE IF NOT EXISTS certificates (
     tx_hash VARCHAR(66) NOT NULL,                -- 블록체인 트랜잭션 해시
     block_number BIGINT NOT NULL DEFAULT 0,      -- 블록 번호
     status VARCHAR(20) NOT NULL DEFAULT 'active', -- active, revoked, pending
+    merkle_root VARCHAR(66),                     -- 배치 Merkle 루트 (CERTIFICATE_ANCHOR_MODE=merkle)
+    merkle_proof JSONB,                          -- Merkle 포함 증명 (hex 문자열 배열)
+    revoke_tx_hash VARCHAR(66),                  -- 온체인 취소 트랜잭션 해시 (CERTIFICATE_REVOCATION_MODE=onchain)
     metadata JSONB,                               -- 추가 메타데이터 (선택)
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
@@ -24,6 +28,69 @@ CREATE INDEX IF NOT EXISTS idx_certificates_cert_type ON certificates(cert_type)
 CREATE INDEX IF NOT EXISTS idx_certificates_status ON certificates(status);
 CREATE INDEX IF NOT EXISTS idx_certificates_created_at ON certificates(created_at DESC);
 
+-- 기존 테이블 마이그레이션: Merkle 배치 앵커링 컬럼
+ALTER TABLE certificates ADD COLUMN IF NOT EXISTS merkle_root VARCHAR(66);
+ALTER TABLE certificates ADD COLUMN IF NOT EXISTS merkle_proof JSONB;
+CREATE INDEX IF NOT EXISTS idx_certificates_merkle_root ON certificates(merkle_root) WHERE merkle_root IS NOT NULL;
+
+-- 기존 테이블 마이그레이션: 온체인 취소 기록 컬럼 (기록 대기 중인 취소만 인덱싱)
+ALTER TABLE certificates ADD COLUMN IF NOT EXISTS revoke_tx_hash VARCHAR(66);
+CREATE INDEX IF NOT EXISTS idx_certificates_revoke_pending ON certificates(cert_id)
+    WHERE status = 'revoked' AND revoke_tx_hash IS NULL;
+
+-- 기존 테이블 마이그레이션: 짧은 ID 컬럼 (검증 URL 조회를 LIKE '%...%' 대신 인덱스 일치 검색으로)
+ALTER TABLE certificates ADD COLUMN IF NOT EXISTS short_id VARCHAR(64);
+-- 백필: 앞 8자리가 겹치면 먼저 발급된 인증서가 8자리를 갖고, 나머지는 전체 ID 사용
+WITH ranked AS (
+    SELECT id,
+           lower(substring(cert_id FROM 3 FOR 8)) AS prefix,
+           row_number() OVER (
+               PARTITION BY lower(substring(cert_id FROM 3 FOR 8))
+               ORDER BY created_at, id
+           ) AS rank
+    FROM certificates
+)
+UPDATE certificates c
+SET short_id = CASE WHEN r.rank = 1 THEN r.prefix ELSE lower(substring(c.cert_id FROM 3)) END
+FROM ranked r
+WHERE c.id = r.id AND c.short_id IS NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_certificates_short_id ON certificates(short_id);
+
+-- 기존 테이블 마이그레이션: 사용자 인증서 목록 키셋 페이지네이션 (user_id 일치 + created_at, id 내림차순)
+-- 단일 컬럼 인덱스(user_id / created_at)로는 필터와 정렬을 함께 처리할 수 없어 복합 인덱스 추가
+CREATE INDEX IF NOT EXISTS idx_certificates_user_created ON certificates(user_id, created_at DESC, id DESC);
+
+-- 사용자별 인증서 수 (목록 total_count 를 COUNT(*) 없이 조회)
+CREATE TABLE IF NOT EXISTS user_certificate_counts (
+    user_id VARCHAR(128) PRIMARY KEY,
+    total BIGINT NOT NULL DEFAULT 0
+);
+ALTER TABLE user_certificate_counts ENABLE ROW LEVEL SECURITY;  -- 서버(서비스 키)만 접근
+
+CREATE OR REPLACE FUNCTION update_user_certificate_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO user_certificate_counts (user_id, total) VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET total = user_certificate_counts.total + 1;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE user_certificate_counts SET total = total - 1 WHERE user_id = OLD.user_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_user_certificate_counts ON certificates;
+CREATE TRIGGER update_user_certificate_counts
+    AFTER INSERT OR DELETE ON certificates
+    FOR EACH ROW
+    EXECUTE FUNCTION update_user_certificate_count();
+
+-- 백필 (트리거 생성 후 한 번, 다시 실행해도 실제 개수로 맞춰짐)
+INSERT INTO user_certificate_counts (user_id, total)
+SELECT user_id, COUNT(*) FROM certificates GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE SET total = EXCLUDED.total;
+
 -- 업데이트 시간 자동 갱신 함수
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -76,6 +143,11 @@ GROUP BY cert_type, status;
 
 -- 테이블 코멘트
 COMMENT ON TABLE certificates IS 'OceanSeal 디지털 인증서 - 이미지 해시를 블록체인에 기록';
+COMMENT ON TABLE user_certificate_counts IS '사용자별 인증서 수 (certificates INSERT / DELETE 트리거가 갱신)';
 COMMENT ON COLUMN certificates.cert_id IS '블록체인에서 발급된 고유 인증서 ID';
+COMMENT ON COLUMN certificates.short_id IS '검증 URL 의 짧은 ID (cert_id 0x 뒤 접두사, 유니크)';
 COMMENT ON COLUMN certificates.image_hash IS '이미지 SHA-256 해시 (위변조 검증용)';
 COMMENT ON COLUMN certificates.tx_hash IS 'Polygon 블록체인 트랜잭션 해시';
+COMMENT ON COLUMN certificates.merkle_root IS '배치 발급 시 온체인에 기록된 Merkle 루트 (단건 발급은 NULL)';
+COMMENT ON COLUMN certificates.merkle_proof IS 'cert_id 에서 merkle_root 까지의 포함 증명';
+COMMENT ON COLUMN certificates.revoke_tx_hash IS 'revokeMany 로 취소를 기록한 트랜잭션 해시 (기록 전이면 NULL)';